@@ -0,0 +1,75 @@
+"""
+Time histogramming several branches of a TTree, as the grid view does, one
+branch after another versus all of them in a single pass.
+
+    python benchmarks/bench_grid.py [--branches N] [--entries N] [--repeat N]
+
+The single pass reads each chunk of all the branches with one ``arrays``
+call and decompresses baskets and fills the histograms in parallel while the
+next chunk is read, so it gains with the number of CPUs; on a single CPU the
+two are about even.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import uproot
+
+from uproot_browser.fill import fill_branch, fill_branches
+from uproot_browser.plot import FINE_BINS
+
+
+def make_file(path: Path, branches: int, entries: int) -> None:
+    rng = np.random.default_rng(42)
+    names = [f"b{i}" for i in range(branches)]
+    with uproot.recreate(path) as f:
+        tree = f.mktree("T", dict.fromkeys(names, np.float64))
+        step = 100_000
+        for start in range(0, entries, step):
+            size = min(step, entries - start)
+            tree.extend({name: rng.normal(size=size) for name in names})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--branches", type=int, default=9)
+    parser.add_argument("--entries", type=int, default=2_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "grid.root"
+        make_file(path, args.branches, args.entries)
+
+        one_by_one = []
+        single_pass = []
+        for _ in range(args.repeat):
+            # Reopen each time, so no basket is reused from a cache
+            with uproot.open(path) as f:
+                tree = f["T"]
+                start = time.perf_counter()
+                for branch in tree.values():
+                    fill_branch(branch, bins=FINE_BINS)
+                one_by_one.append(time.perf_counter() - start)
+            with uproot.open(path) as f:
+                tree = f["T"]
+                start = time.perf_counter()
+                fill_branches(tree, tree.values(), bins=FINE_BINS)
+                single_pass.append(time.perf_counter() - start)
+
+    old, new = min(one_by_one), min(single_pass)
+    print(
+        f"{args.branches} branches x {args.entries:,} entries  "
+        f"one by one {old * 1e3:7.1f} ms   single pass {new * 1e3:7.1f} ms   "
+        f"({old / new:.1f}x, {os.cpu_count()} CPUs)"
+    )
+
+
+if __name__ == "__main__":
+    main()
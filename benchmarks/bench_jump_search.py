@@ -0,0 +1,105 @@
+"""
+Time fuzzy searches in the jump screen's index, one keystroke at a time.
+
+    python benchmarks/bench_jump_search.py [--candidates N]
+
+Typing a query searches for each prefix of it in turn, so later keystrokes
+reuse the matches of the earlier ones.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+import numpy as np
+import textual.fuzzy
+
+from uproot_browser.tui.jump import Candidate, SearchIndex
+
+WORDS = [
+    "jet",
+    "muon",
+    "electron",
+    "photon",
+    "tau",
+    "track",
+    "vertex",
+    "met",
+    "pt",
+    "eta",
+    "phi",
+    "mass",
+    "charge",
+    "energy",
+    "px",
+    "py",
+    "pz",
+    "e",
+    "isolation",
+    "id",
+    "loose",
+    "tight",
+    "trigger",
+    "weight",
+    "n",
+    "d0",
+    "z0",
+    "chi2",
+]
+
+QUERIES = ("jet_pt", "muoneta", "trkchi2", "e", "xyzzy")
+
+
+def make_candidates(n: int) -> list[Candidate]:
+    rng = random.Random(42)
+    candidates = []
+    for i in range(n):
+        words = rng.sample(WORDS, rng.randint(1, 3))
+        name = "_".join(words) + (str(i % 10) if i % 3 else "")
+        candidates.append(
+            Candidate(path=f"//tree{i % 7}/{name}", name=name, icon="", is_dir=False)
+        )
+    return candidates
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--candidates", type=int, default=200_000)
+    args = parser.parse_args()
+
+    candidates = make_candidates(args.candidates)
+    start = time.perf_counter()
+    index = SearchIndex()
+    for i in range(0, len(candidates), 10_000):
+        index.add(candidates[i : i + 10_000])
+    build = time.perf_counter() - start
+    print(f"{args.candidates:,} candidates, indexed in {build * 1e3:.0f} ms")
+
+    for query in QUERIES:
+        times = []
+        for n in range(1, len(query) + 1):
+            start = time.perf_counter()
+            _, matches = index.search(query[:n])
+            times.append(time.perf_counter() - start)
+        ms = np.array(times) * 1e3
+        print(
+            f"  {query!r:>11}: {matches:>7,} matches, per keystroke "
+            f"median {np.median(ms):.1f} ms, max {ms.max():.1f} ms"
+        )
+
+    # The per-keystroke cost of scoring everything with Textual's matcher
+    sample = candidates[:10_000]
+    matcher = textual.fuzzy.Matcher(QUERIES[0])
+    start = time.perf_counter()
+    for c in sample:
+        matcher.match(c.name)
+    full = (time.perf_counter() - start) * len(candidates) / len(sample)
+    print(
+        f"  Scoring all with textual.fuzzy.Matcher: ~{full * 1e3:.0f} ms per keystroke"
+    )
+
+
+if __name__ == "__main__":
+    main()
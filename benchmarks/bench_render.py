@@ -0,0 +1,100 @@
+"""
+Time drawing a 1-D histogram in the TUI, from the histogram to the segments
+that are written to the terminal, at several terminal sizes.
+
+    python benchmarks/bench_render.py [--repeat N]
+
+Compares plotext (building an ANSI string, then parsing it back into rich
+text) with the NumPy renderer that makes the segments directly.
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import functools
+import io
+import time
+from typing import TYPE_CHECKING, Any
+
+import hist
+import numpy as np
+import rich.console
+import rich.text
+
+from uproot_browser.plot import FINE_BINS, rebin
+from uproot_browser.tui.plot import _plotext, make_plot
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+SIZES = ((80, 24), (160, 48), (240, 72), (400, 120))
+
+
+@dataclasses.dataclass
+class Item:
+    name: str
+
+
+def plotext_plot(
+    item: Item, histogram: hist.Hist[Any], width: int, height: int
+) -> rich.text.Text:
+    """The plotext path, as the TUI drew every plot before."""
+    import uproot_browser.plot
+
+    plt = _plotext()
+    plt.clf()
+    plt.theme("dark")
+    plt.plotsize(width, height)
+    uproot_browser.plot.draw(item, rebin(histogram, (width - 5) * 4))
+    return rich.text.Text.from_ansi(plt.build())
+
+
+def best_of(
+    repeat: int,
+    draw: Callable[[], rich.console.RenderableType],
+    console: rich.console.Console,
+) -> float:
+    """Fastest time to draw and render to segments, in seconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        list(console.render(draw()))
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    histogram = hist.Hist(hist.axis.Regular(FINE_BINS, -5, 5, name="x"))
+    histogram.fill(rng.normal(size=1_000_000))
+    item = Item("x")
+
+    for width, height in SIZES:
+        console = rich.console.Console(
+            width=width, height=height, file=io.StringIO(), color_system="truecolor"
+        )
+        old = best_of(
+            args.repeat,
+            functools.partial(plotext_plot, item, histogram, width, height),
+            console,
+        )
+        new = best_of(
+            args.repeat,
+            functools.partial(
+                make_plot, item, "dark", width, height, expr="", histogram=histogram
+            ),
+            console,
+        )
+        print(
+            f"{width:>3}x{height:<3}  plotext {old * 1e3:7.1f} ms   "
+            f"numpy {new * 1e3:6.1f} ms   ({old / new:.0f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
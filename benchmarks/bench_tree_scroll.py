@@ -0,0 +1,81 @@
+"""
+Time scrolling through the tree of a wide TTree (many branches) in the TUI.
+
+    python benchmarks/bench_tree_scroll.py [--branches N] [--pages N]
+
+Each page down needs the labels of a screenful of new nodes; the time per
+page is mostly label rendering and the repaint.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import uproot
+from rich.style import Style
+
+from uproot_browser.tui.browser import Browser
+from uproot_browser.tui.left_panel import UprootTree
+
+
+def make_file(path: Path, branches: int) -> None:
+    names = [f"branch_{i:05}" for i in range(branches)]
+    with uproot.recreate(path) as f:
+        tree = f.mktree("T", dict.fromkeys(names, np.float32))
+        tree.extend({name: np.arange(10, dtype=np.float32) for name in names})
+
+
+async def scroll(path: Path, pages: int) -> tuple[list[float], list[float]]:
+    """Times per page down, and per repaint of every label loaded."""
+    times = []
+    repaints = []
+    async with Browser(str(path)).run_test(size=(120, 50)) as pilot:
+        tree = pilot.app.query_one("#tree-view", UprootTree)
+        tree.select_path("//T")
+        await pilot.pause()
+        tree.focus()
+        await pilot.press("down")
+        for _ in range(pages):
+            start = time.perf_counter()
+            await pilot.press("pagedown")
+            await pilot.pause()
+            times.append(time.perf_counter() - start)
+
+        nodes = [n for n in tree.root.children[0].children if n.data is not None]
+        for _ in range(3):
+            start = time.perf_counter()
+            for node in nodes:
+                tree.render_label(node, Style(), Style(bold=True))
+            repaints.append(time.perf_counter() - start)
+    return times, repaints
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--branches", type=int, default=2000)
+    parser.add_argument("--pages", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "wide.root"
+        make_file(path, args.branches)
+        times, repaints = asyncio.run(scroll(path, args.pages))
+
+    ms = np.array(times) * 1e3
+    print(
+        f"{args.branches} branches, {args.pages} pages: "
+        f"median {np.median(ms):.1f} ms, max {ms.max():.1f} ms, total {ms.sum():.0f} ms"
+    )
+    print(
+        "Labels of all loaded nodes, per pass: "
+        + ", ".join(f"{t * 1e3:.1f} ms" for t in repaints)
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from pathlib import Path
+
 import nox
 
 nox.needs_version = ">=2024.4.15"
@@ -76,3 +78,14 @@ def make_logo(session: nox.Session) -> None:
 
     session.install("pillow")
     session.run("python", "docs/make_logo.py")
+
+
+@nox.session(default=False)
+def bench(session: nox.Session) -> None:
+    """
+    Run the benchmarks.
+    """
+
+    session.install("-e.")
+    for script in sorted(Path("benchmarks").glob("bench_*.py")):
+        session.run("python", str(script), *session.posargs)
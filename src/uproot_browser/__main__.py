@@ -6,10 +6,10 @@ from __future__ import annotations
 
 import functools
 import os
-from typing import TYPE_CHECKING, Any
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Literal
 
 import click
-import uproot
 
 from ._version import version as __version__
 
@@ -47,18 +47,220 @@ def main() -> None:
     """
 
 
+def step_size_option(
+    _ctx: click.Context, _param: click.Parameter, value: str
+) -> int | str:
+    """
+    A plain number is a count of entries, anything else a memory size.
+    """
+    return int(value) if value.isdigit() else value
+
+
+def cache_options(func: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Add the ``--cache-dir`` and ``--no-cache`` options for the cache of
+    histograms and file structure indexes.
+    """
+    func = click.option(
+        "--no-cache", is_flag=True, help="Don't read or write the cache."
+    )(func)
+    return click.option(
+        "--cache-dir",
+        type=click.Path(file_okay=False, path_type=Path),
+        default=None,
+        help="Directory for cached histograms and file indexes [default: $XDG_CACHE_HOME/uproot-browser].",
+    )(func)
+
+
+def get_cache_dir(cache_dir: Path | None, *, no_cache: bool) -> Path | None:
+    if no_cache:
+        return None
+
+    from uproot_browser.cache import default_cache_dir
+
+    return default_cache_dir() if cache_dir is None else cache_dir
+
+
 @main.command()
 @click.argument("filename")
 @click.option(
     "--testdata", is_flag=True, help="Interpret the filename as a testdata file"
 )
-def tree(filename: str, *, testdata: bool) -> None:
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["text", "json", "jsonl"]),
+    default="text",
+    show_default=True,
+    help="Output a JSON array or JSON Lines, one record per object, instead.",
+)
+@click.option(
+    "--max-depth",
+    type=click.IntRange(min=0),
+    default=None,
+    help="Only show this many levels below the file.",
+)
+@click.option(
+    "--max-children",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Show at most this many children of each directory, tree or branch (text only).",
+)
+@click.option(
+    "--filter",
+    "pattern",
+    metavar="GLOB",
+    default=None,
+    help="Only show objects whose name (or path) matches, like 'jet_*'.",
+)
+@cache_options
+def tree(  # noqa: PLR0913
+    filename: str,
+    *,
+    testdata: bool,
+    output_format: Literal["text", "json", "jsonl"],
+    max_depth: int | None,
+    max_children: int | None,
+    pattern: str | None,
+    cache_dir: Path | None,
+    no_cache: bool,
+) -> None:
     """
     Display a tree.
     """
-    import uproot_browser.tree
+    if output_format != "text":
+        if max_children is not None:
+            msg = "--max-children only applies to text output"
+            raise click.UsageError(msg)
+
+        import uproot_browser.inventory
+
+        uproot_browser.inventory.print_inventory(
+            get_testdata(filename, testdata=testdata),
+            output_format=output_format,
+            max_depth=max_depth,
+            pattern=pattern,
+        )
+        return
+
+    cache_dir = get_cache_dir(cache_dir, no_cache=no_cache)
+    if cache_dir is None:
+        import uproot_browser.tree
+
+        uproot_browser.tree.print_tree(
+            get_testdata(filename, testdata=testdata),
+            max_depth=max_depth,
+            max_children=max_children,
+            pattern=pattern,
+        )
+        return
+
+    import uproot_browser.structure
+
+    uproot_browser.structure.print_indexed_tree(
+        get_testdata(filename, testdata=testdata),
+        cache_dir,
+        max_depth=max_depth,
+        max_children=max_children,
+        pattern=pattern,
+    )
 
-    uproot_browser.tree.print_tree(get_testdata(filename, testdata=testdata))
+
+@main.command()
+@click.argument("paths", nargs=-1, required=True)
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["json", "jsonl"]),
+    default="jsonl",
+    show_default=True,
+    help="Write a JSON array instead of JSON Lines.",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Number of files to read at once, in separate processes [default: one per CPU].",
+)
+@click.option(
+    "--max-depth",
+    type=click.IntRange(min=0),
+    default=None,
+    help="Only list this many levels below each file.",
+)
+@click.option(
+    "--filter",
+    "pattern",
+    metavar="GLOB",
+    default=None,
+    help="Only list objects whose name (or path) matches, like 'jet_*'.",
+)
+def index(
+    paths: tuple[str, ...],
+    *,
+    output_format: Literal["json", "jsonl"],
+    jobs: int | None,
+    max_depth: int | None,
+    pattern: str | None,
+) -> None:
+    """
+    List the contents of many files.
+
+    PATHS are files, globs (like 'data/**/*.root') or directories, searched
+    for .root files. One record per file is written as each is done, with
+    its objects (as for tree --format json) or the error that stopped it, and
+    the seconds it took. Exits with 1 if any file failed.
+    """
+    import uproot_browser.inventory
+
+    failures = uproot_browser.inventory.print_inventories(
+        uproot_browser.inventory.expand_paths(paths),
+        output_format=output_format,
+        jobs=jobs,
+        max_depth=max_depth,
+        pattern=pattern,
+    )
+    if failures:
+        click.echo(f"{failures} file(s) failed", err=True)
+        raise SystemExit(1)
+
+
+@main.command()
+@click.argument("filename")
+@click.option(
+    "--testdata", is_flag=True, help="Interpret the filename as a testdata file"
+)
+@click.option(
+    "--max-depth",
+    type=click.IntRange(min=0),
+    default=None,
+    help="Only show this many levels below the file (or object).",
+)
+@click.option(
+    "--top",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Show only the heaviest this many of each directory, tree or branch.",
+)
+def size(
+    filename: str, *, testdata: bool, max_depth: int | None, top: int | None
+) -> None:
+    """
+    Display the storage used by each directory, tree and branch.
+
+    Compressed and uncompressed sizes, compression ratios and basket counts
+    are taken from the headers, heaviest first; nothing is decompressed. Use
+    'file.root:tree' for one tree.
+    """
+    import uproot_browser.size
+
+    try:
+        uproot_browser.size.print_sizes(
+            get_testdata(filename, testdata=testdata), max_depth=max_depth, top=top
+        )
+    except ValueError as err:
+        raise click.ClickException(str(err)) from None
 
 
 def intercept(func: Callable[..., Any], *names: str) -> Callable[..., Any]:
@@ -83,23 +285,97 @@ def intercept(func: Callable[..., Any], *names: str) -> Callable[..., Any]:
 @click.option(
     "--testdata", is_flag=True, help="Interpret the filename as a testdata file"
 )
-def plot(filename: str, *, iterm: bool, testdata: bool) -> None:
+@click.option(
+    "--step-size",
+    default="100 MB",
+    show_default=True,
+    callback=step_size_option,
+    help="Entries (or memory, like '50 MB') to read per chunk when filling.",
+)
+@click.option(
+    "--sample",
+    type=click.FloatRange(0, 1, min_open=True),
+    is_flag=False,
+    flag_value=0.01,
+    default=None,
+    help="Quick estimate from this fraction of the baskets (0.01 if no value).",
+)
+@click.option(
+    "--vs",
+    "versus",
+    metavar="BRANCH",
+    default=None,
+    help="Plot against this branch of the same TTree (on the y axis), as a heatmap.",
+)
+@click.option(
+    "--cut",
+    metavar="EXPR",
+    default="",
+    help="Only plot entries passing this cut on branches of the same TTree.",
+)
+@cache_options
+def plot(  # noqa: PLR0913
+    filename: str,
+    *,
+    iterm: bool,
+    testdata: bool,
+    step_size: int | str,
+    sample: float | None,
+    versus: str | None,
+    cut: str,
+    cache_dir: Path | None,
+    no_cache: bool,
+) -> None:
     """
     Display a plot.
     """
+    import rich
+    import uproot
+
+    import uproot_browser.plot
+    import uproot_browser.tree
+    from uproot_browser.cache import DiskCache
+
     if iterm:
         os.environ.setdefault("MPLBACKEND", r"module://itermplot")
 
         import matplotlib.pyplot as plt
 
         import uproot_browser.plot_mpl
-    else:
-        import uproot_browser.plot
 
-    item = uproot.open(get_testdata(filename, testdata=testdata))
+    spec = get_testdata(filename, testdata=testdata)
+    item = uproot.open(spec)
+    file = getattr(item, "file", None) or item.ntuple.file
+
+    cache_path = get_cache_dir(cache_dir, no_cache=no_cache)
+    _, selection = uproot_browser.tree.split_spec(spec)
+    if versus is not None:
+        if not isinstance(item, uproot.TBranch):
+            msg = "--vs needs a TBranch to plot against"
+            raise click.UsageError(msg)
+        try:
+            item = uproot_browser.plot.BranchPair(item, item.tree[versus])
+        except uproot.KeyInFileError:
+            msg = f"No branch {versus!r} in {item.tree.object_path}"
+            raise click.UsageError(msg) from None
+        selection = f"{selection} vs {versus}"
+    try:
+        histogram = uproot_browser.plot.make_cached_histogram(
+            item,
+            None if cache_path is None else DiskCache(cache_path),
+            file=file,
+            selection=selection or "",
+            step_size=step_size,
+            sample=sample,
+            cut=cut,
+        )
+    except ValueError as err:
+        if not cut:
+            raise
+        raise click.UsageError(str(err)) from None
 
     if iterm:
-        uproot_browser.plot_mpl.plot(item)
+        uproot_browser.plot_mpl.plot(item, step_size=step_size, histogram=histogram)
         if plt.get_backend() == r"module://itermplot":
             fm = plt.get_current_fig_manager()
             canvas = fm.canvas
@@ -108,9 +384,18 @@ def plot(filename: str, *, iterm: bool, testdata: bool) -> None:
             )
 
         plt.show()
+    elif histogram.ndim == 2:
+        console = rich.get_console()
+        width, height = console.size
+        shown = uproot_browser.plot.shown_histogram(
+            item, histogram, width=width, height=2 * height
+        )
+        console.print(
+            uproot_browser.plot.heatmap(item, shown, width=width, height=height - 1)
+        )
     else:
         uproot_browser.plot.clf()
-        uproot_browser.plot.plot(item)
+        uproot_browser.plot.plot(item, step_size=step_size, histogram=histogram)
         uproot_browser.plot.show()
 
 
@@ -119,14 +404,18 @@ def plot(filename: str, *, iterm: bool, testdata: bool) -> None:
 @click.option(
     "--testdata", is_flag=True, help="Interpret the filename as a testdata file"
 )
-def browse(filename: str, *, testdata: bool) -> None:
+@cache_options
+def browse(
+    filename: str, *, testdata: bool, cache_dir: Path | None, no_cache: bool
+) -> None:
     """
     Display a TUI.
     """
     import uproot_browser.tui.browser
 
     app = uproot_browser.tui.browser.Browser(
-        path=get_testdata(filename, testdata=testdata)
+        path=get_testdata(filename, testdata=testdata),
+        cache_dir=get_cache_dir(cache_dir, no_cache=no_cache),
     )
 
     app.run()
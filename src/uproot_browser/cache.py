@@ -0,0 +1,335 @@
+"""
+Caching of computed histograms, so redrawing a plot never re-reads the file.
+"""
+
+from __future__ import annotations
+
+import collections
+import contextlib
+import dataclasses
+import hashlib
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from uproot_browser.fill import Sampled, get_sampled, memory_size
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable
+
+    import hist
+
+__all__ = (
+    "DEFAULT_CACHE_SIZE",
+    "DEFAULT_DISK_CACHE_SIZE",
+    "DiskCache",
+    "HistogramCache",
+    "default_cache_dir",
+    "file_identity",
+    "histogram_nbytes",
+    "load_histogram",
+    "save_histogram",
+)
+
+
+def __dir__() -> tuple[str, ...]:
+    return __all__
+
+
+DEFAULT_CACHE_SIZE = "100 MB"
+DEFAULT_DISK_CACHE_SIZE = "500 MB"
+
+# Bump when the way histograms are computed changes, to ignore old entries.
+_FORMAT_VERSION = 1
+
+
+def histogram_nbytes(histogram: hist.Hist[Any]) -> int:
+    """
+    Memory used by a histogram's bins (including flow bins).
+    """
+    return int(histogram.view(flow=True).nbytes)
+
+
+class HistogramCache:
+    """
+    Thread-safe, least-recently-used cache of histograms, bounded by the total
+    size of their bins rather than by a count.
+    """
+
+    def __init__(self, max_size: int | str = DEFAULT_CACHE_SIZE) -> None:
+        self.max_size = max_size if isinstance(max_size, int) else memory_size(max_size)
+        self.size = 0
+        self._items: collections.OrderedDict[Hashable, hist.Hist[Any]] = (
+            collections.OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._items
+
+    def get(self, key: Hashable) -> hist.Hist[Any] | None:
+        """
+        Return the cached histogram (marking it as recently used), or None.
+        """
+        with self._lock:
+            histogram = self._items.get(key)
+            if histogram is not None:
+                self._items.move_to_end(key)
+            return histogram
+
+    def put(self, key: Hashable, histogram: hist.Hist[Any]) -> None:
+        """
+        Store a histogram, evicting the least recently used ones to stay within
+        ``max_size``. A histogram larger than the whole cache is not stored.
+        """
+        nbytes = histogram_nbytes(histogram)
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.size -= histogram_nbytes(old)
+            if nbytes > self.max_size:
+                return
+            while self._items and self.size + nbytes > self.max_size:
+                _, evicted = self._items.popitem(last=False)
+                self.size -= histogram_nbytes(evicted)
+            self._items[key] = histogram
+            self.size += nbytes
+
+    def get_or_compute(
+        self, key: Hashable, compute: Callable[[], hist.Hist[Any]]
+    ) -> hist.Hist[Any]:
+        """
+        Return the cached histogram, computing and storing it on a miss. The
+        computation runs outside the lock, so other keys are not blocked.
+        """
+        histogram = self.get(key)
+        if histogram is None:
+            histogram = compute()
+            self.put(key, histogram)
+        return histogram
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self.size = 0
+
+
+def default_cache_dir() -> Path:
+    """
+    ``$XDG_CACHE_HOME/uproot-browser``, falling back to ``~/.cache``.
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "uproot-browser"
+
+
+def file_identity(file: Any) -> tuple[str, int, int, str] | None:
+    """
+    Identify an uproot ``ReadOnlyFile`` by resolved path, size, modification
+    time and ROOT UUID. Returns None for files that are not on local disk.
+    """
+    try:
+        path = Path(file.file_path).resolve()
+        stat = path.stat()
+    except (OSError, TypeError, ValueError):
+        return None
+    return (str(path), stat.st_size, stat.st_mtime_ns, str(file.uuid))
+
+
+_AXIS_KINDS = frozenset({"Regular", "Variable"})
+
+
+def save_histogram(path: Path, histogram: hist.Hist[Any]) -> bool:
+    """
+    Write a histogram with regular/variable axes to a compressed ``.npz``.
+    Returns False (writing nothing) for histograms that can't be stored. Of
+    the metadata, only a :class:`~uproot_browser.fill.Sampled` marker is kept.
+    """
+    import hist
+
+    arrays: dict[str, Any] = {
+        "storage": np.array(histogram.storage_type.__name__),
+        "values": np.asarray(histogram.view(flow=True)),
+    }
+    for i, axis in enumerate(histogram.axes):
+        kind = type(axis).__name__
+        if kind not in _AXIS_KINDS:
+            return False
+        arrays[f"axis{i}_edges"] = np.asarray(axis.edges)
+        # ``label`` falls back to the name; store the raw metadata instead
+        metadata = vars(axis)
+        arrays[f"axis{i}_meta"] = np.array(
+            [kind, metadata.get("name", ""), metadata.get("label", "")]
+        )
+        arrays[f"axis{i}_flow"] = np.array(
+            [axis.traits.underflow, axis.traits.overflow]
+        )
+    if not hasattr(hist.storage, str(arrays["storage"])):
+        return False
+    sampled = get_sampled(histogram)
+    if sampled is not None:
+        arrays["sampled"] = np.array(dataclasses.astuple(sampled))
+
+    # Write next to the target and rename, so readers never see partial files.
+    with tempfile.NamedTemporaryFile(
+        dir=path.parent, suffix=".tmp", delete=False
+    ) as tmp:
+        try:
+            np.savez_compressed(tmp, **arrays)
+        except BaseException:
+            tmp.close()
+            Path(tmp.name).unlink()
+            raise
+    Path(tmp.name).replace(path)
+    return True
+
+
+def load_histogram(path: Path) -> hist.Hist[Any]:
+    """
+    Read a histogram written by :func:`save_histogram`.
+    """
+    import hist
+
+    with np.load(path, allow_pickle=False) as data:
+        axes: list[hist.axis.Regular | hist.axis.Variable] = []
+        for i in range(len(data.files)):
+            if f"axis{i}_edges" not in data.files:
+                break
+            kind, name, label = (str(x) for x in data[f"axis{i}_meta"])
+            underflow, overflow = (bool(x) for x in data[f"axis{i}_flow"])
+            edges = data[f"axis{i}_edges"]
+            if kind == "Regular":
+                axes.append(
+                    hist.axis.Regular(
+                        len(edges) - 1,
+                        edges[0],
+                        edges[-1],
+                        underflow=underflow,
+                        overflow=overflow,
+                        name=name,
+                        label=label,
+                    )
+                )
+            else:
+                axes.append(
+                    hist.axis.Variable(
+                        edges,
+                        underflow=underflow,
+                        overflow=overflow,
+                        name=name,
+                        label=label,
+                    )
+                )
+        storage = getattr(hist.storage, str(data["storage"]))()
+        histogram: hist.Hist[Any] = hist.Hist(*axes, storage=storage)
+        histogram.view(flow=True)[...] = data["values"]
+        if "sampled" in data.files:
+            histogram.metadata = Sampled(*np.asarray(data["sampled"]).tolist())
+    return histogram
+
+
+class DiskCache:
+    """
+    Persistent histogram cache: one ``.npz`` per entry in ``directory``, with
+    the least recently used entries deleted once ``max_size`` is exceeded.
+    Reads bump the modification time, which doubles as the access time. The
+    directory is only scanned when a running estimate of its size (counting
+    the entries written since the last scan) goes over ``max_size``.
+    """
+
+    def __init__(
+        self, directory: Path | str, max_size: int | str = DEFAULT_DISK_CACHE_SIZE
+    ) -> None:
+        self.directory = Path(directory)
+        self.max_size = max_size if isinstance(max_size, int) else memory_size(max_size)
+        self._lock = threading.Lock()
+        # None until the directory has been scanned
+        self._size: int | None = None
+
+    def key(self, file: Any, *parts: Any) -> str | None:
+        """
+        Key for an object in an uproot ``ReadOnlyFile``; ``parts`` should hold
+        the object path and anything else that changes the result (binning).
+        Returns None if the file can't be identified (e.g. remote files).
+        """
+        identity = file_identity(file)
+        if identity is None:
+            return None
+        text = repr((_FORMAT_VERSION, identity, parts))
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.npz"
+
+    def get(self, key: str) -> hist.Hist[Any] | None:
+        path = self._path(key)
+        try:
+            histogram = load_histogram(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError):
+            # Corrupt or from an incompatible version; drop it
+            with contextlib.suppress(OSError):
+                path.unlink()
+            return None
+        with contextlib.suppress(OSError):
+            os.utime(path)
+        return histogram
+
+    def put(self, key: str, histogram: hist.Hist[Any]) -> None:
+        path = self._path(key)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            if save_histogram(path, histogram):
+                self._added(path.stat().st_size)
+        except OSError:
+            # A read-only or full cache directory must never break plotting
+            pass
+
+    def _added(self, size: int) -> None:
+        with self._lock:
+            if self._size is not None:
+                self._size += size
+                if self._size <= self.max_size:
+                    return
+        self.evict()
+
+    def evict(self) -> None:
+        """
+        Delete least recently used entries until within ``max_size``.
+        """
+        with self._lock:
+            entries = []
+            for path in self.directory.glob("*.npz"):
+                with contextlib.suppress(OSError):
+                    stat = path.stat()
+                    entries.append((stat.st_mtime_ns, stat.st_size, path))
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_size:
+                    break
+                with contextlib.suppress(OSError):
+                    path.unlink()
+                    total -= size
+            self._size = total
+
+    def get_or_compute(
+        self, key: str | None, compute: Callable[[], hist.Hist[Any]]
+    ) -> hist.Hist[Any]:
+        """
+        Return the stored histogram, computing and storing it on a miss. A
+        None key (unidentifiable file) always computes.
+        """
+        if key is None:
+            return compute()
+        histogram = self.get(key)
+        if histogram is None:
+            histogram = compute()
+            self.put(key, histogram)
+        return histogram
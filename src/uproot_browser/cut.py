@@ -0,0 +1,338 @@
+"""
+Cut expressions selecting what is plotted from a TTree, like
+``nJet > 2 & abs(eta) < 2.4``: a cut is parsed once, names the branches it
+needs, and is evaluated on each chunk of them with NumPy and awkward, so a
+selection never needs more than a chunk of any branch.
+"""
+
+from __future__ import annotations
+
+import ast
+import dataclasses
+import functools
+import itertools
+import re
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import types
+    from collections.abc import Mapping
+
+__all__ = (
+    "FUNCTIONS",
+    "Cut",
+    "select",
+)
+
+
+def __dir__() -> tuple[str, ...]:
+    return __all__
+
+
+# Names usable in a cut besides branches: elementwise NumPy functions (which
+# also work on jagged arrays), and the np and ak modules themselves
+FUNCTIONS = (
+    "abs",
+    "arccos",
+    "arcsin",
+    "arctan",
+    "arctan2",
+    "cos",
+    "cosh",
+    "exp",
+    "hypot",
+    "isfinite",
+    "isnan",
+    "log",
+    "log10",
+    "maximum",
+    "minimum",
+    "pi",
+    "sin",
+    "sinh",
+    "sqrt",
+    "tan",
+    "tanh",
+    "ak",
+    "np",
+)
+
+_NODES = (
+    ast.Expression,
+    ast.BoolOp,
+    ast.BinOp,
+    ast.UnaryOp,
+    ast.Compare,
+    ast.Call,
+    ast.Name,
+    ast.Attribute,
+    ast.Subscript,
+    ast.Slice,
+    ast.Tuple,
+    ast.Constant,
+    ast.Load,
+    ast.boolop,
+    ast.operator,
+    ast.unaryop,
+    ast.cmpop,
+)
+
+# The tokens rewritten before parsing: string literals (skipped, so nothing in
+# them is rewritten), backquoted branch names, for names that are not Python
+# identifiers, and ROOT's logical operators, plus & and |, which are spelled as
+# Python's words so that they bind after comparisons (see _Elementwise)
+_TOKENS = re.compile(
+    r"""(?P<string>'(?:\\.|[^'\\])*'|"(?:\\.|[^"\\])*")"""
+    r"|`(?P<quoted>[^`]+)`"
+    r"|(?P<op>&&|\|\||&(?!=)|\|(?!=)|!(?!=))"
+)
+_WORDS = {"&&": "and", "||": "or", "&": "and", "|": "or", "!": "not"}
+
+
+@functools.cache
+def _namespace() -> dict[str, Any]:
+    import awkward as ak
+
+    namespace: dict[str, Any] = {
+        name: getattr(np, name) for name in FUNCTIONS if hasattr(np, name)
+    }
+    namespace.update(abs=np.absolute, ak=ak, np=np, __builtins__={})
+    return namespace
+
+
+def _is_bool(node: ast.expr) -> bool:
+    """
+    True for expressions that are known to give booleans: comparisons, and
+    the elementwise logic between them.
+    """
+    if isinstance(node, ast.Compare):
+        return True
+    if isinstance(node, ast.BinOp) and isinstance(node.op, (ast.BitAnd, ast.BitOr)):
+        return _is_bool(node.left) and _is_bool(node.right)
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Invert):
+        return _is_bool(node.operand)
+    return (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Name)
+        and node.func.id in {"isfinite", "isnan"}
+    )
+
+
+def _truth(node: ast.expr) -> ast.expr:
+    """
+    ``node`` as booleans: numbers are true when non-zero, as in ROOT, rather
+    than combined bit by bit.
+    """
+    if _is_bool(node):
+        return node
+    return ast.Compare(node, [ast.NotEq()], [ast.Constant(0)])
+
+
+class _Elementwise(ast.NodeTransformer):
+    """
+    Turn ``and``, ``or``, ``not`` and chained comparisons, which Python
+    evaluates on whole objects, into the elementwise ``&``, ``|`` and ``~``.
+    The words at ``symbols`` (byte offsets in the source) were written ``&``
+    or ``|``, and go back to them as they are: logic between booleans, but
+    bitwise on numbers, as in ``(flags & 4) != 0``.
+    """
+
+    def __init__(self, symbols: set[int]) -> None:
+        self.symbols = symbols
+
+    def _symbolic(self, left: ast.expr, right: ast.expr) -> bool:
+        assert left.end_col_offset is not None
+        return any(
+            left.end_col_offset <= pos < right.col_offset for pos in self.symbols
+        )
+
+    def visit_BoolOp(self, node: ast.BoolOp) -> ast.AST:
+        # Found before the operands are replaced by nodes without positions
+        symbolic = [
+            self._symbolic(left, right)
+            for left, right in itertools.pairwise(node.values)
+        ]
+        self.generic_visit(node)
+        op: ast.operator = ast.BitAnd() if isinstance(node.op, ast.And) else ast.BitOr()
+        result = node.values[0]
+        for value, bitwise in zip(node.values[1:], symbolic, strict=True):
+            # & and | are logic between booleans already, and bitwise otherwise
+            if bitwise:
+                result = ast.BinOp(result, op, value)
+            else:
+                result = ast.BinOp(_truth(result), op, _truth(value))
+        return result
+
+    def visit_UnaryOp(self, node: ast.UnaryOp) -> ast.AST:
+        self.generic_visit(node)
+        if not isinstance(node.op, ast.Not):
+            return node
+        if _is_bool(node.operand):
+            return ast.UnaryOp(ast.Invert(), node.operand)
+        return ast.Compare(node.operand, [ast.Eq()], [ast.Constant(0)])
+
+    def visit_Compare(self, node: ast.Compare) -> ast.AST:
+        self.generic_visit(node)
+        if len(node.ops) == 1:
+            return node
+        lefts = [node.left, *node.comparators[:-1]]
+        pairs: list[ast.expr] = [
+            ast.Compare(left, [op], [right])
+            for left, op, right in zip(lefts, node.ops, node.comparators, strict=True)
+        ]
+        return functools.reduce(
+            lambda left, right: ast.BinOp(left, ast.BitAnd(), right), pairs
+        )
+
+
+def _check(tree: ast.Expression, text: str) -> None:
+    for node in ast.walk(tree):
+        if not isinstance(node, _NODES):
+            msg = f"Cut {text!r} can't use {type(node).__name__}"
+            raise ValueError(msg)  # noqa: TRY004
+        if isinstance(node, ast.Attribute) and not (
+            isinstance(node.value, ast.Name) and node.value.id in {"np", "ak"}
+        ):
+            msg = f"Cut {text!r} can only use attributes of np and ak"
+            raise ValueError(msg)
+        if (
+            isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Name)
+            and node.func.id not in FUNCTIONS
+        ):
+            msg = f"Cut {text!r} calls unknown function {node.func.id!r}"
+            raise ValueError(msg)
+
+
+@dataclasses.dataclass(frozen=True)
+class Cut:
+    """
+    A parsed cut: Python syntax over branch names, where ``and``, ``or`` and
+    ``not`` (or ROOT's ``&&``, ``||`` and ``!``) are elementwise, with numbers
+    true when non-zero. ``&`` and ``|`` bind like them, after comparisons, and
+    are logic between booleans but bitwise on numbers, like
+    ``(flags & 4) != 0``; ``~`` is Python's. Branch names that are not
+    identifiers are written in backquotes, like ```fTracks.fPx```.
+    """
+
+    text: str
+    # Identifiers in the code, and the branch each one stands for
+    names: dict[str, str]
+    # The expression with elementwise operators, as Python source
+    source: str
+    code: types.CodeType
+
+    @classmethod
+    def parse(cls, text: str) -> Cut:
+        quoted: dict[str, str] = {}
+        # Where the words standing for & and | start, as ast counts columns
+        symbols: set[int] = set()
+        stripped = text.strip()
+        source = ""
+        end = 0
+        for match in _TOKENS.finditer(stripped):
+            source += stripped[end : match.start()]
+            end = match.end()
+            op = match.group("op")
+            if match.group("quoted") is not None:
+                name = match.group("quoted")
+                source += quoted.setdefault(name, f"_branch_{len(quoted)}")
+            elif op is None:
+                source += match.group()
+            else:
+                # Spaced, except at the start, where Python allows none
+                source += " " if source else ""
+                if op in {"&", "|"}:
+                    symbols.add(len(source.encode()))
+                source += f"{_WORDS[op]} "
+        source += stripped[end:]
+
+        try:
+            tree = ast.parse(source, mode="eval")
+        except SyntaxError as err:
+            msg = f"Cut {text!r} is not a valid expression: {err.msg}"
+            raise ValueError(msg) from None
+        _check(tree, text)
+
+        identifiers = {
+            node.id
+            for node in ast.walk(tree)
+            if isinstance(node, ast.Name) and node.id not in FUNCTIONS
+        }
+        branches = {value: key for key, value in quoted.items()}
+        names = {name: branches.get(name, name) for name in sorted(identifiers)}
+
+        elementwise = ast.fix_missing_locations(_Elementwise(symbols).visit(tree))
+        return cls(
+            text,
+            names,
+            ast.unparse(elementwise),
+            compile(elementwise, f"<cut {text!r}>", "eval"),
+        )
+
+    def branches(self, tree: Any) -> dict[str, Any]:
+        """The branches of ``tree`` used by the cut, by identifier."""
+        import uproot
+
+        branches = {}
+        for identifier, name in self.names.items():
+            try:
+                branches[identifier] = tree[name]
+            except uproot.KeyInFileError:  # noqa: PERF203
+                msg = f"Cut {self.text!r}: no branch {name!r} in {tree.name}"
+                raise ValueError(msg) from None
+        return branches
+
+    def dump(self, tree: str) -> str:
+        """
+        Python source setting ``mask`` to the cut on the whole branches of
+        the TTree ``tree`` (an expression), with awkward imported as ``ak``
+        and NumPy as ``np``.
+        """
+        functions = sorted(
+            {
+                node.id
+                for node in ast.walk(ast.parse(self.source, mode="eval"))
+                if isinstance(node, ast.Name)
+                and node.id in FUNCTIONS
+                and node.id not in {"abs", "ak", "np"}
+            }
+        )
+        lines = [f"from numpy import {', '.join(functions)}"] if functions else []
+        lines += [
+            f"{identifier} = {tree}[{name!r}].array()"
+            for identifier, name in self.names.items()
+        ]
+        lines.append(f"mask = {self.source}")
+        return "\n".join(lines)
+
+    def evaluate(self, arrays: Mapping[str, Any]) -> Any:
+        """
+        The mask for a chunk, from the arrays of the branches the cut uses
+        (by identifier).
+        """
+        # pylint: disable-next=eval-used
+        return eval(self.code, dict(_namespace()), dict(arrays))
+
+
+def select(mask: Any, *arrays: Any) -> list[Any]:
+    """
+    The values of ``arrays`` where ``mask`` is true (or non-zero). The mask
+    and the arrays are broadcast against each other entry by entry first, so
+    a per-entry cut selects whole entries of jagged branches, and a per-value
+    cut on a jagged branch selects values of a per-entry branch as many times
+    as they pass, like ``TTree::Draw``.
+    """
+    import awkward as ak
+
+    if np.isscalar(mask):
+        mask = np.full(len(arrays[0]), bool(mask))
+    try:
+        *values, keep = ak.broadcast_arrays(*arrays, mask)
+    except ValueError:
+        msg = "The cut and the plotted branches have different numbers of values"
+        raise ValueError(msg) from None
+    keep = ak.values_astype(keep, bool)
+    return [value[keep] for value in values]
@@ -5,3 +5,7 @@ from __future__ import annotations
 
 class EmptyTreeError(ValueError):
     pass
+
+
+class CancelledError(Exception):
+    """Raised between chunks when a read is no longer wanted."""
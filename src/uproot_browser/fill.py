@@ -0,0 +1,875 @@
+"""
+Chunked, bounded-memory histogram filling for branches and fields.
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import dataclasses
+import itertools
+import math
+import os
+import re
+import time
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from uproot_browser.cut import Cut, select
+from uproot_browser.exceptions import CancelledError, EmptyTreeError
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator, Sequence
+
+    import hist
+
+__all__ = (
+    "DEFAULT_STEP_SIZE",
+    "PROGRESS_INTERVAL",
+    "Progress",
+    "RangeEstimator",
+    "Sampled",
+    "chunk_boundaries",
+    "entries_per_step",
+    "estimate_nbytes",
+    "fill_branch",
+    "fill_branches",
+    "fill_pair",
+    "get_sampled",
+    "iter_chunks",
+    "memory_size",
+    "sample_boundaries",
+)
+
+
+def __dir__() -> tuple[str, ...]:
+    return __all__
+
+
+DEFAULT_STEP_SIZE = "100 MB"
+
+_UNITS = {
+    "": 1,
+    "B": 1,
+    "kB": 1000,
+    "KB": 1000,
+    "MB": 1000**2,
+    "GB": 1000**3,
+    "TB": 1000**4,
+    "kiB": 1024,
+    "KiB": 1024,
+    "MiB": 1024**2,
+    "GiB": 1024**3,
+    "TiB": 1024**4,
+}
+
+# RNTuple fields don't expose a cheap byte count; assume a double per entry.
+_FALLBACK_BYTES_PER_ENTRY = 8
+
+
+def memory_size(size: str) -> int:
+    """
+    Parse a memory size like ``"100 MB"`` or ``"1 GiB"`` into bytes.
+    """
+    match = re.fullmatch(r"\s*([0-9]*\.?[0-9]+)\s*([kKMGT]?i?B)?\s*", size)
+    if match is None or (match.group(2) or "") not in _UNITS:
+        msg = f"Cannot interpret {size!r} as a memory size"
+        raise ValueError(msg)
+    return int(float(match.group(1)) * _UNITS[match.group(2) or ""])
+
+
+def estimate_nbytes(tree: Any) -> int:
+    """
+    Rough uncompressed size of reading all of a branch (0 if unknown).
+    """
+    uncompressed = getattr(tree, "uncompressed_bytes", None)
+    if uncompressed:
+        return int(uncompressed)
+    return int(getattr(tree, "num_entries", 0)) * _FALLBACK_BYTES_PER_ENTRY
+
+
+def entries_per_step(tree: Any, step_size: int | str) -> int:
+    """
+    Number of entries to read at once; ``step_size`` is either a number of
+    entries or a memory budget string (estimated from the uncompressed size).
+    """
+    if isinstance(step_size, int):
+        return max(step_size, 1)
+
+    budget = memory_size(step_size)
+    num_entries = max(int(tree.num_entries), 1)
+    per_entry = estimate_nbytes(tree) / num_entries
+    return max(int(budget / max(per_entry, 1.0)), 1)
+
+
+def _entry_offsets(tree: Any) -> list[int]:
+    """
+    Entry boundaries of the storage units (TBasket or RNTuple cluster).
+    """
+    import uproot.models.RNTuple
+
+    if isinstance(tree, uproot.models.RNTuple.RField):
+        offsets = [0] + [
+            c.num_first_entry + c.num_entries for c in tree.ntuple.cluster_summaries
+        ]
+    else:
+        offsets = [int(x) for x in tree.entry_offsets]
+    num_entries = int(tree.num_entries)
+    if not offsets or offsets[-1] < num_entries:
+        offsets.append(num_entries)
+    return offsets
+
+
+def chunk_boundaries(
+    tree: Any, *, step_size: int | str = DEFAULT_STEP_SIZE
+) -> list[tuple[int, int]]:
+    """
+    Split a branch into ``(start, stop)`` entry ranges that never cut through a
+    basket (or cluster), grouping baskets until a step is reached.
+    """
+    step = entries_per_step(tree, step_size)
+    return _group_offsets(_entry_offsets(tree), step)
+
+
+def _group_offsets(offsets: list[int], step: int) -> list[tuple[int, int]]:
+    boundaries: list[tuple[int, int]] = []
+    start = offsets[0]
+    for stop in offsets[1:]:
+        if stop - start >= step:
+            boundaries.append((start, stop))
+            start = stop
+    if start < offsets[-1]:
+        boundaries.append((start, offsets[-1]))
+    return boundaries
+
+
+def sample_boundaries(tree: Any, fraction: float) -> list[tuple[int, int]]:
+    """
+    ``(start, stop)`` entry ranges of about ``fraction`` of the baskets (or
+    clusters), at least one: the baskets are split into equal strata and the
+    middle one of each is taken, so the sample spans the whole entry range.
+    """
+    return _sample_offsets(_entry_offsets(tree), fraction)
+
+
+def _sample_offsets(offsets: list[int], fraction: float) -> list[tuple[int, int]]:
+    baskets = list(itertools.pairwise(offsets))
+    if not baskets:
+        return []
+    count = min(max(math.ceil(fraction * len(baskets)), 1), len(baskets))
+    picks = ((np.arange(count) + 0.5) * len(baskets) / count).astype(int)
+    return [baskets[i] for i in picks]
+
+
+def iter_chunks(
+    tree: Any,
+    *,
+    step_size: int | str = DEFAULT_STEP_SIZE,
+    cancelled: Callable[[], bool] | None = None,
+) -> Iterator[np.typing.NDArray[Any]]:
+    """
+    Yield the flattened values of a branch one basket-aligned chunk at a time,
+    so only a single chunk is ever held in memory. ``cancelled`` is checked
+    before each chunk is read; if it returns True, :class:`CancelledError` is
+    raised.
+    """
+    boundaries = chunk_boundaries(tree, step_size=step_size)
+    return _iter_chunks(tree, boundaries, cancelled)
+
+
+def _iter_chunks(
+    tree: Any,
+    boundaries: list[tuple[int, int]],
+    cancelled: Callable[[], bool] | None,
+) -> Iterator[np.typing.NDArray[Any]]:
+    for start, stop in boundaries:
+        if cancelled is not None and cancelled():
+            msg = f"Reading {tree.name} was cancelled"
+            raise CancelledError(msg)
+        yield _flat(tree.array(entry_start=start, entry_stop=stop))
+
+
+def _flat(array: Any) -> np.typing.NDArray[Any]:
+    import awkward as ak
+
+    values = ak.flatten(array) if array.ndim > 1 else array
+    return np.ravel(ak.to_numpy(values))
+
+
+def _finite(values: np.typing.NDArray[Any]) -> np.typing.NDArray[Any]:
+    if values.dtype == np.bool_:
+        values = values.view(np.uint8)
+    finite: np.typing.NDArray[Any] = values[np.isfinite(values)]
+    return finite
+
+
+def _finite_rows(
+    values: tuple[np.typing.NDArray[Any], ...],
+) -> tuple[np.typing.NDArray[Any], ...]:
+    """
+    The points (one array of coordinates per axis) with all coordinates finite.
+    """
+    if len(values) == 1:
+        return (_finite(values[0]),)
+    values = tuple(v.view(np.uint8) if v.dtype == np.bool_ else v for v in values)
+    mask = np.logical_and.reduce([np.isfinite(v) for v in values])
+    return tuple(v[mask] for v in values)
+
+
+# A tail is only cut off if it reaches further than this fraction of the
+# quantile range beyond it.
+_TAIL_FRACTION = 0.5
+
+
+class RangeEstimator:
+    """
+    One-pass, bounded-memory summary of a stream of chunks: the exact count,
+    minimum and maximum, plus a uniform reservoir sample of at most ``size``
+    values for approximate quantiles. The sample is independent of chunk order,
+    and merging a chunk costs O(``size``), not O(chunk).
+    """
+
+    def __init__(self, size: int = 2**16, *, seed: int = 42) -> None:
+        self.size = size
+        self.count = 0
+        self.low = np.inf
+        self.high = -np.inf
+        self._sample: np.typing.NDArray[np.float64] = np.empty(0)
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values: np.typing.NDArray[Any]) -> None:
+        """
+        Add a chunk of finite values.
+        """
+        num = len(values)
+        if num == 0:
+            return
+        self.low = min(self.low, float(values.min()))
+        self.high = max(self.high, float(values.max()))
+
+        total = self.count + num
+        if total <= self.size:
+            new = values
+            old = self._sample
+        else:
+            # Each of the ``size`` slots comes from this chunk with probability
+            # proportional to its share of everything seen so far.
+            num_new = min(int(self._rng.binomial(self.size, num / total)), num)
+            num_old = min(self.size - num_new, len(self._sample))
+            new = values[self._rng.choice(num, num_new, replace=False)]
+            old = self._sample[
+                self._rng.choice(len(self._sample), num_old, replace=False)
+            ]
+        self._sample = np.concatenate([old, np.asarray(new, dtype=np.float64)])
+        self.count = total
+
+    def quantile(self, q: float) -> float:
+        """
+        Approximate quantile (exact while fewer than ``size`` values were seen).
+        """
+        return float(np.quantile(self._sample, q))
+
+    def robust_range(
+        self, lower: float = 0.001, upper: float = 0.999
+    ) -> tuple[float, float]:
+        """
+        Histogram range: the ``lower``-``upper`` quantiles, widened to the
+        exact minimum/maximum on a side whose tail is not far from the bulk.
+        Values left out end up in the under/overflow bins.
+        """
+        if self.count == 0:
+            msg = "No values to compute a range from"
+            raise ValueError(msg)
+
+        low, high = self.quantile(lower), self.quantile(upper)
+        span = high - low
+        if self.low >= low - _TAIL_FRACTION * span:
+            low = self.low
+        if self.high <= high + _TAIL_FRACTION * span:
+            high = self.high
+        if low == high:
+            return low - 0.5, high + 0.5
+        return low, high
+
+
+def _fill(histogram: hist.Hist[Any], values: np.typing.NDArray[Any]) -> hist.Hist[Any]:
+    """
+    Fill with ``numpy.histogram`` semantics (the upper edge is inclusive), with
+    out-of-range values counted in the flow bins.
+    """
+    axis = histogram.axes[0]
+    low, high = axis.edges[0], axis.edges[-1]
+    view = histogram.view(flow=True)
+    view[1:-1] += np.histogram(values, bins=len(axis), range=(low, high))[0]
+    view[0] += np.count_nonzero(values < low)
+    view[-1] += np.count_nonzero(values > high)
+    return histogram
+
+
+def _fill_nd(
+    histogram: hist.Hist[Any], values: tuple[np.typing.NDArray[Any], ...]
+) -> hist.Hist[Any]:
+    """
+    :func:`_fill` for several axes: each coordinate is located among the
+    edges (with the last one inclusive), so the flow bins of every axis are
+    counted in a single ``bincount``.
+    """
+    view = histogram.view(flow=True)
+    index = np.zeros(len(values[0]), dtype=np.intp)
+    for axis, coordinates in zip(histogram.axes, values, strict=True):
+        edges = axis.edges
+        # 0 is the underflow, len(axis) + 1 the overflow
+        located = np.searchsorted(edges, coordinates, side="right")
+        located[coordinates == edges[-1]] = len(axis)
+        index = index * (len(axis) + 2) + located
+    view += np.bincount(index, minlength=view.size).reshape(view.shape)
+    return histogram
+
+
+def _fill_buffered(
+    bins: int,
+    estimators: list[RangeEstimator],
+    buffered: list[tuple[np.typing.NDArray[Any], ...]],
+    labels: tuple[str, ...] = ("",),
+) -> hist.Hist[Any]:
+    """
+    A histogram with the ranges estimated so far, filled with the buffer.
+    """
+    import hist
+
+    histogram = hist.Hist(
+        *(
+            hist.axis.Regular(bins, *estimator.robust_range(), label=label)
+            for estimator, label in zip(estimators, labels, strict=True)
+        ),
+        storage=hist.storage.Int64(),
+    )
+    for chunk in buffered:
+        _fill_chunk(histogram, chunk)
+    return histogram
+
+
+def _fill_chunk(
+    histogram: hist.Hist[Any], values: tuple[np.typing.NDArray[Any], ...]
+) -> None:
+    if len(values) == 1:
+        _fill(histogram, values[0])
+    else:
+        _fill_nd(histogram, values)
+
+
+class _Filler:
+    """
+    The state of one histogram being filled, with an axis for each of
+    ``labels``: finite points are buffered (up to ``budget`` bytes) while the
+    ranges are estimated, then the ranges are fixed and later points are
+    filled directly.
+    """
+
+    def __init__(self, bins: int, budget: int, labels: tuple[str, ...] = ("",)) -> None:
+        self.bins = bins
+        self.budget = budget
+        self.labels = labels
+        self.estimators = [RangeEstimator() for _ in labels]
+        self.buffered: list[tuple[np.typing.NDArray[Any], ...]] = []
+        self.buffered_bytes = 0
+        self.histogram: hist.Hist[Any] | None = None
+        self.nbytes = 0
+
+    def add(self, *values: np.typing.NDArray[Any]) -> None:
+        """Add a chunk: an array of coordinates for each axis."""
+        self.nbytes += sum(v.nbytes for v in values)
+        finite = _finite_rows(values)
+        if self.histogram is not None:
+            _fill_chunk(self.histogram, finite)
+            return
+        for estimator, coordinates in zip(self.estimators, finite, strict=True):
+            estimator.update(coordinates)
+        self.buffered.append(finite)
+        self.buffered_bytes += sum(v.nbytes for v in finite)
+        if self.buffered_bytes > self.budget:
+            self.histogram = self._fill_buffered()
+            self.buffered.clear()
+
+    def _fill_buffered(self) -> hist.Hist[Any]:
+        return _fill_buffered(self.bins, self.estimators, self.buffered, self.labels)
+
+    def partial(self) -> hist.Hist[Any] | None:
+        """A copy of the histogram so far, None if there are no values yet."""
+        if self.histogram is not None:
+            return self.histogram.copy()
+        if self.estimators[0].count == 0:
+            return None
+        return self._fill_buffered()
+
+    def result(self) -> hist.Hist[Any] | None:
+        """The filled histogram, None if there were no finite values."""
+        if self.histogram is None:
+            if self.estimators[0].count == 0:
+                return None
+            self.histogram = self._fill_buffered()
+            self.buffered.clear()
+        return self.histogram
+
+
+@dataclasses.dataclass(frozen=True)
+class Sampled:
+    """
+    Histogram metadata marking an estimate: only ``entries`` of
+    ``num_entries`` entries (from ``baskets`` of ``total_baskets`` baskets)
+    were read, and the counts were scaled up to the whole branch.
+    """
+
+    baskets: int
+    total_baskets: int
+    entries: int
+    num_entries: int
+
+
+def get_sampled(histogram: hist.Hist[Any]) -> Sampled | None:
+    """
+    The :class:`Sampled` marker of an estimated histogram, or None.
+    """
+    # Reading an unset ``metadata`` attribute warns in boost-histogram
+    metadata = vars(histogram).get("metadata")
+    return metadata if isinstance(metadata, Sampled) else None
+
+
+def _scale(histogram: hist.Hist[Any], sampled: Sampled) -> hist.Hist[Any]:
+    import hist
+
+    scaled = hist.Hist(*histogram.axes, storage=hist.storage.Double())
+    factor = sampled.num_entries / sampled.entries
+    scaled.view(flow=True)[...] = histogram.view(flow=True) * factor
+    scaled.metadata = sampled
+    return scaled
+
+
+# Minimum time between two progress reports, in seconds.
+PROGRESS_INTERVAL = 0.1
+
+
+@dataclasses.dataclass(frozen=True)
+class Progress:
+    """
+    A partial result of :func:`fill_branch`: the histogram of ``entries`` of
+    the ``num_entries`` entries to read, after reading ``nbytes`` bytes
+    (uncompressed) of values.
+    """
+
+    histogram: hist.Hist[Any]
+    entries: int
+    num_entries: int
+    nbytes: int
+
+    @property
+    def fraction(self) -> float:
+        return self.entries / self.num_entries if self.num_entries else 1.0
+
+
+def fill_branch(  # noqa: PLR0913
+    tree: Any,
+    *,
+    bins: int,
+    step_size: int | str = DEFAULT_STEP_SIZE,
+    buffer_size: int | str = DEFAULT_STEP_SIZE,
+    cancelled: Callable[[], bool] | None = None,
+    progress: Callable[[Progress], None] | None = None,
+    sample: float | None = None,
+    cut: str = "",
+) -> hist.Hist[Any]:
+    """
+    Histogram the finite values of a branch in a single chunked pass.
+
+    Chunks are held (up to ``buffer_size`` bytes) while a
+    :class:`RangeEstimator` watches them; once the branch is exhausted or the
+    buffer is full, the range is fixed from the estimator, the buffer is
+    filled and released, and any later chunks are filled directly, with
+    values outside the range landing in the under/overflow bins. See
+    :func:`iter_chunks` for ``cancelled``.
+
+    If given, ``progress`` is called with a :class:`Progress` after the first
+    chunk and then at most every ``PROGRESS_INTERVAL`` seconds, but not after
+    the last chunk. Until the range is fixed, the partial histograms use the
+    range estimated so far.
+
+    With ``sample``, only that fraction of the baskets is read (see
+    :func:`sample_boundaries`); the result has ``Double`` storage, counts
+    scaled to the whole branch and :class:`Sampled` metadata.
+
+    With a ``cut`` (see :class:`~uproot_browser.cut.Cut`), only the values
+    passing it are filled; the branches it uses are read along with this
+    one, a chunk at a time, by :func:`fill_branches`.
+    """
+    if cut:
+        return _fill_branch_cut(
+            tree,
+            cut,
+            bins=bins,
+            step_size=step_size,
+            buffer_size=buffer_size,
+            cancelled=cancelled,
+            progress=progress,
+            sample=sample,
+        )
+
+    budget = buffer_size if isinstance(buffer_size, int) else memory_size(buffer_size)
+    filler = _Filler(bins, budget)
+
+    if sample is None:
+        boundaries = chunk_boundaries(tree, step_size=step_size)
+    else:
+        boundaries = sample_boundaries(tree, sample)
+    num_entries = sum(stop - start for start, stop in boundaries)
+    entries = 0
+    reported = -np.inf
+
+    chunks = _iter_chunks(tree, boundaries, cancelled)
+    for (start, stop), values in zip(boundaries, chunks, strict=True):
+        entries += stop - start
+        filler.add(values)
+
+        if (
+            progress is not None
+            and entries < num_entries
+            and time.monotonic() - reported >= PROGRESS_INTERVAL
+        ):
+            partial = filler.partial()
+            if partial is not None:
+                progress(Progress(partial, entries, num_entries, filler.nbytes))
+                reported = time.monotonic()
+
+    histogram = filler.result()
+    if histogram is None:
+        msg = f"Branch {tree.name} is empty."
+        raise EmptyTreeError(msg)
+
+    total_entries = int(tree.num_entries)
+    if sample is not None and num_entries < total_entries:
+        total_baskets = len(_entry_offsets(tree)) - 1
+        sampled = Sampled(len(boundaries), total_baskets, num_entries, total_entries)
+        return _scale(histogram, sampled)
+    return histogram
+
+
+def _fill_branch_cut(  # noqa: PLR0913
+    tree: Any,
+    cut: str,
+    *,
+    bins: int,
+    step_size: int | str,
+    buffer_size: int | str,
+    cancelled: Callable[[], bool] | None,
+    progress: Callable[[Progress], None] | None,
+    sample: float | None,
+) -> hist.Hist[Any]:
+    if getattr(tree, "tree", None) is None:
+        msg = f"Cuts select entries of a TTree, they can't be applied to {tree.name}"
+        raise ValueError(msg)
+    (histogram,) = fill_branches(
+        tree.tree,
+        [tree],
+        bins=bins,
+        step_size=step_size,
+        buffer_size=buffer_size,
+        cancelled=cancelled,
+        progress=None if progress is None else lambda _, partial: progress(partial),
+        sample=sample,
+        cut=cut,
+        max_workers=1,
+    )
+    if histogram is None:
+        msg = f"No values of {tree.name} pass the cut {cut!r}."
+        raise EmptyTreeError(msg)
+    return histogram
+
+
+def _common_offsets(tree: Any, branches: Sequence[Any]) -> list[int]:
+    """
+    Entry boundaries shared by the baskets of all ``branches`` of ``tree``.
+    """
+    paths = {branch.object_path for branch in branches}
+    offsets = [
+        int(x)
+        for x in tree.common_entry_offsets(
+            filter_branch=lambda branch: branch.object_path in paths
+        )
+    ]
+    num_entries = int(tree.num_entries)
+    if not offsets or offsets[-1] < num_entries:
+        offsets.append(num_entries)
+    return offsets
+
+
+def _boundaries(
+    tree: Any, branches: Sequence[Any], step_size: int | str, sample: float | None
+) -> tuple[list[int], list[tuple[int, int]]]:
+    """
+    The basket boundaries shared by ``branches``, and the chunks to read
+    them in (or to sample them from).
+    """
+    offsets = _common_offsets(tree, branches)
+    if sample is None:
+        return offsets, _group_offsets(offsets, _shared_step(tree, branches, step_size))
+    return offsets, _sample_offsets(offsets, sample)
+
+
+def _with_cut(
+    tree: Any, branches: Sequence[Any], cut: str
+) -> tuple[list[Any], Callable[[dict[str, Any]], Any] | None]:
+    """
+    The branches to read for ``branches`` of ``tree`` and a ``cut`` on them
+    (``branches``, then those only the cut uses), and a function giving the
+    mask of a chunk from its arrays, by branch name (None without a cut).
+    The cut is parsed once, here.
+    """
+    if not cut:
+        return list(branches), None
+    parsed = Cut.parse(cut)
+    used = parsed.branches(tree)
+    reading = list(branches)
+    paths = {branch.object_path for branch in reading}
+    for branch in used.values():
+        if branch.object_path not in paths:
+            paths.add(branch.object_path)
+            reading.append(branch)
+    names = [branch.name for branch in reading]
+    if len(set(names)) < len(names):
+        msg = f"Branch names must be unique in a single pass: {names}"
+        raise ValueError(msg)
+
+    def mask(arrays: dict[str, Any]) -> Any:
+        return parsed.evaluate(
+            {identifier: arrays[branch.name] for identifier, branch in used.items()}
+        )
+
+    return reading, mask
+
+
+def _add_selected(filler: _Filler, array: Any, mask: Any) -> None:
+    if mask is not None:
+        (array,) = select(mask, array)
+    filler.add(_flat(array))
+
+
+def _shared_step(tree: Any, branches: Sequence[Any], step_size: int | str) -> int:
+    """
+    :func:`entries_per_step` for reading all of ``branches`` at once.
+    """
+    if isinstance(step_size, int):
+        return max(step_size, 1)
+    num_entries = max(int(tree.num_entries), 1)
+    per_entry = sum(estimate_nbytes(branch) for branch in branches) / num_entries
+    return max(int(memory_size(step_size) / max(per_entry, 1.0)), 1)
+
+
+def _iter_arrays(
+    tree: Any,
+    branches: Sequence[Any],
+    boundaries: list[tuple[int, int]],
+    cancelled: Callable[[], bool] | None,
+    executor: concurrent.futures.Executor | None = None,
+) -> Iterator[list[Any]]:
+    """
+    The arrays of each of ``branches``, one chunk at a time, each chunk read
+    with a single ``arrays`` call whose baskets are decompressed on
+    ``executor`` (by default, serially).
+    """
+    paths = {branch.object_path for branch in branches}
+
+    def wanted(branch: Any) -> bool:
+        return branch.object_path in paths
+
+    for start, stop in boundaries:
+        if cancelled is not None and cancelled():
+            msg = f"Reading {tree.name} was cancelled"
+            raise CancelledError(msg)
+        arrays = tree.arrays(
+            filter_branch=wanted,
+            entry_start=start,
+            entry_stop=stop,
+            decompression_executor=executor,
+            how=dict,
+        )
+        yield [arrays[branch.name] for branch in branches]
+
+
+def _report(
+    progress: Callable[[int, Progress], None],
+    fillers: list[_Filler],
+    partials: Iterable[hist.Hist[Any] | None],
+    entries: int,
+    num_entries: int,
+) -> None:
+    for index, (filler, partial) in enumerate(zip(fillers, partials, strict=True)):
+        if partial is not None:
+            progress(index, Progress(partial, entries, num_entries, filler.nbytes))
+
+
+def fill_branches(  # noqa: PLR0913
+    tree: Any,
+    branches: Sequence[Any],
+    *,
+    bins: int,
+    step_size: int | str = DEFAULT_STEP_SIZE,
+    buffer_size: int | str = DEFAULT_STEP_SIZE,
+    cancelled: Callable[[], bool] | None = None,
+    progress: Callable[[int, Progress], None] | None = None,
+    done: Callable[[int, hist.Hist[Any] | None], None] | None = None,
+    sample: float | None = None,
+    max_workers: int | None = None,
+    cut: str = "",
+) -> list[hist.Hist[Any] | None]:
+    """
+    Histogram several ``branches`` of a TTree in a single chunked pass, as
+    :func:`fill_branch` does for one: each chunk of all of them is read at
+    once (sharing the basket reads), on boundaries common to their baskets,
+    and the branches are filled in parallel on a pool of ``max_workers``
+    threads while the next chunk is read (and decompressed on the same pool).
+    Branch names must be unique. With a ``cut``, the branches it uses are
+    read in the same chunks, the cut is evaluated once per chunk and only the
+    values passing it are filled (see :func:`~uproot_browser.cut.select`).
+
+    ``progress`` is called with the index of a branch and its
+    :class:`Progress`; ``done`` with the index and the final histogram (None
+    for an empty branch) as soon as that branch is finished. The histograms
+    are also returned, in the order of ``branches``.
+    """
+    names = [branch.name for branch in branches]
+    if len(set(names)) < len(names):
+        msg = f"Branch names must be unique in a single pass: {names}"
+        raise ValueError(msg)
+
+    budget = buffer_size if isinstance(buffer_size, int) else memory_size(buffer_size)
+    fillers = [_Filler(bins, budget) for _ in branches]
+
+    reading, mask_of = _with_cut(tree, branches, cut)
+    offsets, boundaries = _boundaries(tree, reading, step_size, sample)
+    num_entries = sum(stop - start for start, stop in boundaries)
+    entries = 0
+    reported = -np.inf
+
+    workers = max_workers or min(len(branches), os.cpu_count() or 1)
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="uproot-browser-fill"
+    ) as pool:
+        pending: list[concurrent.futures.Future[None]] = []
+        chunks = _iter_arrays(tree, reading, boundaries, cancelled, pool)
+        # The next chunk is read while the previous one is being filled
+        for (start, stop), chunk in zip(boundaries, chunks, strict=True):
+            for future in pending:
+                future.result()
+            if (
+                progress is not None
+                and entries
+                and time.monotonic() - reported >= PROGRESS_INTERVAL
+            ):
+                # Partial histograms are built in parallel too
+                partials = pool.map(_Filler.partial, fillers)
+                _report(progress, fillers, partials, entries, num_entries)
+                reported = time.monotonic()
+            entries += stop - start
+            arrays = {
+                branch.name: array for branch, array in zip(reading, chunk, strict=True)
+            }
+            mask = None if mask_of is None else mask_of(arrays)
+            pending = [
+                pool.submit(_add_selected, filler, arrays[branch.name], mask)
+                for filler, branch in zip(fillers, branches, strict=True)
+            ]
+        for future in pending:
+            future.result()
+
+        total_entries = int(tree.num_entries)
+        sampled = (
+            Sampled(len(boundaries), len(offsets) - 1, num_entries, total_entries)
+            if sample is not None and num_entries < total_entries
+            else None
+        )
+        results: list[hist.Hist[Any] | None] = [None] * len(branches)
+        finishing = {pool.submit(filler.result): i for i, filler in enumerate(fillers)}
+        for ready in concurrent.futures.as_completed(finishing):
+            index = finishing[ready]
+            histogram = ready.result()
+            if histogram is not None and sampled is not None:
+                histogram = _scale(histogram, sampled)
+            results[index] = histogram
+            if done is not None:
+                done(index, histogram)
+    return results
+
+
+def fill_pair(  # noqa: PLR0913
+    xtree: Any,
+    ytree: Any,
+    *,
+    bins: int,
+    step_size: int | str = DEFAULT_STEP_SIZE,
+    buffer_size: int | str = DEFAULT_STEP_SIZE,
+    cancelled: Callable[[], bool] | None = None,
+    progress: Callable[[Progress], None] | None = None,
+    sample: float | None = None,
+    cut: str = "",
+) -> hist.Hist[Any]:
+    """
+    Histogram two branches of the same TTree against each other (``xtree``
+    on the first axis, ``ytree`` on the second) in a single chunked pass into
+    a 2-D histogram, with the same buffering, progress reports and sampling
+    as :func:`fill_branch`. Only one chunk of both branches is held at a time.
+
+    The values are paired up entry by entry: a branch with a value per entry
+    is repeated for each value of a jagged one, and two jagged branches must
+    have the same number of values in each entry. Pairs with a non-finite
+    value, or not passing the ``cut``, are left out.
+    """
+    import awkward as ak
+
+    tree = xtree.tree
+    if ytree.tree.object_path != tree.object_path:
+        msg = f"Branches {xtree.name} and {ytree.name} are not in the same TTree"
+        raise ValueError(msg)
+    # The same branch on both axes is only read once
+    branches = [xtree] if xtree.object_path == ytree.object_path else [xtree, ytree]
+
+    budget = buffer_size if isinstance(buffer_size, int) else memory_size(buffer_size)
+    filler = _Filler(bins, budget, labels=(xtree.name, ytree.name))
+
+    reading, mask_of = _with_cut(tree, branches, cut)
+    offsets, boundaries = _boundaries(tree, reading, step_size, sample)
+    num_entries = sum(stop - start for start, stop in boundaries)
+    entries = 0
+    reported = -np.inf
+
+    chunks = _iter_arrays(tree, reading, boundaries, cancelled)
+    for (start, stop), chunk in zip(boundaries, chunks, strict=True):
+        entries += stop - start
+        x, y = chunk[0], chunk[len(branches) - 1]
+        if mask_of is None:
+            x, y = ak.broadcast_arrays(x, y)
+        else:
+            arrays = {
+                branch.name: array for branch, array in zip(reading, chunk, strict=True)
+            }
+            x, y = select(mask_of(arrays), x, y)
+        filler.add(_flat(x), _flat(y))
+
+        if (
+            progress is not None
+            and entries < num_entries
+            and time.monotonic() - reported >= PROGRESS_INTERVAL
+        ):
+            partial = filler.partial()
+            if partial is not None:
+                progress(Progress(partial, entries, num_entries, filler.nbytes))
+                reported = time.monotonic()
+
+    histogram = filler.result()
+    if histogram is None:
+        msg = f"Branches {xtree.name} and {ytree.name} have no finite pairs."
+        raise EmptyTreeError(msg)
+
+    total_entries = int(tree.num_entries)
+    if sample is not None and num_entries < total_entries:
+        sampled = Sampled(len(boundaries), len(offsets) - 1, num_entries, total_entries)
+        return _scale(histogram, sampled)
+    return histogram
@@ -0,0 +1,214 @@
+"""
+Machine-readable inventories of files: one JSON record per object, with its
+class, entries, type and storage sizes, written as the file is walked.
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import glob
+import json
+import sys
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Literal, TextIO
+
+from uproot_browser.structure import make_record
+from uproot_browser.tree import UprootEntry, path_matches
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+__all__ = (
+    "INVENTORY_FIELDS",
+    "expand_paths",
+    "file_inventory",
+    "iter_inventories",
+    "iter_inventory",
+    "print_inventories",
+    "print_inventory",
+)
+
+
+def __dir__() -> tuple[str, ...]:
+    return __all__
+
+
+# Keys of each record, after "file" and "path"
+INVENTORY_FIELDS = (
+    "classname",
+    "typename",
+    "num_entries",
+    "compressed_bytes",
+    "uncompressed_bytes",
+    "num_baskets",
+    "is_dir",
+)
+
+
+def iter_inventory(
+    upfile: Any,
+    *,
+    max_depth: int | None = None,
+    pattern: str | None = None,
+) -> Iterator[dict[str, Any]]:
+    """
+    Records for the objects in an open file, depth-first, no deeper than
+    ``max_depth``. Only containers and the objects matching the glob
+    ``pattern`` are included. Histograms and other objects are described from
+    their TKey, without being read; nothing is rendered.
+    """
+    for entry in UprootEntry("/", upfile).walk(max_depth=max_depth):
+        if not (pattern is None or entry.is_dir or path_matches(entry.path, pattern)):
+            continue
+        record = make_record(entry, read=False, label=False)
+        yield {"path": record.path.lstrip("/")} | {
+            field: getattr(record, field) for field in INVENTORY_FIELDS
+        }
+
+
+def print_inventory(
+    entry: str,
+    *,
+    output_format: Literal["json", "jsonl"],
+    file: TextIO | None = None,
+    max_depth: int | None = None,
+    pattern: str | None = None,
+) -> None:
+    """
+    Write the inventory of the file ``entry`` to ``file`` (standard output by
+    default), one record per line: as JSON Lines, or as a JSON array.
+    """
+    import uproot
+
+    out = sys.stdout if file is None else file
+    with uproot.open(entry) as upfile:
+        records = iter_inventory(upfile, max_depth=max_depth, pattern=pattern)
+        if output_format == "jsonl":
+            for record in records:
+                out.write(json.dumps({"file": entry} | record) + "\n")
+            return
+
+        out.write("[")
+        separator = "\n"
+        for record in records:
+            out.write(separator + json.dumps({"file": entry} | record))
+            separator = ",\n"
+        out.write("\n]\n")
+
+
+def expand_paths(paths: Iterable[str], *, suffix: str = ".root") -> Iterator[str]:
+    """
+    The files named by ``paths``: directories are searched recursively for
+    files ending in ``suffix``, globs (``**`` included) are expanded, anything
+    else is passed through as given (so a missing file is reported as a
+    failure, and remote URLs still work). Each file is only given once.
+    """
+    seen = set()
+    for path in paths:
+        if Path(path).is_dir():
+            matches = sorted(
+                str(p) for p in Path(path).rglob(f"*{suffix}") if p.is_file()
+            )
+        elif glob.has_magic(path):
+            # Path.glob only takes relative patterns
+            matches = sorted(glob.glob(path, recursive=True))  # noqa: PTH207
+        else:
+            matches = [path]
+        for match in matches:
+            if match not in seen:
+                seen.add(match)
+                yield match
+
+
+def file_inventory(
+    path: str, *, max_depth: int | None = None, pattern: str | None = None
+) -> dict[str, Any]:
+    """
+    The inventory of one file, as a single record: ``file``, the ``seconds``
+    taken, and either its ``objects`` (see :func:`iter_inventory`) or the
+    ``error`` that stopped it. Never raises for a bad file.
+    """
+    import uproot
+
+    start = time.perf_counter()
+    try:
+        with uproot.open(path) as upfile:
+            objects = list(iter_inventory(upfile, max_depth=max_depth, pattern=pattern))
+    except Exception as err:  # noqa: BLE001
+        return {
+            "file": path,
+            "seconds": round(time.perf_counter() - start, 6),
+            "error": f"{type(err).__name__}: {' '.join(str(err).split())}",
+        }
+    return {
+        "file": path,
+        "seconds": round(time.perf_counter() - start, 6),
+        "objects": objects,
+    }
+
+
+def iter_inventories(
+    paths: Iterable[str],
+    *,
+    jobs: int | None = None,
+    max_depth: int | None = None,
+    pattern: str | None = None,
+) -> Iterator[dict[str, Any]]:
+    """
+    :func:`file_inventory` for each file, in order of completion, from a pool
+    of ``jobs`` processes (one per CPU if None). With one job, the files are
+    read in order in this process.
+    """
+    if jobs == 1:
+        for path in paths:
+            yield file_inventory(path, max_depth=max_depth, pattern=pattern)
+        return
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [
+            pool.submit(file_inventory, path, max_depth=max_depth, pattern=pattern)
+            for path in paths
+        ]
+        try:
+            for future in concurrent.futures.as_completed(futures):
+                yield future.result()
+        finally:
+            # Stopped early (e.g. a closed pipe): don't start the rest
+            for future in futures:
+                future.cancel()
+
+
+def print_inventories(  # noqa: PLR0913
+    paths: Iterable[str],
+    *,
+    output_format: Literal["json", "jsonl"],
+    file: TextIO | None = None,
+    jobs: int | None = None,
+    max_depth: int | None = None,
+    pattern: str | None = None,
+) -> int:
+    """
+    Write the inventories of many files to ``file`` (standard output by
+    default), one record per file as each finishes: as JSON Lines, or as a
+    JSON array. Returns the number of files that failed.
+    """
+    out = sys.stdout if file is None else file
+    records = iter_inventories(paths, jobs=jobs, max_depth=max_depth, pattern=pattern)
+    failures = 0
+    if output_format == "jsonl":
+        for record in records:
+            failures += "error" in record
+            out.write(json.dumps(record) + "\n")
+            out.flush()
+        return failures
+
+    out.write("[")
+    separator = "\n"
+    for record in records:
+        failures += "error" in record
+        out.write(separator + json.dumps(record))
+        out.flush()
+        separator = ",\n"
+    out.write("\n]\n")
+    return failures
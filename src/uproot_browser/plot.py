@@ -4,21 +4,39 @@ Display tools for making plots via plotext.
 
 from __future__ import annotations
 
+import dataclasses
 import functools
 import math
 import operator
-from typing import Any
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
 
-import awkward as ak
 import hist
 import numpy as np
 import plotext as plt
 import uproot
 import uproot.behaviors.TH1
+import uproot.behaviors.TH3
 import uproot.interpretation.objects
 import uproot.models.RNTuple
 
-from uproot_browser.exceptions import EmptyTreeError
+from uproot_browser.cut import Cut
+from uproot_browser.exceptions import CancelledError, EmptyTreeError
+from uproot_browser.fill import (
+    DEFAULT_STEP_SIZE,
+    Progress,
+    fill_branch,
+    fill_branches,
+    fill_pair,
+    get_sampled,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    import rich.segment
+
+    from uproot_browser.cache import DiskCache
 
 
 def clf() -> None:
@@ -39,35 +57,90 @@ def make_hist_title(item: Any, histogram: hist.Hist[Any]) -> str:
     inner_sum = float(np.sum(histogram.values()))
     full_sum = float(np.sum(histogram.values(flow=True)))
 
+    sampled = get_sampled(histogram)
+    if sampled is not None:
+        return (
+            f"{item.name} -- Entries: ~{inner_sum:.4g} (SAMPLED: "
+            f"{sampled.baskets} of {sampled.total_baskets} baskets)"
+        )
+
     if math.isclose(inner_sum, full_sum):
         return f"{item.name} -- Entries: {inner_sum:g}"
 
     return f"{item.name} -- Entries: {inner_sum:g} ({full_sum:g} with flow)"
 
 
+# Branches are filled once with this many bins and rebinned to fit the display;
+# 2520 has many divisors, so almost any width can be matched closely.
+FINE_BINS = 2520
+
+# The same for each axis of branches plotted against each other, kept small
+# since the bins are squared (360 also has many divisors).
+FINE_BINS_2D = 360
+
+
+@dataclasses.dataclass
+class BranchPair:
+    """Two branches of the same TTree, plotted against each other."""
+
+    x: uproot.TBranch
+    y: uproot.TBranch
+
+    @property
+    def name(self) -> str:
+        return f"{self.y.name} vs {self.x.name}"
+
+
+def _is_objects(tree: uproot.TBranch | uproot.models.RNTuple.RField) -> bool:
+    # RField has no `interpretation`; it is always read as an array.
+    interpretation = getattr(tree, "interpretation", None)
+    return isinstance(interpretation, uproot.interpretation.objects.AsObjects)
+
+
 @functools.singledispatch
-def plot(tree: Any, *, width: int = 100, expr: str = "") -> None:  # noqa: ARG001
+def make_histogram(  # noqa: PLR0913
+    tree: Any,
+    *,
+    step_size: int | str = DEFAULT_STEP_SIZE,  # noqa: ARG001
+    cancelled: Callable[[], bool] | None = None,  # noqa: ARG001
+    progress: Callable[[Progress], None] | None = None,  # noqa: ARG001
+    sample: float | None = None,  # noqa: ARG001
+    cut: str = "",  # noqa: ARG001
+) -> hist.Hist[Any]:
     """
-    Implement this for each type of plottable.
+    Compute the histogram behind a plot. This is the expensive stage that reads
+    the file; it does not depend on the display, so the result can be cached
+    and redrawn at any size. Long reads should check ``cancelled`` between
+    chunks and raise :class:`~uproot_browser.exceptions.CancelledError`, and
+    may report partial histograms to ``progress``. With ``sample``, a quick
+    estimate may be made from that fraction of the data. With a ``cut`` (see
+    :class:`~uproot_browser.cut.Cut`), only the entries of the TTree passing
+    it are histogrammed. Implement this for each type of plottable.
     """
     msg = f"This object ({type(tree)}) is not plottable yet"
     raise RuntimeError(msg)
 
 
 # Simpler in Python 3.11+
-@plot.register(uproot.TBranch)
-def plot_branch(
+@make_histogram.register(uproot.TBranch)
+def make_histogram_branch(  # noqa: PLR0913
     tree: uproot.TBranch | uproot.models.RNTuple.RField,
     *,
-    width: int = 100,
-    expr: str = "",
-) -> None:
+    step_size: int | str = DEFAULT_STEP_SIZE,
+    cancelled: Callable[[], bool] | None = None,
+    progress: Callable[[Progress], None] | None = None,
+    sample: float | None = None,
+    cut: str = "",
+) -> hist.Hist[Any]:
     """
-    Plot a single tree branch.
+    Histogram a single tree branch. Flat and jagged numeric data is read in
+    basket-aligned chunks of ``step_size`` into ``FINE_BINS`` bins, or only
+    from a ``sample`` fraction of the baskets, scaled up.
     """
-    # RField has no `interpretation`; it is always read as an array.
-    interpretation = getattr(tree, "interpretation", None)
-    if isinstance(interpretation, uproot.interpretation.objects.AsObjects):
+    if _is_objects(tree):
+        if cut:
+            msg = f"Cuts can't be applied to branches of objects ({tree.name})"
+            raise ValueError(msg)
         arr = tree.array(library="np")
         if len(arr) == 0:
             msg = f"Branch {tree.name} is empty."
@@ -77,36 +150,454 @@ def plot_branch(
             raise TypeError(msg)
         histograms = [h.to_hist() for h in arr]
         histogram: hist.Hist[Any] = functools.reduce(operator.add, histograms)
-    else:
-        array = tree.array()
-        values = ak.flatten(array) if array.ndim > 1 else array
-        finite = values[np.isfinite(values)]
-        if len(finite) < 1:
-            msg = f"Branch {tree.name} is empty."
-            raise EmptyTreeError(msg)
-        histogram = hist.numpy.histogram(finite, bins=width, histogram=hist.Hist)
-    if expr:
-        # pylint: disable-next=eval-used
-        histogram = eval(expr, {"h": histogram})
-    plt.bar(
-        histogram.axes[0].centers,
-        histogram.values().astype(float),
+        return histogram
+    return fill_branch(
+        tree,
+        bins=FINE_BINS,
+        step_size=step_size,
+        cancelled=cancelled,
+        progress=progress,
+        sample=sample,
+        cut=cut,
+    )
+
+
+make_histogram.register(uproot.models.RNTuple.RField)(make_histogram_branch)  # type: ignore[no-untyped-call]
+
+
+@make_histogram.register
+def make_histogram_pair(  # noqa: PLR0913
+    tree: BranchPair,
+    *,
+    step_size: int | str = DEFAULT_STEP_SIZE,
+    cancelled: Callable[[], bool] | None = None,
+    progress: Callable[[Progress], None] | None = None,
+    sample: float | None = None,
+    cut: str = "",
+) -> hist.Hist[Any]:
+    """
+    Histogram two branches against each other, reading both in the same
+    chunks into ``FINE_BINS_2D`` bins on each axis.
+    """
+    return fill_pair(
+        tree.x,
+        tree.y,
+        bins=FINE_BINS_2D,
+        step_size=step_size,
+        cancelled=cancelled,
+        progress=progress,
+        sample=sample,
+        cut=cut,
+    )
+
+
+@make_histogram.register
+def make_histogram_hist(  # noqa: PLR0913
+    tree: uproot.behaviors.TH1.Histogram,
+    *,
+    step_size: int | str = DEFAULT_STEP_SIZE,  # noqa: ARG001
+    cancelled: Callable[[], bool] | None = None,  # noqa: ARG001
+    progress: Callable[[Progress], None] | None = None,  # noqa: ARG001
+    sample: float | None = None,  # noqa: ARG001
+    cut: str = "",
+) -> hist.Hist[Any]:
+    """
+    Convert a Histogram. A 3-D one is projected on its x and y axes.
+    """
+    if cut:
+        msg = f"Cuts select entries of a TTree, they can't be applied to {tree.name}"
+        raise ValueError(msg)
+    histogram = hist.Hist(tree.to_hist())
+    if isinstance(tree, uproot.behaviors.TH3.TH3):
+        projected = histogram.project(0, 1)
+        assert isinstance(projected, hist.Hist)
+        return projected
+    return histogram
+
+
+def make_cached_histogram(  # noqa: PLR0913
+    tree: Any,
+    cache: DiskCache | None,
+    *,
+    file: Any,
+    selection: str,
+    step_size: int | str = DEFAULT_STEP_SIZE,
+    cancelled: Callable[[], bool] | None = None,
+    progress: Callable[[Progress], None] | None = None,
+    sample: float | None = None,
+    cut: str = "",
+) -> hist.Hist[Any]:
+    """
+    :func:`make_histogram`, reused from (or stored in) an on-disk cache when one
+    is given. ``file`` is the uproot ``ReadOnlyFile`` and ``selection`` the
+    object's path in it.
+    """
+    compute = functools.partial(
+        make_histogram,
+        tree,
+        step_size=step_size,
+        cancelled=cancelled,
+        progress=progress,
+        sample=sample,
+        cut=cut,
+    )
+    if cache is None:
+        return compute()
+    bins = FINE_BINS_2D if isinstance(tree, BranchPair) else FINE_BINS
+    key = _cache_key(
+        cache, file, selection, bins=bins, step_size=step_size, sample=sample, cut=cut
+    )
+    return cache.get_or_compute(key, compute)
+
+
+def _cache_key(  # noqa: PLR0913
+    cache: DiskCache,
+    file: Any,
+    selection: str,
+    *,
+    bins: int,
+    step_size: int | str,
+    sample: float | None,
+    cut: str,
+) -> str | None:
+    # Keys without a cut are the same as before cuts existed
+    extra = (cut,) if cut else ()
+    return cache.key(file, selection, bins, step_size, sample, *extra)
+
+
+def _single_passes(items: Sequence[Any]) -> tuple[list[list[int]], list[int]]:
+    """
+    Split ``items`` (by index) into groups of numeric branches that can be
+    read in one pass over their TTree (with unique names), and the rest.
+    """
+    passes: dict[str, list[list[int]]] = {}
+    alone: list[int] = []
+    for index, item in enumerate(items):
+        if not isinstance(item, uproot.TBranch) or _is_objects(item):
+            alone.append(index)
+            continue
+        groups = passes.setdefault(item.tree.object_path, [])
+        group = next(
+            (g for g in groups if all(items[i].name != item.name for i in g)), None
+        )
+        if group is None:
+            group = []
+            groups.append(group)
+        group.append(index)
+    return [group for groups in passes.values() for group in groups], alone
+
+
+def _fill_pass(  # noqa: PLR0913
+    items: Sequence[Any],
+    indices: list[int],
+    finish: Callable[[int, hist.Hist[Any] | Exception | None], None],
+    *,
+    step_size: int | str,
+    cancelled: Callable[[], bool] | None,
+    progress: Callable[[int, Progress], None] | None,
+    sample: float | None,
+    cut: str,
+) -> None:
+    """
+    Read the branches of ``items`` at ``indices`` together; a failure is
+    reported for each of them that wasn't finished yet.
+    """
+    finished: set[int] = set()
+
+    def branch_done(i: int, histogram: hist.Hist[Any] | None) -> None:
+        finished.add(indices[i])
+        finish(indices[i], histogram)
+
+    try:
+        fill_branches(
+            items[indices[0]].tree,
+            [items[i] for i in indices],
+            bins=FINE_BINS,
+            step_size=step_size,
+            cancelled=cancelled,
+            progress=None
+            if progress is None
+            else lambda i, partial: progress(indices[i], partial),
+            done=branch_done,
+            sample=sample,
+            cut=cut,
+        )
+    except CancelledError:
+        raise
+    except Exception as err:  # noqa: BLE001
+        for index in indices:
+            if index not in finished:
+                finish(index, err)
+
+
+def _fill_alone(  # noqa: PLR0913
+    item: Any,
+    finish: Callable[[hist.Hist[Any] | Exception], None],
+    *,
+    step_size: int | str,
+    cancelled: Callable[[], bool] | None,
+    progress: Callable[[Progress], None] | None,
+    sample: float | None,
+    cut: str,
+) -> None:
+    try:
+        histogram = make_histogram(
+            item,
+            step_size=step_size,
+            cancelled=cancelled,
+            progress=progress,
+            sample=sample,
+            cut=cut,
+        )
+    except CancelledError:
+        raise
+    except Exception as err:  # noqa: BLE001
+        finish(err)
+        return
+    finish(histogram)
+
+
+def make_histograms(  # noqa: PLR0913
+    items: Sequence[Any],
+    cache: DiskCache | None,
+    *,
+    file: Any,
+    selections: Sequence[str],
+    done: Callable[[int, hist.Hist[Any] | Exception], None],
+    step_size: int | str = DEFAULT_STEP_SIZE,
+    cancelled: Callable[[], bool] | None = None,
+    progress: Callable[[int, Progress], None] | None = None,
+    sample: float | None = None,
+    cut: str = "",
+) -> None:
+    """
+    :func:`make_cached_histogram` for several objects at once: the numeric
+    branches of each TTree are read together, in a single pass (see
+    :func:`~uproot_browser.fill.fill_branches`), anything else one at a time.
+    ``done`` is called with the index of each item and its histogram, or the
+    exception that stopped it, as soon as it is ready; ``progress`` with the
+    index and a :class:`~uproot_browser.fill.Progress`. Cancelling stops
+    everything with :class:`~uproot_browser.exceptions.CancelledError`. A
+    ``cut`` applies to every item; it is evaluated once per chunk of a pass.
+    """
+    keys = [
+        None
+        if cache is None
+        else _cache_key(
+            cache,
+            file,
+            selection,
+            bins=FINE_BINS,
+            step_size=step_size,
+            sample=sample,
+            cut=cut,
+        )
+        for selection in selections
+    ]
+
+    def finish(index: int, result: hist.Hist[Any] | Exception | None) -> None:
+        if result is None:
+            result = EmptyTreeError(f"Branch {items[index].name} is empty.")
+        elif not isinstance(result, Exception):
+            key = keys[index]
+            if cache is not None and key is not None:
+                cache.put(key, result)
+        done(index, result)
+
+    todo = []
+    for index, key in enumerate(keys):
+        histogram = None if cache is None or key is None else cache.get(key)
+        if histogram is None:
+            todo.append(index)
+        else:
+            done(index, histogram)
+
+    passes, alone = _single_passes([items[i] for i in todo])
+    for group in passes:
+        _fill_pass(
+            items,
+            [todo[i] for i in group],
+            finish,
+            step_size=step_size,
+            cancelled=cancelled,
+            progress=progress,
+            sample=sample,
+            cut=cut,
+        )
+
+    for index in (todo[i] for i in alone):
+        _fill_alone(
+            items[index],
+            functools.partial(finish, index),
+            step_size=step_size,
+            cancelled=cancelled,
+            progress=None if progress is None else functools.partial(progress, index),
+            sample=sample,
+            cut=cut,
+        )
+
+
+def _rebin_factor(axis: Any, width: int) -> int:
+    """How many neighbouring bins of ``axis`` to merge for :func:`rebin`."""
+    bins = len(axis)
+    if not isinstance(axis, hist.axis.Regular) or bins <= width:
+        return 1
+    factor = next(f for f in range(math.ceil(bins / width), bins + 1) if bins % f == 0)
+    if 2 * (bins // factor) < width:
+        return 1
+    return factor
+
+
+def rebin(
+    histogram: hist.Hist[Any], width: int, height: int | None = None
+) -> hist.Hist[Any]:
+    """
+    Merge neighbouring bins of a regular axis so that at most ``width`` bins
+    remain (and at most ``height`` on the second axis, if given). An axis is
+    left alone if no whole-bin merge keeps at least half of its size.
+    """
+    sizes = [width] if height is None else [width, height]
+    factors = [
+        _rebin_factor(axis, size)
+        for axis, size in zip(histogram.axes, sizes, strict=False)
+    ]
+    if all(factor == 1 for factor in factors):
+        return histogram
+    rebinned = histogram[
+        tuple(
+            slice(None) if factor == 1 else slice(None, None, hist.rebin(factor))
+            for factor in factors
+        )
+    ]
+    assert isinstance(rebinned, hist.Hist)
+    return rebinned
+
+
+def evaluate(histogram: hist.Hist[Any], expr: str) -> Any:
+    """
+    The plot expression ``expr``, in terms of the histogram ``h`` (like
+    ``h[::2j]``), or the histogram itself if there is none.
+    """
+    if not expr:
+        return histogram
+    # pylint: disable-next=eval-used
+    return eval(expr, {"h": histogram})
+
+
+def shown_histogram(
+    item: Any,
+    histogram: hist.Hist[Any],
+    *,
+    width: int = 100,
+    height: int | None = None,
+    expr: str = "",
+) -> Any:
+    """
+    The histogram of ``item`` as :func:`plot` draws it: histograms filled from
+    branches are rebinned to ``width`` (and ``height``, for a 2-D one), then
+    ``expr`` is applied.
+    """
+    if not isinstance(item, uproot.behaviors.TH1.Histogram):
+        histogram = rebin(histogram, width, height if histogram.ndim > 1 else None)
+    return evaluate(histogram, expr)
+
+
+def heatmap(
+    item: Any,
+    histogram: hist.Hist[Any],
+    *,
+    width: int,
+    height: int,
+    theme: str = "default",
+) -> rich.segment.Segments:
+    """
+    Draw a 2-D histogram as a heatmap of ``width`` by ``height`` cells, with
+    the axis labels of the histogram.
+    """
+    import uproot_browser.plot_rich
+
+    xaxis, yaxis = histogram.axes
+    return uproot_browser.plot_rich.render_heatmap(
+        histogram.values(),
+        xaxis.edges,
+        yaxis.edges,
+        width=width,
+        height=height,
+        title=make_hist_title(item, histogram),
+        xlabel=xaxis.label,
+        ylabel=yaxis.label,
+        theme=theme,
     )
+
+
+def draw(item: Any, histogram: hist.Hist[Any], *, expr: str = "") -> None:
+    """
+    Draw a 1-D histogram with plotext. This is the cheap stage that is redone
+    whenever the display changes. It draws on plotext's global figure, since
+    plotext has no public per-figure API; callers in threads must serialize.
+    """
+    histogram = evaluate(histogram, expr)
+    if histogram.ndim != 1:
+        msg = f"plotext only draws 1-D histograms, use heatmap for {histogram.ndim}-D"
+        raise TypeError(msg)
+    plt.bar(histogram.axes[0].centers, histogram.values().astype(float))
     plt.ylim(lower=0)
     plt.xticks(np.linspace(histogram.axes[0].edges[0], histogram.axes[0].edges[-1], 5))
     plt.xlabel(histogram.axes[0].name)
-    plt.title(make_hist_title(tree, histogram))
+    plt.title(make_hist_title(item, histogram))
+
+
+@functools.singledispatch
+def plot(
+    tree: Any,
+    *,
+    width: int = 100,  # noqa: ARG001
+    expr: str = "",  # noqa: ARG001
+    step_size: int | str = DEFAULT_STEP_SIZE,  # noqa: ARG001
+    histogram: hist.Hist[Any] | None = None,  # noqa: ARG001
+) -> None:
+    """
+    Implement this for each type of plottable. Pass a ``histogram`` already
+    computed by :func:`make_histogram` to skip reading the file.
+    """
+    msg = f"This object ({type(tree)}) is not plottable yet"
+    raise RuntimeError(msg)
+
+
+# Simpler in Python 3.11+
+@plot.register(uproot.TBranch)
+def plot_branch(
+    tree: uproot.TBranch | uproot.models.RNTuple.RField,
+    *,
+    width: int = 100,
+    expr: str = "",
+    step_size: int | str = DEFAULT_STEP_SIZE,
+    histogram: hist.Hist[Any] | None = None,
+) -> None:
+    """
+    Plot a single tree branch.
+    """
+    if histogram is None:
+        histogram = make_histogram(tree, step_size=step_size)
+    draw(tree, rebin(histogram, width), expr=expr)
 
 
 plot.register(uproot.models.RNTuple.RField)(plot_branch)  # type: ignore[no-untyped-call]
 
 
 @functools.singledispatch
-def dump(tree: Any, *, width: int = 100) -> str:  # noqa: ARG001
+def dump(
+    tree: Any,
+    *,
+    width: int = 100,  # noqa: ARG001
+    histogram: hist.Hist[Any] | None = None,  # noqa: ARG001
+    cut: str = "",  # noqa: ARG001
+) -> str:
     """
     Return standalone Python source that rebuilds the plotted histogram as ``h``
-    from an object bound to ``item``. Mirrors :func:`plot` for the "Dump & Quit"
-    output. Implement this for each type of plottable.
+    from an object bound to ``item``, with the ``cut`` it was filled with.
+    Mirrors :func:`plot` for the "Dump & Quit" output. Implement this for each
+    type of plottable.
     """
     msg = f"This object ({type(tree)}) is not plottable yet"
     raise RuntimeError(msg)
@@ -118,42 +609,122 @@ def dump_branch(
     tree: uproot.TBranch | uproot.models.RNTuple.RField,
     *,
     width: int = 100,
+    histogram: hist.Hist[Any] | None = None,
+    cut: str = "",
 ) -> str:
     """
-    Source for rebuilding a single tree branch as a histogram.
+    Source for rebuilding a single tree branch as a histogram. The binning is
+    taken from the plotted ``histogram``, since the range is data-driven, and
+    values on the upper edge go in the last bin, as they were filled. Without
+    one, the script finds the range itself, so that dumping never reads.
     """
-    # RField has no `interpretation`; it is always read as an array.
-    interpretation = getattr(tree, "interpretation", None)
-    if isinstance(interpretation, uproot.interpretation.objects.AsObjects):
+    if _is_objects(tree):
         return (
             "import functools\n"
             "import operator\n"
             'arr = item.array(library="np")\n'
             "h = functools.reduce(operator.add, [x.to_hist() for x in arr])"
         )
+    if cut:
+        read = (
+            f"{Cut.parse(cut).dump('item.tree')}\n"
+            "array, keep = ak.broadcast_arrays(item.array(), mask)\n"
+            "values = np.asarray(ak.ravel(array[ak.values_astype(keep, bool)]))\n"
+        )
+    else:
+        read = (
+            "array = item.array()\n"
+            "values = ak.flatten(array) if array.ndim > 1 else array\n"
+        )
+    if histogram is None:
+        fill = f"h = hist.numpy.histogram(finite, bins={width}, histogram=hist.Hist)"
+    else:
+        axis = rebin(histogram, width).axes[0]
+        fill = (
+            f"top = finite == {float(axis.edges[-1])!r}\n"
+            f"h = hist.Hist.new.Reg({len(axis)}, {float(axis.edges[0])!r}, {float(axis.edges[-1])!r}).Int64()\n"
+            "h.fill(finite[~top])\n"
+            "h[-1] += np.count_nonzero(top)"
+        )
     return (
         "import awkward as ak\n"
         "import hist\n"
         "import numpy as np\n"
-        "array = item.array()\n"
-        "values = ak.flatten(array) if array.ndim > 1 else array\n"
+        f"{read}"
         "finite = values[np.isfinite(values)]\n"
-        f"h = hist.numpy.histogram(finite, bins={width}, histogram=hist.Hist)"
+        f"{fill}"
     )
 
 
 dump.register(uproot.models.RNTuple.RField)(dump_branch)  # type: ignore[no-untyped-call]
 
 
+@dump.register
+def dump_pair(
+    tree: BranchPair,
+    *,
+    width: int = 100,  # noqa: ARG001
+    histogram: hist.Hist[Any] | None = None,
+    cut: str = "",
+) -> str:
+    """
+    Source for rebuilding two branches plotted against each other, from
+    ``item`` bound to the pair ``(x_branch, y_branch)``. The binning is taken
+    from the filled ``histogram``, and values on the upper edges go in the last
+    bins, as they were filled. Without one, the script finds the ranges itself.
+    """
+    if cut:
+        read = (
+            f"{Cut.parse(cut).dump('item[0].tree')}\n"
+            "x, y, keep = ak.broadcast_arrays(item[0].array(), item[1].array(), mask)\n"
+            "keep = ak.values_astype(keep, bool)\n"
+            "x, y = np.asarray(ak.ravel(x[keep])), np.asarray(ak.ravel(y[keep]))\n"
+        )
+    else:
+        read = (
+            "x, y = ak.broadcast_arrays(item[0].array(), item[1].array())\n"
+            "x, y = np.asarray(ak.ravel(x)), np.asarray(ak.ravel(y))\n"
+        )
+    if histogram is None:
+        fill = (
+            f"h = hist.numpy.histogram2d(x[finite], y[finite], bins={FINE_BINS_2D}, histogram=hist.Hist)\n"
+            f"h.axes.label = ({tree.x.name!r}, {tree.y.name!r})"
+        )
+    else:
+        xaxis, yaxis = histogram.axes
+        fill = (
+            f"x = np.where(x == {float(xaxis.edges[-1])!r}, {float(xaxis.centers[-1])!r}, x)\n"
+            f"y = np.where(y == {float(yaxis.edges[-1])!r}, {float(yaxis.centers[-1])!r}, y)\n"
+            "h = (\n"
+            f"    hist.Hist.new.Reg({len(xaxis)}, {float(xaxis.edges[0])!r}, {float(xaxis.edges[-1])!r}, label={tree.x.name!r})\n"
+            f"    .Reg({len(yaxis)}, {float(yaxis.edges[0])!r}, {float(yaxis.edges[-1])!r}, label={tree.y.name!r})\n"
+            "    .Int64()\n"
+            ")\n"
+            "h.fill(x[finite], y[finite])"
+        )
+    return (
+        "import awkward as ak\n"
+        "import hist\n"
+        "import numpy as np\n"
+        f"{read}"
+        "finite = np.isfinite(x) & np.isfinite(y)\n"
+        f"{fill}"
+    )
+
+
 @dump.register
 def dump_hist(
-    tree: uproot.behaviors.TH1.Histogram,  # noqa: ARG001
+    tree: uproot.behaviors.TH1.Histogram,
     *,
     width: int = 100,  # noqa: ARG001
+    histogram: hist.Hist[Any] | None = None,  # noqa: ARG001
+    cut: str = "",  # noqa: ARG001
 ) -> str:
     """
-    Source for rebuilding a 1-D histogram.
+    Source for rebuilding a histogram (a 3-D one as its x-y projection).
     """
+    if isinstance(tree, uproot.behaviors.TH3.TH3):
+        return "import hist\nh = hist.Hist(item.to_hist()).project(0, 1)"
     return "import hist\nh = hist.Hist(item.to_hist())"
 
 
@@ -163,16 +734,12 @@ def plot_hist(
     *,
     width: int = 100,  # noqa: ARG001
     expr: str = "",
+    step_size: int | str = DEFAULT_STEP_SIZE,
+    histogram: hist.Hist[Any] | None = None,
 ) -> None:
     """
     Plot a 1-D Histogram.
     """
-    histogram = hist.Hist(tree.to_hist())
-    if expr:
-        # pylint: disable-next=eval-used
-        histogram = eval(expr, {"h": histogram})
-    plt.bar(histogram.axes[0].centers, histogram.values().astype(float))
-    plt.ylim(lower=0)
-    plt.xticks(np.linspace(histogram.axes[0].edges[0], histogram.axes[0].edges[-1], 5))
-    plt.xlabel(histogram.axes[0].name)
-    plt.title(make_hist_title(tree, histogram))
+    if histogram is None:
+        histogram = make_histogram(tree, step_size=step_size)
+    draw(tree, histogram, expr=expr)
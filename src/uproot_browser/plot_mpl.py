@@ -7,17 +7,22 @@ from __future__ import annotations
 import functools
 from typing import Any
 
-import awkward as ak
 import hist
 import matplotlib.pyplot as plt
 import uproot
 import uproot.behaviors.TH1
 
 import uproot_browser.plot
+from uproot_browser.fill import DEFAULT_STEP_SIZE
 
 
 @functools.singledispatch
-def plot(tree: Any) -> None:  # noqa: ARG001
+def plot(
+    tree: Any,  # noqa: ARG001
+    *,
+    step_size: int | str = DEFAULT_STEP_SIZE,  # noqa: ARG001
+    histogram: hist.Hist[Any] | None = None,  # noqa: ARG001
+) -> None:
     """
     Implement this for each type of plottable.
     """
@@ -26,23 +31,50 @@ def plot(tree: Any) -> None:  # noqa: ARG001
 
 
 @plot.register
-def plot_branch(tree: uproot.TBranch) -> None:
+def plot_branch(
+    tree: uproot.TBranch,
+    *,
+    step_size: int | str = DEFAULT_STEP_SIZE,
+    histogram: hist.Hist[Any] | None = None,
+) -> None:
     """
     Plot a single tree branch.
     """
-    array = tree.array()
-    histogram: hist.Hist[Any] = hist.numpy.histogram(
-        ak.flatten(array) if array.ndim > 1 else array, bins=50, histogram=hist.Hist
-    )
+    if histogram is None:
+        histogram = uproot_browser.plot.make_histogram(tree, step_size=step_size)
+    histogram = uproot_browser.plot.rebin(histogram, 50)
     histogram.plot()
     plt.title(uproot_browser.plot.make_hist_title(tree, histogram))
 
 
 @plot.register
-def plot_hist(tree: uproot.behaviors.TH1.Histogram) -> None:
+def plot_pair(
+    tree: uproot_browser.plot.BranchPair,
+    *,
+    step_size: int | str = DEFAULT_STEP_SIZE,
+    histogram: hist.Hist[Any] | None = None,
+) -> None:
+    """
+    Plot two branches against each other.
+    """
+    if histogram is None:
+        histogram = uproot_browser.plot.make_histogram(tree, step_size=step_size)
+    histogram = uproot_browser.plot.rebin(histogram, 90, 90)
+    histogram.plot()
+    plt.title(uproot_browser.plot.make_hist_title(tree, histogram))
+
+
+@plot.register
+def plot_hist(
+    tree: uproot.behaviors.TH1.Histogram,
+    *,
+    step_size: int | str = DEFAULT_STEP_SIZE,  # noqa: ARG001
+    histogram: hist.Hist[Any] | None = None,
+) -> None:
     """
     Plot a 1-D Histogram.
     """
-    histogram = hist.Hist(tree.to_hist())
+    if histogram is None:
+        histogram = hist.Hist(tree.to_hist())
     histogram.plot()
     plt.title(uproot_browser.plot.make_hist_title(tree, histogram))
@@ -0,0 +1,429 @@
+"""
+Text plots of histograms drawn with NumPy straight into rich segments: 1-D
+histograms in braille or block characters, 2-D ones as heatmaps of coloured
+half blocks. Unlike plotext there is no global state and no
+ANSI string to parse back, so plots can be drawn in any thread, at any size.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import itertools
+from typing import TYPE_CHECKING, Literal
+
+import numpy as np
+import rich.segment
+from rich.cells import cell_len
+from rich.style import Style
+
+if TYPE_CHECKING:
+    import numpy.typing as npt
+
+__all__ = (
+    "THEMES",
+    "Theme",
+    "column_values",
+    "heatmap_lines",
+    "histogram_lines",
+    "render_heatmap",
+    "render_histogram",
+)
+
+
+def __dir__() -> tuple[str, ...]:
+    return __all__
+
+
+@dataclasses.dataclass(frozen=True)
+class Theme:
+    """Styles of the parts of a plot."""
+
+    text: Style
+    bars: Style
+    title: Style
+
+    @property
+    def background(self) -> str | None:
+        return self.text.bgcolor.name if self.text.bgcolor else None
+
+
+def _theme(background: str, text: str, bars: str) -> Theme:
+    return Theme(
+        text=Style(color=text, bgcolor=background),
+        bars=Style(color=bars, bgcolor=background),
+        title=Style(color=text, bgcolor=background, bold=True),
+    )
+
+
+# The plotext themes used before, with the browser's background colours
+THEMES = {
+    "default": _theme("#f5f5f5", "black", "blue"),
+    "dark": _theme("#1e1e1e", "#ffa62b", "bright_blue"),
+}
+
+# Braille dot bits, by row (top to bottom) and column within a character
+_BRAILLE_DOTS = np.array(
+    [[0x01, 0x08], [0x02, 0x10], [0x04, 0x20], [0x40, 0x80]], dtype=np.uint32
+)
+_BLOCKS = np.array([ord(c) for c in " ▁▂▃▄▅▆▇█"], dtype=np.uint32)
+
+# Heatmap colours, from the lowest to the highest bins (viridis)
+PALETTE = (
+    "#440154",
+    "#46327e",
+    "#365c8d",
+    "#277f8e",
+    "#1fa187",
+    "#4ac16d",
+    "#a0da39",
+    "#fde725",
+)
+
+
+def _clean(values: npt.ArrayLike) -> npt.NDArray[np.float64]:
+    """Bin values as drawn: negative and non-finite ones are zero."""
+    array = np.asarray(values, dtype=np.float64)
+    clean: npt.NDArray[np.float64] = np.maximum(
+        np.nan_to_num(array, nan=0, posinf=0, neginf=0), 0
+    )
+    return clean
+
+
+def column_values(
+    values: npt.ArrayLike, edges: npt.ArrayLike, columns: int
+) -> npt.NDArray[np.float64]:
+    """
+    The height of each of ``columns`` equal columns spanning the ``edges``:
+    the bin under the middle of the column, or the highest bin starting in
+    it, so narrow peaks are never lost when there are more bins than columns.
+    For values with several dimensions, the last axis is the one resampled.
+    """
+    values = _clean(values)
+    edges = np.asarray(edges, dtype=np.float64)
+    nbins = values.shape[-1]
+    if nbins == 0:
+        return np.zeros((*values.shape[:-1], columns))
+    low, high = edges[0], edges[-1]
+    span = (high - low) or 1.0
+
+    middles = low + (np.arange(columns) + 0.5) * span / columns
+    bins = np.searchsorted(edges, middles, side="right") - 1
+    heights: npt.NDArray[np.float64] = values[..., np.clip(bins, 0, nbins - 1)]
+
+    starts = np.clip(
+        ((edges[:-1] - low) / span * columns).astype(np.intp), 0, columns - 1
+    )
+    cols, first = np.unique(starts, return_index=True)
+    heights[..., cols] = np.maximum(
+        heights[..., cols], np.maximum.reduceat(values, first, axis=-1)
+    )
+    return heights
+
+
+def _as_strings(codes: npt.NDArray[np.uint32]) -> list[str]:
+    """Rows of code points as strings, without a Python loop over characters."""
+    rows, width = codes.shape
+    strings: list[str] = (
+        np.ascontiguousarray(codes).view(f"U{width}").reshape(rows).tolist()
+    )
+    return strings
+
+
+def _bars(
+    heights: npt.NDArray[np.float64],
+    top: float,
+    rows: int,
+    mode: Literal["braille", "block"],
+) -> list[str]:
+    """The plot area, as ``rows`` strings, for columns of ``heights``."""
+    if mode == "block":
+        # One column and eight levels per character
+        eighths = np.rint(heights / top * 8 * rows).astype(np.int64)
+        above = 8 * np.arange(rows - 1, -1, -1)[:, np.newaxis]
+        return _as_strings(_BLOCKS[np.clip(eighths - above, 0, 8)])
+
+    # Two columns and four dots per character
+    dots = np.rint(heights / top * 4 * rows).astype(np.int64)
+    filled = np.arange(4 * rows, 0, -1)[:, np.newaxis] <= dots
+    cells = filled.reshape(rows, 4, -1, 2).transpose(0, 2, 1, 3)
+    codes = np.einsum("rcij,ij->rc", cells.astype(np.uint32), _BRAILLE_DOTS)
+    return _as_strings(np.where(codes == 0, ord(" "), 0x2800 + codes).astype(np.uint32))
+
+
+def _fmt(value: float) -> str:
+    return f"{value:.4g}"
+
+
+def _place(labels: list[tuple[int, str]], width: int) -> str:
+    """Labels centred on columns of a line, dropping any that would overlap."""
+    line = [" "] * width
+    free = 0
+    for column, label in labels:
+        start = min(max(column - len(label) // 2, 0), width - len(label))
+        if start < free or start < 0:
+            continue
+        line[start : start + len(label)] = label
+        free = start + len(label) + 1
+    return "".join(line)
+
+
+def _fit(text: str, width: int) -> str:
+    """``text`` centred in ``width`` cells, cut short with … if too long."""
+    if cell_len(text) > width:
+        text = text[: max(width - 1, 0)] + "…"
+    return text.center(width)[:width]
+
+
+def histogram_lines(  # noqa: PLR0913
+    values: npt.ArrayLike,
+    edges: npt.ArrayLike,
+    *,
+    width: int,
+    height: int,
+    title: str = "",
+    xlabel: str = "",
+    theme: str = "default",
+    mode: Literal["braille", "block"] = "braille",
+) -> list[list[rich.segment.Segment]]:
+    """
+    A bar plot of a histogram (bin ``values`` and the ``edges`` around them),
+    exactly ``width`` cells by ``height`` lines, as segments for each line:
+    the title, the bars with a y axis on the left, then an x axis with ticks
+    and the ``xlabel``. Negative and non-finite values are drawn as zero.
+    """
+    styles = THEMES.get(theme, THEMES["default"])
+    edges = np.asarray(edges, dtype=np.float64)
+    header = [title] if title else []
+    footer_rows = 2 + bool(xlabel)
+    rows = max(height - len(header) - footer_rows, 1)
+
+    # The y axis, with up to five ticks from zero up to the highest bin
+    values = _clean(values)
+    top = float(values.max(initial=0)) or 1.0
+    num_yticks = min(5, max(rows // 3 + 1, 2))
+    yticks = np.linspace(0, top, num_yticks)
+    ylabels = [_fmt(tick) for tick in yticks]
+    margin = max(len(label) for label in ylabels)
+    ylabel_rows = {
+        rows - 1 - round(tick / top * (rows - 1)): label
+        for tick, label in zip(yticks, ylabels, strict=True)
+    }
+
+    columns = max(width - margin - 2, 1)
+    per_char = 2 if mode == "braille" else 1
+    heights = column_values(values, edges, columns * per_char)
+    bars = _bars(heights, top, rows, mode)
+
+    # The x axis, with up to five ticks
+    axis, xticks = _xaxis(edges, margin, columns, width)
+
+    pad = width - margin - 1 - columns
+    lines = [[rich.segment.Segment(_fit(text, width), styles.title)] for text in header]
+    for row, bar_row in enumerate(bars):
+        label = ylabel_rows.get(row)
+        left = f"{label:>{margin}}┤" if label is not None else f"{'':>{margin}}│"
+        lines.append(
+            [
+                rich.segment.Segment(left, styles.text),
+                rich.segment.Segment(bar_row, styles.bars),
+                rich.segment.Segment(" " * pad, styles.text),
+            ]
+        )
+    lines.append([rich.segment.Segment(axis, styles.text)])
+    lines.append([rich.segment.Segment(xticks, styles.text)])
+    if xlabel:
+        lines.append([rich.segment.Segment(_fit(xlabel, width), styles.text)])
+    return lines[: max(height, 1)]
+
+
+def _xaxis(
+    edges: npt.NDArray[np.float64], margin: int, columns: int, width: int
+) -> tuple[str, str]:
+    """The x axis under ``columns`` cells after a ``margin``, and its labels."""
+    num_xticks = min(5, max(columns // 12 + 1, 2))
+    xtick_columns = np.rint(np.linspace(0, columns - 1, num_xticks)).astype(np.intp)
+    axis = np.full(columns, "─")
+    axis[xtick_columns] = "┬"
+    xlabels = [
+        (margin + 1 + int(column), _fmt(tick))
+        for column, tick in zip(
+            xtick_columns, np.linspace(edges[0], edges[-1], num_xticks), strict=True
+        )
+    ]
+    pad = width - margin - 1 - columns
+    return " " * margin + "└" + "".join(axis) + " " * pad, _place(xlabels, width)
+
+
+def _levels(cells: npt.NDArray[np.float64], top: float) -> npt.NDArray[np.int64]:
+    """The colour of each cell: -1 if empty, else an index into the palette."""
+    levels = np.ceil(cells / top * len(PALETTE)).astype(np.int64) - 1
+    return np.where(cells > 0, np.clip(levels, 0, len(PALETTE) - 1), -1)
+
+
+def _heatmap_row(
+    upper: npt.NDArray[np.int64], lower: npt.NDArray[np.int64], styles: Theme
+) -> list[rich.segment.Segment]:
+    """
+    A line of half blocks showing two rows of colour levels, with a segment
+    for each run of cells of the same colours.
+    """
+    background = styles.background
+    colours = [*PALETTE, background]  # level -1 is the background
+    pairs = (upper + 1) * (len(PALETTE) + 1) + lower + 1
+    starts = [0, *(np.flatnonzero(np.diff(pairs)) + 1).tolist(), len(pairs)]
+    segments = []
+    for start, stop in itertools.pairwise(starts):
+        top, bottom = int(upper[start]), int(lower[start])
+        if top < 0 and bottom < 0:
+            segments.append(rich.segment.Segment(" " * (stop - start), styles.text))
+            continue
+        style = Style(color=colours[top], bgcolor=colours[bottom])
+        segments.append(rich.segment.Segment("▀" * (stop - start), style))
+    return segments
+
+
+def _legend(
+    top: float, text: str, width: int, styles: Theme
+) -> list[rich.segment.Segment]:
+    """``text`` then the colour scale from zero to ``top``, in ``width`` cells."""
+    scale = f" 0 {'█' * len(PALETTE)} {_fmt(top)}"
+    text = _fit(text, max(width - cell_len(scale), 0)).rstrip()
+    pad = max(width - cell_len(text) - cell_len(scale), 0)
+    segments = [rich.segment.Segment(text + " " * pad + " 0 ", styles.text)]
+    segments.extend(
+        rich.segment.Segment("█", Style(color=colour, bgcolor=styles.background))
+        for colour in PALETTE
+    )
+    segments.append(rich.segment.Segment(f" {_fmt(top)}", styles.text))
+    # Too narrow for the whole scale: keep what fits
+    return list(rich.segment.Segment.adjust_line_length(segments, width, styles.text))
+
+
+def heatmap_lines(  # noqa: PLR0913
+    values: npt.ArrayLike,
+    xedges: npt.ArrayLike,
+    yedges: npt.ArrayLike,
+    *,
+    width: int,
+    height: int,
+    title: str = "",
+    xlabel: str = "",
+    ylabel: str = "",
+    theme: str = "default",
+) -> list[list[rich.segment.Segment]]:
+    """
+    A heatmap of a 2-D histogram (bin ``values`` indexed by x then y, and the
+    edges of both axes), exactly ``width`` cells by ``height`` lines, as
+    segments for each line: the title, the map with a y axis on the left, an
+    x axis with ticks, then the axis labels and the colour scale. Each
+    character is two cells high, drawn as a half block; empty bins are left
+    blank, and bins are resampled like :func:`column_values`, so that small
+    peaks stay visible.
+    """
+    styles = THEMES.get(theme, THEMES["default"])
+    xedges = np.asarray(xedges, dtype=np.float64)
+    yedges = np.asarray(yedges, dtype=np.float64)
+    values = _clean(values).reshape(len(xedges) - 1, len(yedges) - 1)
+    header = [title] if title else []
+    rows = max(height - len(header) - 3, 1)
+
+    # The y axis, with up to five ticks, the highest values at the top
+    num_yticks = min(5, max(rows // 3 + 1, 2))
+    yticks = np.linspace(yedges[0], yedges[-1], num_yticks)
+    ylabels = [_fmt(tick) for tick in yticks]
+    margin = max(len(label) for label in ylabels)
+    ylabel_rows = {
+        rows - 1 - round(i / (num_yticks - 1) * (rows - 1)): label
+        for i, label in enumerate(ylabels)
+    }
+
+    columns = max(width - margin - 2, 1)
+    cells = column_values(column_values(values, yedges, 2 * rows).T, xedges, columns)
+    top = float(cells.max(initial=0)) or 1.0
+    levels = _levels(cells[::-1], top)
+
+    axis, xticks = _xaxis(xedges, margin, columns, width)
+    pad = width - margin - 1 - columns
+    lines = [[rich.segment.Segment(_fit(text, width), styles.title)] for text in header]
+    for row in range(rows):
+        label = ylabel_rows.get(row)
+        left = f"{label:>{margin}}┤" if label is not None else f"{'':>{margin}}│"
+        lines.append(
+            [
+                rich.segment.Segment(left, styles.text),
+                *_heatmap_row(levels[2 * row], levels[2 * row + 1], styles),
+                rich.segment.Segment(" " * pad, styles.text),
+            ]
+        )
+    lines.append([rich.segment.Segment(axis, styles.text)])
+    lines.append([rich.segment.Segment(xticks, styles.text)])
+    labels = f"x: {xlabel}  y: {ylabel}" if xlabel or ylabel else ""
+    lines.append(_legend(top, labels, width, styles))
+    return lines[: max(height, 1)]
+
+
+def _segments(lines: list[list[rich.segment.Segment]]) -> rich.segment.Segments:
+    segments = []
+    for line in lines:
+        segments.extend(line)
+        segments.append(rich.segment.Segment.line())
+    return rich.segment.Segments(segments)
+
+
+def render_histogram(  # noqa: PLR0913
+    values: npt.ArrayLike,
+    edges: npt.ArrayLike,
+    *,
+    width: int,
+    height: int,
+    title: str = "",
+    xlabel: str = "",
+    theme: str = "default",
+    mode: Literal["braille", "block"] = "braille",
+) -> rich.segment.Segments:
+    """
+    :func:`histogram_lines` as a renderable, ready to be printed or shown in
+    a widget.
+    """
+    lines = histogram_lines(
+        values,
+        edges,
+        width=width,
+        height=height,
+        title=title,
+        xlabel=xlabel,
+        theme=theme,
+        mode=mode,
+    )
+    return _segments(lines)
+
+
+def render_heatmap(  # noqa: PLR0913
+    values: npt.ArrayLike,
+    xedges: npt.ArrayLike,
+    yedges: npt.ArrayLike,
+    *,
+    width: int,
+    height: int,
+    title: str = "",
+    xlabel: str = "",
+    ylabel: str = "",
+    theme: str = "default",
+) -> rich.segment.Segments:
+    """
+    :func:`heatmap_lines` as a renderable, ready to be printed or shown in a
+    widget.
+    """
+    return _segments(
+        heatmap_lines(
+            values,
+            xedges,
+            yedges,
+            width=width,
+            height=height,
+            title=title,
+            xlabel=xlabel,
+            ylabel=ylabel,
+            theme=theme,
+        )
+    )
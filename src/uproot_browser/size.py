@@ -0,0 +1,174 @@
+"""
+Storage footprint of directories, trees and branches, like ``du``: sizes and
+basket counts come from the TBranch and TKey headers, so nothing is
+decompressed.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import rich.box
+import rich.console
+import rich.filesize
+import rich.table
+import rich.text
+
+from uproot_browser.structure import make_record
+from uproot_browser.tree import UprootEntry, split_spec
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+__all__ = (
+    "Size",
+    "measure",
+    "print_sizes",
+    "size_table",
+)
+
+
+def __dir__() -> tuple[str, ...]:
+    return __all__
+
+
+@dataclasses.dataclass
+class Size:
+    """
+    Storage of one object, including everything inside it. ``children`` are
+    sorted with the heaviest (compressed) first.
+    """
+
+    name: str
+    classname: str
+    compressed_bytes: int = 0
+    uncompressed_bytes: int = 0
+    num_baskets: int = 0
+    children: list[Size] = dataclasses.field(default_factory=list)
+
+    @property
+    def ratio(self) -> float | None:
+        """Compression ratio (uncompressed / compressed), None if empty."""
+        if not self.compressed_bytes:
+            return None
+        return self.uncompressed_bytes / self.compressed_bytes
+
+    def add(self, child: Size) -> None:
+        self.children.append(child)
+        self.compressed_bytes += child.compressed_bytes
+        self.uncompressed_bytes += child.uncompressed_bytes
+        self.num_baskets += child.num_baskets
+
+
+def measure(entry: UprootEntry, name: str | None = None) -> Size | None:
+    """
+    The storage of ``entry`` and everything inside it, or None if none of it
+    is known from the headers (RNTuple fields, for example).
+    """
+    record = make_record(entry, read=False, label=False)
+    size = Size(name or entry.path.rsplit("/", 1)[-1], record.classname)
+    # Branches have baskets of their own, even with sub-branches; trees and
+    # directories are only the sum of their contents.
+    known = (record.num_baskets is not None or not record.is_dir) and (
+        record.compressed_bytes is not None
+    )
+    if known:
+        size.compressed_bytes = record.compressed_bytes or 0
+        size.uncompressed_bytes = record.uncompressed_bytes or 0
+        size.num_baskets = record.num_baskets or 0
+
+    for child in entry.children:
+        child_size = measure(child)
+        if child_size is not None:
+            size.add(child_size)
+    size.children.sort(key=lambda child: child.compressed_bytes, reverse=True)
+
+    return size if known or size.children else None
+
+
+def _rows(
+    size: Size, depth: int, *, max_depth: int | None, top: int | None
+) -> Iterator[tuple[int, Size | None, Size]]:
+    """
+    ``(depth, size, parent)`` for each row under ``size``; a None size stands
+    for the children cut off by ``top``.
+    """
+    if max_depth is not None and depth > max_depth:
+        return
+    shown = size.children if top is None else size.children[:top]
+    for child in shown:
+        yield depth, child, size
+        yield from _rows(child, depth + 1, max_depth=max_depth, top=top)
+    if len(shown) < len(size.children):
+        yield depth, None, size
+
+
+def size_table(
+    size: Size, *, max_depth: int | None = None, top: int | None = None
+) -> rich.table.Table:
+    """
+    A table of the storage of ``size`` and its contents (down to ``max_depth``
+    levels, and at most ``top`` per container), heaviest first, with each
+    share of the total compressed size.
+    """
+    table = rich.table.Table(box=rich.box.SIMPLE_HEAD, pad_edge=False)
+    table.add_column("Name", no_wrap=True, overflow="ellipsis")
+    table.add_column("Compressed", justify="right")
+    table.add_column("Uncompressed", justify="right")
+    table.add_column("Ratio", justify="right")
+    table.add_column("Baskets", justify="right")
+    table.add_column("Share", justify="right")
+
+    def add_row(depth: int, name: rich.text.Text, row: Size) -> None:
+        share = (
+            row.compressed_bytes / size.compressed_bytes if size.compressed_bytes else 0
+        )
+        table.add_row(
+            rich.text.Text("  " * depth).append_text(name),
+            rich.filesize.decimal(row.compressed_bytes),
+            rich.filesize.decimal(row.uncompressed_bytes),
+            "" if row.ratio is None else f"{row.ratio:.2f}",
+            f"{row.num_baskets:,}",
+            f"{share:.1%}",
+        )
+
+    add_row(0, rich.text.Text(size.name, style="bold"), size)
+    for depth, row, parent in _rows(size, 1, max_depth=max_depth, top=top):
+        if row is not None:
+            style = "bold" if row.children else ""
+            add_row(depth, rich.text.Text(row.name, style=style), row)
+            continue
+        assert top is not None
+        rest = Size(f"… {len(parent.children) - top} more", "")
+        for child in parent.children[top:]:
+            rest.add(child)
+        add_row(depth, rich.text.Text(rest.name, style="dim"), rest)
+
+    return table
+
+
+def print_sizes(
+    spec: str,
+    *,
+    console: rich.console.Console | None = None,
+    max_depth: int | None = None,
+    top: int | None = None,
+) -> None:
+    """
+    Print the storage report of a file, or of an object in it with
+    ``file.root:path``.
+    """
+    import uproot
+
+    if console is None:
+        console = rich.get_console()
+
+    filename, selection = split_spec(spec)
+    with uproot.open(spec) as item:
+        size = measure(UprootEntry("/", item), selection or Path(filename).name)
+    if size is None:
+        msg = f"No storage information in {spec} (RNTuples are not supported)"
+        raise ValueError(msg)
+    console.print(size_table(size, max_depth=max_depth, top=top))
@@ -0,0 +1,372 @@
+"""
+A sidecar index of a file's structure (directories, trees, branches, their
+labels and sizes), so reopening a file with a huge schema doesn't walk it
+again. Indexes are SQLite files in the cache directory, one per file, and are
+ignored once the file's size, modification time or UUID change.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import dataclasses
+import hashlib
+import sqlite3
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from rich.text import Text
+
+from uproot_browser.cache import file_identity
+from uproot_browser.tree import (
+    LazyObject,
+    MetaDict,
+    UprootEntry,
+    child_entries,
+    console,
+    is_dir,
+    iter_tree_lines,
+    peek_icon,
+    print_lines,
+    process_item,
+    resolve,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+
+    from rich.console import Console
+
+__all__ = (
+    "IndexedObject",
+    "Record",
+    "Structure",
+    "load_records",
+    "make_record",
+    "open_structure",
+    "print_indexed_tree",
+    "save_records",
+    "structure_path",
+    "walk_records",
+)
+
+
+def __dir__() -> tuple[str, ...]:
+    return __all__
+
+
+# Bump when the stored columns change, to ignore old indexes.
+_FORMAT_VERSION = 2
+
+
+@dataclasses.dataclass(frozen=True)
+class Record:
+    """
+    One object, tree or branch, as far as it is known without reading it.
+    """
+
+    path: str
+    classname: str
+    typename: str | None
+    num_entries: int | None
+    compressed_bytes: int | None
+    uncompressed_bytes: int | None
+    num_baskets: int | None
+    is_dir: bool
+    icon: str
+    label: str | None  # console markup of the label text, None if not known
+    guide_style: str | None
+
+
+def _int_or_none(value: Any) -> int | None:
+    return None if value is None else int(value)
+
+
+def make_record(entry: UprootEntry, *, read: bool = True, label: bool = True) -> Record:
+    """
+    Describe ``entry``. Objects only known from their TKey (other than trees,
+    which are read to be walked anyway) are read for their label if ``read``
+    is True, otherwise the label is left out; so is every label without
+    ``label``.
+    """
+    item = entry.item
+    is_container = entry.is_dir
+    lazy = isinstance(item, LazyObject) and not item.is_read
+    known = not lazy or read
+    obj = resolve(item) if known else None
+
+    if lazy:
+        compressed: int | None = item.compressed_bytes
+        uncompressed: int | None = item.uncompressed_bytes
+    else:
+        compressed = _int_or_none(getattr(obj, "compressed_bytes", None))
+        uncompressed = _int_or_none(getattr(obj, "uncompressed_bytes", None))
+
+    meta = entry.meta() if known and label else None
+    return Record(
+        path=entry.path,
+        classname=item.classname
+        if isinstance(item, LazyObject)
+        else str(getattr(obj, "classname", type(obj).__name__)),
+        typename=None if obj is None else getattr(obj, "typename", None),
+        num_entries=_int_or_none(getattr(obj, "num_entries", None)),
+        compressed_bytes=compressed,
+        uncompressed_bytes=uncompressed,
+        num_baskets=_int_or_none(getattr(obj, "num_baskets", None)),
+        is_dir=is_container,
+        icon=entry.icon,
+        label=None if meta is None else meta["label_text"].markup,
+        guide_style=None if meta is None else meta.get("guide_style"),
+    )
+
+
+def walk_records(
+    upfile: Any,
+    *,
+    read: bool = True,
+    cancelled: Callable[[], bool] | None = None,
+) -> Iterator[Record]:
+    """
+    Records for a whole file, the file itself first, then depth-first. Stops
+    early (leaving the walk incomplete) once ``cancelled`` returns True.
+    """
+    root = UprootEntry("/", upfile)
+    yield make_record(root)
+    for entry in root.walk():
+        if cancelled is not None and cancelled():
+            return
+        yield make_record(entry, read=read)
+
+
+class Structure:
+    """
+    The records of an open file, standing in for walking it: :meth:`entry`
+    gives tree entries whose labels and children come from the records, and
+    whose objects are only read (by path) when they are needed.
+    """
+
+    def __init__(self, upfile: Any, records: Iterable[Record]) -> None:
+        self.upfile = upfile
+        self.records = {record.path: record for record in records}
+        self.children: dict[str, list[str]] = {path: [] for path in self.records}
+        for path in self.records:
+            if path != "/":
+                self.children[path.rsplit("/", 1)[0]].append(path)
+
+    def entry(self, path: str = "/") -> UprootEntry:
+        return UprootEntry(path, IndexedObject(self, path))
+
+
+class IndexedObject:
+    """
+    An object (or the file itself, at ``/``) known from a :class:`Structure`.
+    Nothing is read from the file until :attr:`item` is used.
+    """
+
+    __slots__ = ("_item", "_read", "path", "structure")
+
+    def __init__(self, structure: Structure, path: str) -> None:
+        self.structure = structure
+        self.path = path
+        self._item: Any = None
+        self._read = False
+
+    def __repr__(self) -> str:
+        return f"<IndexedObject {self.path}: {self.classname}>"
+
+    @property
+    def record(self) -> Record:
+        return self.structure.records[self.path]
+
+    @property
+    def name(self) -> str:
+        return self.path.rsplit("/", 1)[-1]
+
+    @property
+    def classname(self) -> str:
+        return self.record.classname
+
+    @property
+    def num_entries(self) -> int:
+        return self.record.num_entries or 0
+
+    @property
+    def uncompressed_bytes(self) -> int:
+        return self.record.uncompressed_bytes or 0
+
+    @property
+    def item(self) -> Any:
+        """The uproot object, read on first access."""
+        if not self._read:
+            upfile = self.structure.upfile
+            self._item = upfile if self.path == "/" else upfile[self.path]
+            self._read = True
+        return self._item
+
+
+@resolve.register
+def _(item: IndexedObject) -> Any:
+    return item.item
+
+
+@is_dir.register
+def _(item: IndexedObject) -> bool:
+    return item.record.is_dir
+
+
+@peek_icon.register
+def _(item: IndexedObject) -> str | None:
+    return item.record.icon
+
+
+@child_entries.register
+def _(item: IndexedObject, path: str) -> list[UprootEntry]:
+    return [item.structure.entry(child) for child in item.structure.children[path]]
+
+
+@process_item.register
+def _process_item_indexed(uproot_object: IndexedObject) -> MetaDict:
+    """
+    The stored label; objects indexed without one are read.
+    """
+    record = uproot_object.record
+    if record.label is None:
+        return process_item(uproot_object.item)
+    meta = MetaDict(label_icon=record.icon, label_text=Text.from_markup(record.label))
+    if record.guide_style is not None:
+        meta["guide_style"] = record.guide_style
+    return meta
+
+
+def structure_path(cache_dir: Path, upfile: Any) -> Path | None:
+    """
+    Where the index of a file opened by ``uproot.open`` is kept (one per path),
+    or None for files that are not on local disk. An index always covers the
+    whole file, so there is none for a ``file.root:object`` spec either.
+    """
+    import uproot
+
+    if not isinstance(upfile, uproot.ReadOnlyDirectory) or upfile.path:
+        return None
+    identity = file_identity(upfile.file)
+    if identity is None:
+        return None
+    name = hashlib.sha256(identity[0].encode()).hexdigest()
+    return cache_dir / "structure" / f"{name}.sqlite"
+
+
+_COLUMNS = tuple(field.name for field in dataclasses.fields(Record))
+
+
+def save_records(path: Path, file: Any, records: Iterable[Record]) -> None:
+    """
+    Write the records of an uproot ``ReadOnlyFile`` to an index at ``path``.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Write next to the target and rename, so readers never see partial files.
+    with tempfile.NamedTemporaryFile(
+        dir=path.parent, suffix=".tmp", delete=False
+    ) as tmp:
+        pass
+    try:
+        with contextlib.closing(sqlite3.connect(tmp.name)) as db:
+            db.execute("CREATE TABLE info (version INTEGER, identity TEXT)")
+            db.execute(
+                "INSERT INTO info VALUES (?, ?)",
+                (_FORMAT_VERSION, repr(file_identity(file))),
+            )
+            db.execute(f"CREATE TABLE records ({', '.join(_COLUMNS)})")
+            db.executemany(
+                f"INSERT INTO records VALUES ({', '.join('?' * len(_COLUMNS))})",
+                (dataclasses.astuple(record) for record in records),
+            )
+            db.commit()
+    except BaseException:
+        Path(tmp.name).unlink()
+        raise
+    Path(tmp.name).replace(path)
+
+
+def load_records(path: Path, file: Any) -> list[Record] | None:
+    """
+    Read an index written by :func:`save_records`, or None if there is none
+    for this version of the file.
+    """
+    try:
+        with contextlib.closing(
+            sqlite3.connect(f"{path.resolve().as_uri()}?mode=ro", uri=True)
+        ) as db:
+            info = db.execute("SELECT version, identity FROM info").fetchone()
+            if info != (_FORMAT_VERSION, repr(file_identity(file))):
+                return None
+            rows = db.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM records ORDER BY rowid"
+            ).fetchall()
+    except (sqlite3.Error, OSError):
+        return None
+    records = []
+    for row in rows:
+        values = dict(zip(_COLUMNS, row, strict=True))
+        values["is_dir"] = bool(values["is_dir"])
+        records.append(Record(**values))
+    return records
+
+
+def open_structure(upfile: Any, cache_dir: Path) -> Structure:
+    """
+    The structure of an open file, from its index in ``cache_dir`` if it is
+    up to date, otherwise by walking the file (saving the index for next time).
+    """
+    path = structure_path(cache_dir, upfile)
+    records = None if path is None else load_records(path, upfile.file)
+    if records is None:
+        records = list(walk_records(upfile))
+        if path is not None:
+            with contextlib.suppress(OSError, sqlite3.Error):
+                save_records(path, upfile.file, records)
+    return Structure(upfile, records)
+
+
+def print_indexed_tree(  # noqa: PLR0913
+    entry: str,
+    cache_dir: Path,
+    *,
+    # pylint: disable-next=redefined-outer-name
+    console: Console = console,
+    max_depth: int | None = None,
+    max_children: int | None = None,
+    pattern: str | None = None,
+) -> None:
+    """
+    :func:`~uproot_browser.tree.print_tree`, with the structure loaded from
+    its index in ``cache_dir`` if it is up to date. Otherwise the file is
+    walked while printing, as usual, and the index is saved once the whole
+    file has been shown (not for a depth-limited or filtered tree).
+    """
+    import uproot
+
+    with uproot.open(entry) as upfile:
+        path = structure_path(cache_dir, upfile)
+        records = None if path is None else load_records(path, upfile.file)
+        # Only a walk of the whole file makes an index
+        complete = max_depth is None and max_children is None and pattern is None
+        save = path is not None and records is None and complete
+        walked: list[Record] = []
+        if records is not None:
+            root = Structure(upfile, records).entry()
+        else:
+            root = UprootEntry("/", upfile)
+        print_lines(
+            iter_tree_lines(
+                root,
+                console,
+                max_depth=max_depth,
+                max_children=max_children,
+                pattern=pattern,
+                visit=(lambda node: walked.append(make_record(node))) if save else None,
+            ),
+            out=console,
+        )
+        if path is not None and save:
+            with contextlib.suppress(OSError, sqlite3.Error):
+                save_records(path, upfile.file, walked)
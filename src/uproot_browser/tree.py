@@ -5,29 +5,48 @@ Display tools for TTrees.
 from __future__ import annotations
 
 import dataclasses
+import fnmatch
 import functools
+import pkgutil
+import threading
+import time
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Literal, Protocol, TypedDict
+from typing import TYPE_CHECKING, Any, Literal, Protocol, TypedDict, TypeVar
 
-import uproot
-import uproot.reading
 from rich.console import Console
 from rich.markup import escape
+from rich.segment import Segment, Segments
+from rich.style import Style
+from rich.styled import Styled
 from rich.text import Text
 from rich.tree import Tree
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable, Iterator
+    from collections.abc import Callable, Iterable, Iterator
+
+    import uproot
+    import uproot.reading
+
+F = TypeVar("F", bound="Callable[..., Any]")
 
 console = Console()
 
 __all__ = (
+    "LazyObject",
     "MetaDict",
     "UprootEntry",
+    "child_entries",
     "console",
+    "iter_tree_lines",
     "make_tree",
+    "path_matches",
+    "peek_icon",
+    "print_lines",
     "print_tree",
     "process_item",
+    "register_uproot",
+    "resolve",
+    "split_spec",
 )
 
 
@@ -39,6 +58,43 @@ def __dir__() -> tuple[str, ...]:
     return __all__
 
 
+# Specializations for uproot types, as (dispatcher, dotted type name, function).
+# They are registered the first time an object without a specialization is
+# dispatched, so that importing this module doesn't import uproot.
+_deferred: list[tuple[Any, str, Callable[..., Any]]] = []
+_deferred_done = threading.Event()
+_deferred_lock = threading.Lock()
+
+
+def register_uproot(dispatcher: Any, *names: str) -> Callable[[F], F]:
+    """
+    Like ``dispatcher.register(cls)``, for uproot classes given by dotted name
+    (like ``"uproot.TTree"``), which are only imported when first needed.
+    """
+
+    def decorator(func: F) -> F:
+        _deferred.extend((dispatcher, name, func) for name in names)
+        return func
+
+    return decorator
+
+
+def _register_deferred() -> bool:
+    """
+    Make the deferred registrations (importing uproot) if that hasn't been
+    done yet. True if it hadn't, so a dispatch that fell back to the default
+    should be retried.
+    """
+    if _deferred_done.is_set():
+        return False
+    with _deferred_lock:
+        if not _deferred_done.is_set():
+            for dispatcher, name, func in _deferred:
+                dispatcher.register(pkgutil.resolve_name(name), func)
+            _deferred_done.set()
+    return True
+
+
 class MetaDictRequired(TypedDict, total=True):
     label_text: Text
     label_icon: str
@@ -48,64 +104,224 @@ class MetaDict(MetaDictRequired, total=False):
     guide_style: str
 
 
+class LazyObject:
+    """
+    An object in a directory, known only from its ``TKey`` (name, cycle, class
+    name and sizes). Nothing is read from the file until :attr:`item` is used.
+    """
+
+    __slots__ = ("_item", "_read", "key")
+
+    def __init__(self, key: uproot.reading.ReadOnlyKey) -> None:
+        self.key = key
+        self._item: Any = None
+        self._read = False
+
+    def __repr__(self) -> str:
+        return f"<LazyObject {self.name};{self.cycle}: {self.classname}>"
+
+    @property
+    def name(self) -> str:
+        return str(self.key.fName)
+
+    @property
+    def cycle(self) -> int:
+        return int(self.key.fCycle)
+
+    @property
+    def classname(self) -> str:
+        return str(self.key.fClassName)
+
+    @property
+    def compressed_bytes(self) -> int:
+        return int(self.key.data_compressed_bytes)
+
+    @property
+    def uncompressed_bytes(self) -> int:
+        return int(self.key.data_uncompressed_bytes)
+
+    @property
+    def item(self) -> Any:
+        """The deserialized object, read on first access."""
+        if not self._read:
+            self._item = self.key.get()
+            self._read = True
+        return self._item
+
+    @property
+    def is_read(self) -> bool:
+        """True once :attr:`item` has been read."""
+        return self._read
+
+
+@functools.singledispatch
+def resolve(item: Any) -> Any:
+    """
+    The uproot object behind ``item``, reading it if it is a :class:`LazyObject`
+    (or otherwise only known from an index).
+    """
+    return item
+
+
+@resolve.register
+def _(item: LazyObject) -> Any:
+    return item.item
+
+
+# Class names of objects that are containers; TTrees and RNTuples are read to
+# check that they are not empty, directories never are.
+_DIRECTORY_CLASSNAMES = frozenset({"TDirectory", "TDirectoryFile"})
+_TREE_CLASSNAMES = frozenset(
+    {"TTree", "TNtuple", "TNtupleD", "ROOT::RNTuple", "ROOT::Experimental::RNTuple"}
+)
+
+
 @functools.singledispatch
-def is_dir(item: Any) -> bool:  # noqa: ARG001
+def is_dir(item: Any) -> bool:
+    if _register_deferred():
+        return is_dir(item)
     return False
 
 
 @is_dir.register
+def _(item: LazyObject) -> bool:
+    if item.classname in _DIRECTORY_CLASSNAMES:
+        return True
+    if item.classname in _TREE_CLASSNAMES:
+        return is_dir(item.item)
+    return False
+
+
+@register_uproot(is_dir, "uproot.reading.ReadOnlyDirectory")
 def _(item: uproot.reading.ReadOnlyDirectory) -> Literal[True]:  # noqa: ARG001
     return True
 
 
-@is_dir.register(uproot.behaviors.TBranch.HasBranches)
-@is_dir.register(uproot.behaviors.RNTuple.HasFields)
+@register_uproot(
+    is_dir, "uproot.behaviors.TBranch.HasBranches", "uproot.behaviors.RNTuple.HasFields"
+)
 def _(
     item: uproot.behaviors.TBranch.HasBranches | uproot.behaviors.RNTuple.HasFields,
 ) -> bool:
     return len(item) > 0
 
 
+@functools.singledispatch
+def peek_icon(item: Any) -> str | None:  # noqa: ARG001
+    """
+    The label icon of an object that hasn't been read, if it can be told
+    without reading it (matches the :func:`process_item` specializations).
+    """
+    return None
+
+
+@peek_icon.register
+def _(item: LazyObject) -> str | None:
+    if item.is_read:
+        return None
+    if item.classname in _DIRECTORY_CLASSNAMES:
+        return "📁 "
+    if item.classname.startswith("TProfile"):
+        return "📈 "
+    if item.classname.startswith(("TH1", "TH2", "TH3")):
+        return "📊 "
+    return None
+
+
 def get_children(item: SupportsRecursiveKeys) -> set[str]:
     return {key.split(";")[0] for key in item.keys(recursive=False)}
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class UprootEntry:
     path: str
     item: Any
+    # Computed on first use; labels are drawn over and over while scrolling
+    _is_dir: bool | None = dataclasses.field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _meta: MetaDict | None = dataclasses.field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _label: Text | None = dataclasses.field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     @property
     def is_dir(self) -> bool:
-        return is_dir(self.item)
+        if self._is_dir is None:
+            self._is_dir = is_dir(self.item)
+        return self._is_dir
 
     def meta(self) -> MetaDict:
-        return process_item(self.item)
+        if self._meta is None:
+            self._meta = process_item(self.item)
+        return self._meta
+
+    @property
+    def icon(self) -> str:
+        """
+        The label icon, without reading a histogram or directory to find it.
+        """
+        if self._meta is None:
+            icon = peek_icon(self.item)
+            if icon is not None:
+                return icon
+        return self.meta()["label_icon"]
+
+    @property
+    def label(self) -> Text:
+        """
+        The icon and label text, assembled once. Shared: copy before styling.
+        """
+        if self._label is None:
+            meta = self.meta()
+            self._label = Text.assemble(meta["label_icon"], meta["label_text"])
+        return self._label
 
     def tree_args(self) -> dict[str, Any]:
         meta = self.meta()
-        d: dict[str, Text | str] = {
-            "label": Text.assemble(meta["label_icon"], meta["label_text"])
-        }
+        d: dict[str, Text | str] = {"label": self.label}
         if "guide_style" in meta:
             d["guide_style"] = meta["guide_style"]
         return d
 
     @property
     def children(self) -> list[UprootEntry]:
-        if not self.is_dir:
-            return []
+        return child_entries(self.item, self.path) if self.is_dir else []
+
+    def walk(self, *, max_depth: int | None = None) -> Iterator[UprootEntry]:
+        """
+        Yield every descendant entry depth-first (not including self), down to
+        ``max_depth`` levels below this one.
+        """
+        if max_depth == 0:
+            return
+        for child in self.children:
+            yield child
+            yield from child.walk(
+                max_depth=None if max_depth is None else max_depth - 1
+            )
+
 
+@functools.singledispatch
+def child_entries(item: Any, path: str) -> list[UprootEntry]:
+    """
+    The entries inside ``item`` (a directory, tree or branch at ``path``).
+    """
+    import uproot.reading
+
+    item = resolve(item)
+    if isinstance(item, uproot.reading.ReadOnlyDirectory):
+        # Only the TKeys are looked at; objects are read when needed
         return [
-            UprootEntry(f"{self.path}/{key}", self.item[key])
-            for key in sorted(get_children(self.item))
+            UprootEntry(f"{path}/{key}", LazyObject(item.key(key)))
+            for key in sorted(get_children(item))
         ]
 
-    def walk(self) -> Iterator[UprootEntry]:
-        """Yield every descendant entry depth-first (not including self)."""
-        for child in self.children:
-            yield child
-            yield from child.walk()
+    return [
+        UprootEntry(f"{path}/{key}", item[key]) for key in sorted(get_children(item))
+    ]
 
 
 def make_tree(node: UprootEntry, *, tree: Tree | None = None) -> Tree:
@@ -121,11 +337,159 @@ def make_tree(node: UprootEntry, *, tree: Tree | None = None) -> Tree:
     return tree
 
 
+# Seconds between writes while streaming a tree; the first line is written
+# right away.
+FLUSH_INTERVAL = 0.1
+
+_SPACE, _CONTINUE, _FORK, _END = range(4)
+
+
+def path_matches(path: str, pattern: str) -> bool:
+    """
+    True if the name or the path (inside the file) of the object at ``path``
+    matches the glob ``pattern``.
+    """
+    return fnmatch.fnmatchcase(path.rsplit("/", 1)[-1], pattern) or (
+        fnmatch.fnmatchcase(path.lstrip("/"), pattern)
+    )
+
+
+def _shown_children(
+    entry: UprootEntry, pattern: str | None, max_children: int | None
+) -> list[UprootEntry | int]:
+    """
+    The children of ``entry`` to show: containers and the objects matching
+    ``pattern`` (by name or path), cut off after ``max_children`` with the
+    number of the rest.
+    """
+    children: list[UprootEntry | int] = [
+        child
+        for child in entry.children
+        if pattern is None or child.is_dir or path_matches(child.path, pattern)
+    ]
+    if max_children is not None and len(children) > max_children:
+        children[max_children:] = [len(children) - max_children]
+    return children
+
+
+def iter_tree_lines(  # noqa: C901, PLR0913, PLR0915
+    root: UprootEntry,
+    out: Console,
+    *,
+    max_depth: int | None = None,
+    max_children: int | None = None,
+    pattern: str | None = None,
+    visit: Callable[[UprootEntry], None] | None = None,
+) -> Iterator[list[Segment]]:
+    """
+    The lines of the tree below ``root``, as :func:`make_tree` would draw them
+    on ``out``, produced while walking it (no deeper than ``max_depth``
+    levels), so huge files start printing at once. Only containers and objects
+    matching the glob ``pattern`` are shown, like ``tree -P``, and at most
+    ``max_children`` children per node, followed by a count of the rest.
+    ``visit`` is called with each entry shown, in order, before its lines.
+
+    This follows ``rich.tree.Tree.__rich_console__``, with the tree walked
+    lazily instead of built first.
+    """
+    options = out.options
+    get_style = out.get_style
+    null_style = Style.null()
+    remove_guide_styles = Style(bold=False, underline2=False)
+    style = get_style("tree")
+
+    def make_guide(index: int, style: Style) -> Segment:
+        if options.ascii_only:
+            line = Tree.ASCII_GUIDES[index]
+        else:
+            guide = 1 if style.bold else (2 if style.underline2 else 0)
+            line = Tree.TREE_GUIDES[0 if options.legacy_windows else guide][index]
+        return Segment(line, style)
+
+    # Children without a guide style of their own use their parent's, and
+    # the styles add up down the tree
+    root_guide = root.meta().get("guide_style", "tree.line")
+    levels = [make_guide(_CONTINUE, get_style(root_guide, default="") or null_style)]
+    stack: list[Iterator[tuple[bool, UprootEntry | int]]] = [iter([(True, root)])]
+    guides: list[tuple[str, Style]] = [(root_guide, get_style(root_guide))]
+
+    while stack:
+        try:
+            last, node = next(stack[-1])
+        except StopIteration:
+            stack.pop()
+            levels.pop()
+            if levels:
+                levels[-1] = make_guide(_FORK, levels[-1].style or null_style)
+                guides.pop()
+            continue
+        if last:
+            levels[-1] = make_guide(_END, levels[-1].style or null_style)
+
+        parent_guide, guide_stack = guides[-1]
+        if isinstance(node, int):
+            label = Text(f"… {node} more", style="dim italic")
+            node_guide = parent_guide
+        else:
+            if visit is not None:
+                visit(node)
+            label = node.label
+            node_guide = node.meta().get("guide_style", parent_guide)
+        guide_style = guide_stack + get_style(node_guide)
+
+        prefix = levels[1:]
+        lines = out.render_lines(
+            Styled(label, style),
+            options.update(
+                width=options.max_width - sum(level.cell_length for level in prefix),
+                highlight=False,
+                height=None,
+            ),
+            pad=False,
+        )
+        for first, line in enumerate(lines):
+            segments = (
+                list(
+                    Segment.apply_style(
+                        prefix, style.background_style, post_style=remove_guide_styles
+                    )
+                )
+                if prefix
+                else []
+            )
+            yield [*segments, *line, Segment.line()]
+            if first == 0 and prefix:
+                prefix[-1] = make_guide(
+                    _SPACE if last else _CONTINUE, prefix[-1].style or null_style
+                )
+
+        depth = len(stack) - 1
+        if isinstance(node, int) or (max_depth is not None and depth >= max_depth):
+            continue
+        children = _shown_children(node, pattern, max_children) if node.is_dir else []
+        if children:
+            levels[-1] = make_guide(
+                _SPACE if last else _CONTINUE, levels[-1].style or null_style
+            )
+            levels.append(
+                make_guide(_END if len(children) == 1 else _FORK, guide_style)
+            )
+            guides.append((node_guide, guide_stack + get_style(node_guide)))
+            stack.append(iter(_loop_last(children)))
+
+
+def _loop_last(items: list[Any]) -> Iterator[tuple[bool, Any]]:
+    for i, item in enumerate(items):
+        yield i == len(items) - 1, item
+
+
 @functools.singledispatch
 def process_item(uproot_object: Any) -> MetaDict:
     """
     Given an unknown object, return a rich.tree.Tree output. Specialize for known objects.
     """
+    if _register_deferred():
+        return process_item(uproot_object)
     name = getattr(uproot_object, "name", "<unnamed>")
     classname = getattr(uproot_object, "classname", uproot_object.__class__.__name__)
     label_text = Text.assemble(
@@ -136,6 +500,14 @@ def process_item(uproot_object: Any) -> MetaDict:
 
 
 @process_item.register
+def _process_item_lazy(uproot_object: LazyObject) -> MetaDict:
+    """
+    Labels show object data (entries, bins), so this reads the object.
+    """
+    return process_item(uproot_object.item)
+
+
+@register_uproot(process_item, "uproot.reading.ReadOnlyDirectory")
 def _process_item_tfile(
     uproot_object: uproot.reading.ReadOnlyDirectory,
 ) -> MetaDict:
@@ -162,7 +534,7 @@ def _process_item_tfile(
     )
 
 
-@process_item.register
+@register_uproot(process_item, "uproot.TTree")
 def _process_item_ttree(uproot_object: uproot.TTree) -> MetaDict:
     """
     Given an tree, return a rich.tree.Tree output.
@@ -179,7 +551,7 @@ def _process_item_ttree(uproot_object: uproot.TTree) -> MetaDict:
     )
 
 
-@process_item.register
+@register_uproot(process_item, "uproot.behaviors.RNTuple.RNTuple")
 def _process_item_rntuple(
     uproot_object: uproot.behaviors.RNTuple.RNTuple,
 ) -> MetaDict:
@@ -198,12 +570,14 @@ def _process_item_rntuple(
     )
 
 
-@process_item.register
+@register_uproot(process_item, "uproot.TBranch")
 def _process_item_tbranch(uproot_object: uproot.TBranch) -> MetaDict:
     """
     Given an branch, return a rich.tree.Tree output.
     """
 
+    import uproot.interpretation.jagged
+
     jagged = isinstance(
         uproot_object.interpretation, uproot.interpretation.jagged.AsJagged
     )
@@ -224,7 +598,7 @@ def _process_item_tbranch(uproot_object: uproot.TBranch) -> MetaDict:
     )
 
 
-@process_item.register
+@register_uproot(process_item, "uproot.models.RNTuple.RField")
 def _process_item_rbranch(uproot_object: uproot.models.RNTuple.RField) -> MetaDict:
     """
     Given an branch, return a rich.tree.Tree output.
@@ -244,7 +618,7 @@ def _process_item_rbranch(uproot_object: uproot.models.RNTuple.RField) -> MetaDi
     )
 
 
-@process_item.register
+@register_uproot(process_item, "uproot.behaviors.TH1.Histogram")
 def _process_item_th(uproot_object: uproot.behaviors.TH1.Histogram) -> MetaDict:
     """
     Given an histogram, return a rich.tree.Tree output.
@@ -263,13 +637,61 @@ def _process_item_th(uproot_object: uproot.behaviors.TH1.Histogram) -> MetaDict:
     )
 
 
-# pylint: disable-next=redefined-outer-name
-def print_tree(entry: str, *, console: Console = console) -> None:
+def print_tree(
+    entry: str,
+    *,
+    # pylint: disable-next=redefined-outer-name
+    console: Console = console,
+    max_depth: int | None = None,
+    max_children: int | None = None,
+    pattern: str | None = None,
+) -> None:
     """
     Prints a tree given a specification string. Currently, that must be a
-    single filename. Colons are not allowed currently in the filename.
+    single filename. Colons are not allowed currently in the filename. Lines
+    are printed on ``console`` as the file is walked; see :func:`iter_tree_lines`
+    for the other options, and :func:`uproot_browser.structure.print_indexed_tree`
+    to keep an index of the structure.
     """
+    import uproot
 
     with uproot.open(entry) as upfile:
-        tree = make_tree(UprootEntry("/", upfile))
-    console.print(tree)
+        root = UprootEntry("/", upfile)
+        print_lines(
+            iter_tree_lines(
+                root,
+                console,
+                max_depth=max_depth,
+                max_children=max_children,
+                pattern=pattern,
+            ),
+            out=console,
+        )
+
+
+def split_spec(spec: str) -> tuple[str, str | None]:
+    """
+    Split a ``file.root:path/to/object`` specification the way ``uproot.open``
+    does, into the filename and the object path (None for a whole file).
+    """
+    import uproot._util
+
+    # pylint: disable-next=protected-access
+    filename, object_path = uproot._util.file_object_path_split(spec)  # noqa: SLF001
+    return filename, object_path
+
+
+def print_lines(lines: Iterable[list[Segment]], *, out: Console = console) -> None:
+    """
+    Print lines (from :func:`iter_tree_lines`) as they come, in batches of at
+    most :data:`FLUSH_INTERVAL` seconds.
+    """
+    batch: list[Segment] = []
+    last = float("-inf")
+    for line in lines:
+        batch += line
+        if time.monotonic() - last >= FLUSH_INTERVAL:
+            out.print(Segments(batch), end="")
+            batch = []
+            last = time.monotonic()
+    out.print(Segments(batch), end="")
@@ -5,10 +5,11 @@ if not __package__:
 
 import contextlib
 import dataclasses
+import functools
+import threading
+from pathlib import Path
 from typing import TYPE_CHECKING, Any, ClassVar
 
-import plotext as plt
-import rich.syntax
 import textual.app
 import textual.binding
 import textual.containers
@@ -18,34 +19,39 @@ import textual.widgets
 import textual.worker
 from textual.reactive import var
 
-with contextlib.suppress(AttributeError):
-    light_background = 0xF5, 0xF5, 0xF5
-    # pylint: disable-next=protected-access
-    plt._dict.themes["default"][0] = light_background
-    # pylint: disable-next=protected-access
-    plt._dict.themes["default"][1] = light_background
-
-    dark_background = 0x1E, 0x1E, 0x1E
-    dark_text = 0xFF, 0xA6, 0x2B
-    # pylint: disable-next=protected-access
-    plt._dict.themes["dark"][0] = dark_background
-    # pylint: disable-next=protected-access
-    plt._dict.themes["dark"][1] = dark_background
-    # pylint: disable-next=protected-access
-    plt._dict.themes["dark"][2] = dark_text
-
-
+from ..cache import DiskCache, HistogramCache
+from ..fill import estimate_nbytes
 from .error import Error
-from .header import Header
+from .header import Header, HeaderTitle
 from .help import HelpScreen
 from .jump import JumpScreen
 from .left_panel import UprootTree
-from .plot import Plotext, apply_selection, make_dump
+from .plot import Plotext, PlotGrid, make_dump
+from .prefetch import Prefetcher
 from .tools import Info, Tools
 from .viewer import ViewWidget
 
 if TYPE_CHECKING:
-    from .messages import ErrorMessage, RequestPlot, UprootSelected
+    from collections.abc import Callable, Hashable, Iterator
+
+    import rich.console
+
+    from .messages import (
+        ErrorMessage,
+        FileOpened,
+        IndexUpdated,
+        RequestGrid,
+        RequestPlot,
+        UprootHighlighted,
+        UprootSelected,
+    )
+
+
+# Fraction of the baskets read for a sampled preview
+PREVIEW_SAMPLE = 0.01
+
+# Plots rendered at once, across all the widgets showing them
+MAX_RENDERS = 4
 
 
 class Browser(textual.app.App[None]):
@@ -55,6 +61,8 @@ class Browser(textual.app.App[None]):
     BINDINGS: ClassVar[list[textual.binding.BindingType]] = [
         textual.binding.Binding("b", "toggle_files", "Navbar"),
         textual.binding.Binding("/", "jump", "Jump"),
+        textual.binding.Binding("g", "grid", "Grid"),
+        textual.binding.Binding("v", "versus", "X vs Y"),
         textual.binding.Binding("q", "quit", "Quit"),
         textual.binding.Binding("d", "quit_with_dump", "Dump & Quit"),
         textual.binding.Binding("f1", "help", "Help"),
@@ -63,9 +71,21 @@ class Browser(textual.app.App[None]):
     ]
 
     show_tree = var(True)
-
-    def __init__(self, path: str, **kwargs: Any) -> None:
+    preview = var(False)
+    # Cut on the entries of the TTree, applied to every plot (see uproot_browser.cut)
+    cut = var("")
+    # (upfile, path) of the entry under the cursor
+    highlighted: var[tuple[Any, str] | None] = var(None)
+
+    def __init__(
+        self, path: str, *, cache_dir: Path | None = None, **kwargs: Any
+    ) -> None:
         self.path = path
+        self.cache_dir = cache_dir
+        self.histograms = HistogramCache()
+        self.disk_cache = None if cache_dir is None else DiskCache(cache_dir)
+        self.prefetcher = Prefetcher()
+        self.render_slots = threading.BoundedSemaphore(MAX_RENDERS)
         super().__init__(**kwargs)
 
         self.view_widget = ViewWidget(id="plot-view")
@@ -77,7 +97,9 @@ class Browser(textual.app.App[None]):
             # left_panel
             with textual.widgets.TabbedContent(id="left-view"):
                 with textual.widgets.TabPane("Tree", id="tree-tab"):
-                    yield UprootTree(self.path, id="tree-view")
+                    yield UprootTree(
+                        self.path, cache_dir=self.cache_dir, id="tree-view"
+                    )
                 with textual.widgets.TabPane("Tools"):
                     # Not lazy: lazy-mounting a Select races its internal mount
                     # (SelectCurrent.update queries "#label" before that child is
@@ -94,6 +116,14 @@ class Browser(textual.app.App[None]):
     def on_mount(self, _event: textual.events.Mount) -> None:
         self.query_one("#tree-view").focus()
 
+    def on_unmount(self) -> None:
+        self.prefetcher.shutdown()
+
+    @property
+    def sample(self) -> float | None:
+        """Fraction of the baskets to read, None to read everything."""
+        return PREVIEW_SAMPLE if self.preview else None
+
     def watch_show_tree(self, show_tree: bool) -> None:  # noqa: FBT001
         """Called when show_tree is modified."""
         self.set_class(show_tree, "-show-panel")
@@ -104,7 +134,50 @@ class Browser(textual.app.App[None]):
     def action_jump(self) -> None:
         """Open the fuzzy finder to jump to a branch/field."""
         tree = self.query_one("#tree-view", UprootTree)
-        self.push_screen(JumpScreen(tree.all_entries()), self._on_jumped)
+        self.push_screen(
+            JumpScreen(tree.index, complete=tree.index_complete), self._on_jumped
+        )
+
+    def action_grid(self) -> None:
+        """Show the marked branches side by side."""
+        tree = self.query_one("#tree-view", UprootTree)
+        if tree.marked:
+            theme = "dark" if self.current_theme.dark else "default"
+            self.view_widget.item = PlotGrid(
+                tree.upfile,
+                tuple(tree.marked),
+                theme,
+                self,
+                sample=self.sample,
+                cut=self.cut,
+            )
+
+    def action_versus(self) -> None:
+        """Plot the second marked branch against the first, as a heatmap."""
+        tree = self.query_one("#tree-view", UprootTree)
+        if len(tree.marked) >= 2:
+            xpath, ypath, *_ = tree.marked
+            theme = "dark" if self.current_theme.dark else "default"
+            self.view_widget.item = Plotext(
+                tree.upfile,
+                xpath,
+                theme,
+                self,
+                sample=self.sample,
+                versus=ypath,
+                cut=self.cut,
+            )
+
+    def on_file_opened(self, message: FileOpened) -> None:
+        """Report how long opening the file took."""
+        name = Path(message.upfile.file_path).name
+        self.query_one(
+            HeaderTitle
+        ).text = f"uproot-browser: {name} (opened in {message.seconds * 1000:,.0f} ms)"
+
+    def on_index_updated(self, message: IndexUpdated) -> None:
+        if isinstance(self.screen, JumpScreen):
+            self.screen.update_candidates(complete=message.complete)
 
     def _on_jumped(self, path: str | None) -> None:
         if path is None:
@@ -118,6 +191,7 @@ class Browser(textual.app.App[None]):
 
     def action_quit_with_dump(self) -> None:
         """Dump the current state of the application."""
+        import rich.syntax
 
         msg = f'\nimport uproot\nuproot_file = uproot.open("{self.path}")'
 
@@ -126,11 +200,21 @@ class Browser(textual.app.App[None]):
             items = [self.view_widget.item]
         elif isinstance(self.view_widget.item, Plotext):
             plotext = self.view_widget.item
-            msg += f'\nitem = uproot_file["{plotext.selection.lstrip("/")}"]'
-            *_, selected = apply_selection(plotext.upfile, plotext.selection.split(":"))
+            if plotext.versus:
+                msg += (
+                    f'\nitem = (uproot_file["{plotext.selection.lstrip("/")}"],'
+                    f' uproot_file["{plotext.versus.lstrip("/")}"])'
+                )
+            else:
+                msg += f'\nitem = uproot_file["{plotext.selection.lstrip("/")}"]'
+            selected = plotext.item()
             size = plotext.size or ()
-            with contextlib.suppress(RuntimeError):
-                msg += f"\n{make_dump(selected, *size, expr=plotext.expr)}"
+            # Only a cached histogram is used, so that quitting never reads
+            histogram = self.histograms.get(plotext.cache_key)
+            try:
+                msg += f"\n{make_dump(selected, *size, expr=plotext.expr, histogram=histogram, cut=plotext.cut)}"
+            except (RuntimeError, ValueError) as err:
+                msg += f"\n# Can't dump this item: {err}"
             items = [plotext]
 
         theme = "ansi_dark" if self.current_theme.dark else "ansi_light"
@@ -143,20 +227,66 @@ class Browser(textual.app.App[None]):
         self.exit(message=results)
 
     def watch_theme(self) -> None:
-        if isinstance(self.view_widget.item, Plotext):
-            theme = "dark" if self.current_theme.dark else "default"
+        theme = "dark" if self.current_theme.dark else "default"
+        if isinstance(self.view_widget.item, PlotGrid):
+            self.view_widget.item = dataclasses.replace(
+                self.view_widget.item, theme=theme
+            )
+        elif isinstance(self.view_widget.item, Plotext):
             # Reassign (rather than mutate) so that watchers fire and the
             # cached canvas is invalidated.
             self.view_widget.item = dataclasses.replace(
                 self.view_widget.item, theme=theme, previous=None
             )
 
+    def watch_preview(self) -> None:
+        if isinstance(self.view_widget.item, PlotGrid):
+            self.view_widget.item = dataclasses.replace(
+                self.view_widget.item, sample=self.sample
+            )
+        elif isinstance(self.view_widget.item, Plotext):
+            self.view_widget.item = dataclasses.replace(
+                self.view_widget.item, sample=self.sample, previous=None
+            )
+
+    def watch_cut(self) -> None:
+        if isinstance(self.view_widget.item, PlotGrid):
+            self.view_widget.item = dataclasses.replace(
+                self.view_widget.item, cut=self.cut
+            )
+        elif isinstance(self.view_widget.item, Plotext):
+            self.view_widget.item = dataclasses.replace(
+                self.view_widget.item, cut=self.cut, previous=None
+            )
+
     def on_uproot_selected(self, message: UprootSelected) -> None:
         """A message sent by the tree when a file is clicked."""
 
         theme = "dark" if self.current_theme.dark else "default"
         self.view_widget.plot_input.value = ""
-        self.view_widget.item = Plotext(message.upfile, message.path, theme, self)
+        self.view_widget.item = Plotext(
+            message.upfile, message.path, theme, self, sample=self.sample, cut=self.cut
+        )
+
+    def on_uproot_highlighted(self, message: UprootHighlighted) -> None:
+        """Follow the cursor, reading the plots next to it in the background."""
+        self.highlighted = (message.upfile, message.path)
+        jobs: dict[Hashable, tuple[int, Callable[..., Any]]] = {}
+        for entry in message.neighbours:
+            plot = Plotext(
+                message.upfile,
+                entry.path,
+                "default",
+                self,
+                sample=self.sample,
+                cut=self.cut,
+            )
+            if plot.cache_key not in self.histograms:
+                jobs[plot.cache_key] = (
+                    estimate_nbytes(entry.item),
+                    functools.partial(plot.histogram, entry.item),
+                )
+        self.prefetcher.schedule(jobs)
 
     def on_empty_message(self) -> None:
         self.view_widget.item = None
@@ -167,12 +297,73 @@ class Browser(textual.app.App[None]):
     def on_request_plot(self, message: RequestPlot) -> None:
         self.render_plot(message.plot)
 
-    @textual.work(exclusive=True, thread=True)
+    def on_request_grid(self, message: RequestGrid) -> None:
+        panes = [
+            self.query_one(f"#{plot.target}", textual.widgets.Static)
+            for plot in message.grid.panes
+        ]
+        self.run_worker(
+            functools.partial(self._read_grid, message.grid, panes),
+            name="grid",
+            group="grid",
+            exclusive=True,
+            thread=True,
+        )
+
+    def _read_grid(self, grid: PlotGrid, panes: list[textual.widgets.Static]) -> None:
+        worker = textual.worker.get_current_worker()
+
+        def show(index: int, renderable: rich.console.RenderableType) -> None:
+            if not worker.is_cancelled:
+                self.call_from_thread(panes[index].update, renderable)
+
+        def size(index: int) -> tuple[int, int]:
+            width, height = self.call_from_thread(lambda: panes[index].content_size)
+            return max(width, 20), max(height, 5)
+
+        grid.read(show=show, size=size, cancelled=lambda: worker.is_cancelled)
+
     def render_plot(self, plot: Plotext) -> None:
+        """
+        Render ``plot`` in a worker thread, replacing any render still running
+        for the same widget. Renders for different widgets run side by side,
+        at most :data:`MAX_RENDERS` at once.
+        """
+        widget = self.query_one(f"#{plot.target}", textual.widgets.Static)
+        self.run_worker(
+            functools.partial(self._render_plot, plot, widget),
+            name=f"render {plot.selection}",
+            group=f"render-{plot.target}",
+            exclusive=True,
+            thread=True,
+        )
+
+    @contextlib.contextmanager
+    def _render_slot(self, cancelled: Callable[[], bool]) -> Iterator[bool]:
+        """
+        Hold one of the :data:`MAX_RENDERS` render slots; gives False instead
+        if ``cancelled`` returns True while waiting for one.
+        """
+        while not self.render_slots.acquire(timeout=0.05):
+            if cancelled():
+                yield False
+                return
+        try:
+            yield True
+        finally:
+            self.render_slots.release()
+
+    def _render_plot(self, plot: Plotext, widget: textual.widgets.Static) -> None:
         worker = textual.worker.get_current_worker()
-        new_plot = plot.make_plot()
+        with self._render_slot(lambda: worker.is_cancelled) as acquired:
+            if not acquired:
+                return
+            new_plot = plot.make_plot(
+                cancelled=lambda: worker.is_cancelled,
+                update=lambda partial: self.call_from_thread(widget.update, partial),
+            )
         if new_plot and not worker.is_cancelled:
-            self.call_from_thread(self.view_widget.plot_widget.update, new_plot)
+            self.call_from_thread(widget.update, new_plot)
 
 
 if __name__ in {"<run_path>", "__main__"}:
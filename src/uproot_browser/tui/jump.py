@@ -1,16 +1,36 @@
 from __future__ import annotations
 
+import contextlib
 import dataclasses
-from typing import ClassVar
+import re
+from typing import TYPE_CHECKING, ClassVar
 
+import numpy as np
 import rich.text
 import textual.app
 import textual.binding
 import textual.containers
-import textual.fuzzy
 import textual.screen
+import textual.timer
 import textual.widgets
-from textual.widgets.option_list import Option
+from textual.widgets.option_list import Option, OptionDoesNotExist
+
+if TYPE_CHECKING:
+    import numpy.typing as npt
+
+    from ..structure import Record
+
+# Matches listed at once; a more specific query finds the rest
+MAX_RESULTS = 100
+
+# Seconds to wait for more typing before searching
+DEBOUNCE = 0.05
+
+# Characters with a bit of their own in the character masks; the rest share one
+_CHAR_BITS = {
+    char: i for i, char in enumerate("abcdefghijklmnopqrstuvwxyz0123456789_.-")
+}
+_OTHER_BIT = 63
 
 
 @dataclasses.dataclass
@@ -22,9 +42,231 @@ class Candidate:
     icon: str
     is_dir: bool
 
+    @classmethod
+    def from_record(cls, record: Record) -> Candidate:
+        return cls(
+            path=record.path,
+            name=record.path.rstrip("/").rsplit("/", 1)[-1],
+            icon=record.icon,
+            is_dir=record.is_dir,
+        )
+
+
+def _char_mask(text: str) -> int:
+    """Bit mask of the (lowercase) characters in ``text``."""
+    mask = 0
+    for char in set(text):
+        mask |= 1 << _CHAR_BITS.get(char, _OTHER_BIT)
+    return mask
+
+
+def _subsequence_pattern(query: str) -> re.Pattern[str]:
+    """Each character, then anything but the next one: no backtracking."""
+    return re.compile(
+        re.escape(query[0])
+        + "".join(f"[^{re.escape(c)}]*{re.escape(c)}" for c in query[1:])
+    )
+
+
+class SearchIndex:
+    """
+    Fuzzy (in-order subsequence, case-insensitive) search over candidate names
+    that stays fast for hundreds of thousands of candidates.
+
+    A per-candidate mask of the characters in the name rules out most
+    candidates with one vectorized comparison. Names of up to ``WIDTH`` ASCII
+    characters are also kept as rows of a byte matrix, so the survivors are
+    matched with array operations, one query character at a time; the rest
+    are matched with a regular expression. Matches of a query extending the
+    previous one can only come from the previous matches, so only those are
+    searched. Ranking: prefix matches, then substring matches, then by how
+    spread out the match is, then shorter names, then the order added.
+    """
+
+    WIDTH = 64
+
+    def __init__(self) -> None:
+        self.candidates: list[Candidate] = []
+        self._names: list[str] = []
+        self._width = 1  # of the longest name in the matrix
+        self._chunks: list[
+            tuple[npt.NDArray[np.uint64], npt.NDArray[np.int64], npt.NDArray[np.uint8]]
+        ] = []
+        # Last query, the number of candidates then, and its matches
+        self._last: tuple[str, int, npt.NDArray[np.intp]] | None = None
+
+    def __len__(self) -> int:
+        return len(self.candidates)
+
+    def add(self, candidates: list[Candidate]) -> None:
+        """Add candidates; they are found by the next search."""
+        if not candidates:
+            return
+        names = [c.name.lower() for c in candidates]
+        self.candidates.extend(candidates)
+        self._names.extend(names)
+
+        masks = np.fromiter(map(_char_mask, names), np.uint64, len(names))
+        lengths = np.fromiter(map(len, names), np.int64, len(names))
+        # Zero-padded; names that don't fit are all zeros
+        fits = [0 < len(n) <= self.WIDTH and n.isascii() for n in names]
+        padded = b"".join(
+            n.encode().ljust(self.WIDTH, b"\0") if fit else bytes(self.WIDTH)
+            for n, fit in zip(names, fits, strict=True)
+        )
+        matrix = np.frombuffer(padded, np.uint8).reshape(-1, self.WIDTH)
+        self._width = max(
+            [self._width] + [len(n) for n, fit in zip(names, fits, strict=True) if fit]
+        )
+        # Stored transposed: matching goes one character position at a time
+        self._chunks.append((masks, lengths, np.ascontiguousarray(matrix.T)))
+
+    def _arrays(
+        self,
+    ) -> tuple[npt.NDArray[np.uint64], npt.NDArray[np.int64], npt.NDArray[np.uint8]]:
+        if not self._chunks:
+            return (
+                np.zeros(0, np.uint64),
+                np.zeros(0, np.int64),
+                np.zeros((self.WIDTH, 0), np.uint8),
+            )
+        if len(self._chunks) > 1:
+            masks, lengths, matrix = zip(*self._chunks, strict=True)
+            self._chunks = [
+                (
+                    np.concatenate(masks),
+                    np.concatenate(lengths),
+                    np.concatenate(matrix, axis=1),
+                )
+            ]
+        return self._chunks[0]
+
+    def search(
+        self, query: str, limit: int = MAX_RESULTS
+    ) -> tuple[list[Candidate], int]:
+        """The best ``limit`` matches of ``query``, and the number of matches."""
+        query = query.lower()
+        total = len(self.candidates)
+        if not query:
+            return self.candidates[:limit], total
+
+        masks, lengths, matrix = self._arrays()
+        if self._last is not None and query.startswith(self._last[0]):
+            _, previous_total, previous = self._last
+            ids = np.concatenate([previous, np.arange(previous_total, total)])
+        else:
+            ids = np.arange(total)
+        query_mask = np.uint64(_char_mask(query))
+        ids = ids[(masks[ids] & query_mask) == query_mask]
+
+        if len(query) == 1 and query in _CHAR_BITS:
+            # The mask is exact for a character with a bit of its own
+            matches = ids
+            tier = np.where(matrix[0, matches] == ord(query), 0, 1)
+            for k in np.flatnonzero(matrix[0, matches] == 0).tolist():
+                tier[k] = int(not self._names[matches[k]].startswith(query))
+            span = np.ones(len(matches), np.int64)
+        else:
+            in_matrix = matrix[0, ids] != 0
+            matched = [
+                self._match_matrix(matrix[: self._width, ids[in_matrix]], query),
+                self._match_names(ids[~in_matrix], query),
+            ]
+            found, tier, span = (
+                np.concatenate([m[i] for m in matched]) for i in range(3)
+            )
+            matches = np.concatenate([ids[in_matrix], ids[~in_matrix]])[found]
+            tier, span = tier[found], span[found]
+
+        # One sortable integer: tier, span, length, then insertion order
+        keys = (
+            (tier.astype(np.int64) << 56)
+            | (np.minimum(span, 0xFFF) << 44)
+            | (np.minimum(lengths[matches], 0xFFF) << 32)
+            | matches
+        )
+        if len(keys) > limit:
+            keys = keys[np.argpartition(keys, limit)[:limit]]
+        best = (np.sort(keys) & 0xFFFFFFFF).tolist()
+
+        self._last = (query, total, np.sort(matches))
+        return [self.candidates[i] for i in best], len(matches)
+
+    @staticmethod
+    def _match_matrix(
+        columns: npt.NDArray[np.uint8], query: str
+    ) -> tuple[npt.NDArray[np.bool_], npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+        """
+        Match names stored column by column (a row per character position):
+        found, tier and span, per name.
+        """
+        width, size = columns.shape
+        if not query.isascii() or len(query) > width:
+            nothing = np.zeros(size, np.int64)
+            return nothing.astype(bool), nothing, nothing
+        code = np.frombuffer(query.encode(), np.uint8)
+
+        # The whole query, starting at each position
+        found = np.zeros(size, bool)
+        prefix = found
+        for start in range(width - len(code) + 1):
+            here = columns[start] == code[0]
+            for i, char in enumerate(code[1:], start=1):
+                here &= columns[start + i] == char
+            if start == 0:
+                prefix = here
+            found |= here
+        tier = np.where(prefix, 0, np.where(found, 1, 2))
+        span = np.full(size, len(code))
+        if len(code) == 1:
+            return found, tier, span
+
+        # The rest: leftmost greedy match, one character at a time, each one
+        # found by sweeping from the last position back to the previous match
+        others = np.flatnonzero(~found)
+        rest = columns[:, others]
+        # Positions fit in a byte (width < 255), and small arrays are fast
+        first = end = np.zeros(len(others), np.uint8)
+        for i, char in enumerate(code):
+            position = np.full(len(others), width, np.uint8)
+            for j in range(width - 1, -1, -1):
+                position[(rest[j] == char) & (end <= j)] = j
+            if i == 0:
+                first = position
+            end = position + np.uint8(1)
+        found[others] = end <= width
+        span[others] = end - first
+        return found, tier, span
+
+    def _match_names(
+        self, ids: npt.NDArray[np.intp], query: str
+    ) -> tuple[npt.NDArray[np.bool_], npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+        """Match the names that are not in the matrix: found, tier and span."""
+        pattern = _subsequence_pattern(query)
+        tier, span = [], []
+        for i in ids.tolist():
+            name = self._names[i]
+            position = name.find(query)
+            match = pattern.search(name)
+            tier.append(2 if position < 0 else int(position > 0))
+            span.append(
+                len(query)
+                if position >= 0
+                else match.end() - match.start()
+                if match
+                else -1
+            )
+        span_array = np.array(span, np.int64)
+        return span_array >= 0, np.array(tier, np.int64), span_array
+
 
 class JumpScreen(textual.screen.ModalScreen[str | None]):
-    """fzf-style finder: fuzzy-match a node's name, return its path."""
+    """
+    fzf-style finder: fuzzy-match a node's name, return its path.
+
+    ``index`` may still be growing while the file is being indexed; call
+    :meth:`update_candidates` after adding to it.
+    """
 
     BINDINGS: ClassVar[list[textual.binding.BindingType]] = [
         textual.binding.Binding("down", "cursor_down", "Down", show=False),
@@ -32,40 +274,61 @@ class JumpScreen(textual.screen.ModalScreen[str | None]):
         textual.binding.Binding("escape", "cancel", "Cancel", show=False),
     ]
 
-    def __init__(self, candidates: list[Candidate]) -> None:
-        self.candidates = candidates
+    def __init__(self, index: SearchIndex, *, complete: bool = True) -> None:
+        self.index = index
+        self.complete = complete
+        self._query = ""
+        self._matches = 0
+        self._pending: textual.timer.Timer | None = None
         super().__init__()
 
     def compose(self) -> textual.app.ComposeResult:
         with textual.containers.Container(id="jump-dialog"):
             yield textual.widgets.Input(placeholder="Jump to branch…", id="jump-input")
+            yield textual.widgets.Static(id="jump-status")
             yield textual.widgets.OptionList(id="jump-results")
 
     def on_mount(self) -> None:
         self._populate("")
         self.query_one("#jump-input", textual.widgets.Input).focus()
 
-    def _populate(self, query: str) -> None:
-        results = self.query_one("#jump-results", textual.widgets.OptionList)
-        results.clear_options()
+    def update_candidates(self, *, complete: bool) -> None:
+        """Redo the search to include candidates added since the last one."""
+        self.complete = complete
+        self._populate(self._query, keep_highlight=True)
 
-        if query:
-            matcher = textual.fuzzy.Matcher(query)
-            scored = [(matcher.match(c.name), c) for c in self.candidates]
-            candidates = [
-                c
-                for _, c in sorted(
-                    ((s, c) for s, c in scored if s > 0),
-                    key=lambda sc: sc[0],
-                    reverse=True,
-                )
-            ]
-        else:
-            candidates = self.candidates
+    def _update_status(self) -> None:
+        status = f"{self._matches:,}/{len(self.index):,}"
+        if not self.complete:
+            status += " (indexing…)"
+        self.query_one("#jump-status", textual.widgets.Static).update(status)
 
+    def _populate(self, query: str, *, keep_highlight: bool = False) -> None:
+        results = self.query_one("#jump-results", textual.widgets.OptionList)
+        highlighted = (
+            results.get_option_at_index(results.highlighted).id
+            if keep_highlight and results.highlighted is not None
+            else None
+        )
+        self._query = query
+        candidates, self._matches = self.index.search(query)
+
+        results.clear_options()
         results.add_options([Option(self._label(c), id=c.path) for c in candidates])
         if candidates:
             results.highlighted = 0
+        if highlighted is not None:
+            # New matches can outrank the shown ones
+            with contextlib.suppress(OptionDoesNotExist):
+                results.highlighted = results.get_option_index(highlighted)
+        self._update_status()
+
+    def _flush(self) -> None:
+        """Run a search that is waiting out the debounce now."""
+        if self._pending is not None:
+            self._pending.stop()
+            self._pending = None
+            self._populate(self.query_one("#jump-input", textual.widgets.Input).value)
 
     @staticmethod
     def _label(candidate: Candidate) -> rich.text.Text:
@@ -77,9 +340,17 @@ class JumpScreen(textual.screen.ModalScreen[str | None]):
         return text
 
     def on_input_changed(self, event: textual.widgets.Input.Changed) -> None:
-        self._populate(event.value)
+        if self._pending is not None:
+            self._pending.stop()
+
+        def search() -> None:
+            self._pending = None
+            self._populate(event.value)
+
+        self._pending = self.set_timer(DEBOUNCE, search)
 
     def on_input_submitted(self) -> None:
+        self._flush()
         results = self.query_one("#jump-results", textual.widgets.OptionList)
         if results.highlighted is None:
             return
@@ -92,9 +363,11 @@ class JumpScreen(textual.screen.ModalScreen[str | None]):
         self.dismiss(event.option.id)
 
     def action_cursor_down(self) -> None:
+        self._flush()
         self.query_one("#jump-results", textual.widgets.OptionList).action_cursor_down()
 
     def action_cursor_up(self) -> None:
+        self._flush()
         self.query_one("#jump-results", textual.widgets.OptionList).action_cursor_up()
 
     def action_cancel(self) -> None:
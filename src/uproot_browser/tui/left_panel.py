@@ -1,24 +1,69 @@
 from __future__ import annotations
 
+import contextlib
+import itertools
+import sqlite3
+import sys
+import time
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, ClassVar
 
 import rich.panel
 import rich.text
+import textual
 import textual.binding
 import textual.widget
 import textual.widgets
 import textual.widgets.tree
-import uproot
+import textual.worker
 
-from ..tree import UprootEntry
-from .jump import Candidate
-from .messages import UprootSelected
+from ..structure import (
+    IndexedObject,
+    Record,
+    Structure,
+    load_records,
+    save_records,
+    structure_path,
+    walk_records,
+)
+from ..tree import LazyObject, UprootEntry, get_children, resolve
+from .error import Error
+from .jump import Candidate, SearchIndex
+from .messages import (
+    ErrorMessage,
+    FileOpened,
+    IndexUpdated,
+    UprootHighlighted,
+    UprootSelected,
+)
 
 if TYPE_CHECKING:
     from rich.style import Style
 
 
+# Leaves on each side of the cursor whose plots are read ahead of time
+PREFETCH_NEIGHBOURS = 2
+
+# Children added to a node at once; the rest wait behind a "more" node, so
+# expanding a node with a huge fan-out stays quick.
+PAGE_SIZE = 200
+
+# Seconds between updates of the jump index while it is being built
+INDEX_UPDATE_INTERVAL = 0.2
+
+
+def can_list_now(entry: UprootEntry) -> bool:
+    """
+    True if the children of ``entry`` can be added without touching the file
+    and there aren't more than a page of them.
+    """
+    if isinstance(entry.item, IndexedObject):
+        return True
+    if isinstance(entry.item, LazyObject) and not entry.item.is_read:
+        return False
+    return len(get_children(resolve(entry.item))) <= PAGE_SIZE
+
+
 class UprootTree(textual.widgets.Tree[UprootEntry]):
     """currently just extending DirectoryTree, showing current path"""
 
@@ -27,44 +72,133 @@ class UprootTree(textual.widgets.Tree[UprootEntry]):
         textual.binding.Binding("j", "cursor_down", "Cursor Down", show=False),
         textual.binding.Binding("k", "cursor_up", "Cursor Up", show=False),
         textual.binding.Binding("l", "cursor_in", "Cursor in", show=False),
+        textual.binding.Binding("space", "toggle_mark", "Mark", show=False),
     ]
 
-    def __init__(self, path: str, **args: Any) -> None:
-        self.upfile = uproot.open(path)
-        file_path = Path(self.upfile.file_path)
-        data = UprootEntry("/", self.upfile)
-        self._candidates: list[Candidate] | None = None
-        super().__init__(name=str(file_path), data=data, label=file_path.stem, **args)
-
-    def all_entries(self) -> list[Candidate]:
-        """All jump targets in the file, built once and cached."""
-        if self._candidates is None:
-            root = UprootEntry("/", self.upfile)
-            self._candidates = [
-                Candidate(
-                    path=entry.path,
-                    name=entry.path.rstrip("/").rsplit("/", 1)[-1],
-                    icon=entry.meta()["label_icon"],
-                    is_dir=entry.is_dir,
-                )
-                for entry in root.walk()
-            ]
-        return self._candidates
+    def __init__(
+        self, path: str, *, cache_dir: Path | None = None, **args: Any
+    ) -> None:
+        self.path = path
+        self.cache_dir = cache_dir
+        # Opened in the background; until then the root has no data
+        self.upfile: Any = None
+        self.structure: Structure | None = None
+        self.structure_path: Path | None = None
+        # uproot is imported (and the object path split off) in the background
+        file_path = Path(path)
+        # Jump targets, from the structure index or a background walk
+        self.index = SearchIndex()
+        self.index_complete = False
+        # Nodes whose children were added, and the entries behind "more" nodes
+        self._loaded: set[textual.widgets.tree.NodeID] = set()
+        self._more: dict[textual.widgets.tree.NodeID, list[UprootEntry]] = {}
+        # Paths of the leaves marked for the grid view, in the order marked
+        self.marked: dict[str, None] = {}
+        super().__init__(
+            name=str(file_path), data=None, label=f"📁 {file_path.name}", **args
+        )
+
+    @textual.work(thread=True, exit_on_error=False, group="open")
+    def _open_file(self) -> None:
+        """
+        Open the file (and its structure index, if up to date) off the UI
+        thread, so a slow filesystem or a huge key list never blocks the
+        first frame.
+        """
+        start = time.monotonic()
+        try:
+            import uproot
+
+            upfile = uproot.open(self.path)
+            path = (
+                None
+                if self.cache_dir is None
+                else structure_path(self.cache_dir, upfile)
+            )
+            records = None if path is None else load_records(path, upfile.file)
+        except Exception:  # noqa: BLE001
+            exc = sys.exc_info()
+            assert exc[1]
+            self.app.call_from_thread(self._open_failed, Error(exc))
+            return
+        structure = None if records is None else Structure(upfile, records)
+        self.app.call_from_thread(
+            self._opened, upfile, path, structure, time.monotonic() - start
+        )
+
+    def _opened(
+        self,
+        upfile: Any,
+        path: Path | None,
+        structure: Structure | None,
+        seconds: float,
+    ) -> None:
+        self.upfile = upfile
+        self.structure_path = path
+        self.structure = structure
+        self.root.data = (
+            UprootEntry("/", upfile) if structure is None else structure.entry()
+        )
+        self.root.set_label(self.root.label)
+        self.load_directory(self.root)
+        self.post_message(FileOpened(upfile, seconds))
+        if structure is None:
+            self._build_index()
+        else:
+            self._extend_index(
+                [
+                    Candidate.from_record(record)
+                    for record in structure.records.values()
+                    if record.path != "/"
+                ],
+                complete=True,
+            )
+
+    def _open_failed(self, err: Error) -> None:
+        self.root.remove_children()
+        self.root.set_label(f"{self.root.label} (failed to open)")
+        self.post_message(ErrorMessage(err))
+
+    @textual.work(thread=True, exit_on_error=False, group="index")
+    def _build_index(self) -> None:
+        """
+        Walk the whole file for the jump targets, passing them on in batches,
+        and save the structure index. A failure (an unreadable object) leaves
+        the index incomplete.
+        """
+        worker = textual.worker.get_current_worker()
+        records: list[Record] = []
+        batch: list[Candidate] = []
+        last = time.monotonic()
+        # Histograms are not read just for their labels
+        for record in walk_records(
+            self.upfile, read=False, cancelled=lambda: worker.is_cancelled
+        ):
+            records.append(record)
+            if record.path != "/":
+                batch.append(Candidate.from_record(record))
+            if time.monotonic() - last > INDEX_UPDATE_INTERVAL:
+                self.app.call_from_thread(self._extend_index, batch, complete=False)
+                batch = []
+                last = time.monotonic()
+        if worker.is_cancelled:
+            return
+        self.app.call_from_thread(self._extend_index, batch, complete=True)
+        if self.structure_path is not None:
+            with contextlib.suppress(OSError, sqlite3.Error):
+                save_records(self.structure_path, self.upfile.file, records)
+
+    def _extend_index(self, batch: list[Candidate], *, complete: bool) -> None:
+        self.index.add(batch)
+        self.index_complete = complete
+        self.post_message(IndexUpdated(len(self.index), complete=complete))
 
     def select_path(self, target: str) -> None:
         """Navigate to (and reveal) the node at ``target``, plotting leaves."""
         node = self.root
         self.load_directory(node)
         while node.data is not None and node.data.path != target:
-            child = next(
-                (
-                    c
-                    for c in node.children
-                    if c.data is not None
-                    and (c.data.path == target or target.startswith(c.data.path + "/"))
-                ),
-                None,
-            )
+            child = self._find_child(node, target)
             if child is None:
                 return
             self.load_directory(child)
@@ -86,49 +220,157 @@ class UprootTree(textual.widgets.Tree[UprootEntry]):
             else:
                 self.post_message(UprootSelected(self.upfile, target_node.data.path))
 
+    def _find_child(
+        self, node: textual.widgets.tree.TreeNode[UprootEntry], target: str
+    ) -> textual.widgets.tree.TreeNode[UprootEntry] | None:
+        """The child of ``node`` that is or contains ``target``, paging it in."""
+        while True:
+            for child in node.children:
+                if child.data is not None and (
+                    child.data.path == target
+                    or target.startswith(child.data.path + "/")
+                ):
+                    return child
+            more = next((c for c in node.children if c.id in self._more), None)
+            if more is None:
+                return None
+            self.load_more(more)
+
     def render_label(
         self,
         node: textual.widgets.tree.TreeNode[UprootEntry],
         base_style: Style,
         style: Style,  # ,
     ) -> rich.text.Text:
-        assert node.data
-        meta = node.data.meta()
-        label_icon = rich.text.Text(meta["label_icon"])
-        label_icon.stylize(base_style)
-
-        label = rich.text.Text.assemble(label_icon, meta["label_text"])
+        if node.data is None:
+            # "more" and "loading" placeholders
+            label = rich.text.Text.assemble(node.label)
+            label.stylize(style)
+            return label
+        label = node.data.label.copy()
+        label.stylize(base_style, 0, len(node.data.meta()["label_icon"]))
+        if node.data.path in self.marked:
+            label.append(" ●", style="bold")
         label.stylize(style)
         return label
 
     def on_mount(self) -> None:
-        self.load_directory(self.root)
+        self.root.add_leaf(rich.text.Text("opening…", style="dim italic"))
         self.root.expand()
+        self._open_file()
 
     def load_directory(self, node: textual.widgets.tree.TreeNode[UprootEntry]) -> None:
+        """Add the children of ``node`` now (the first page of them)."""
         assert node.data
-        if not node.children:
-            children = node.data.children
-            for child in children:
-                node.add(child.path, child)
+        if node.id not in self._loaded:
+            self._populate(node, node.data.children)
+
+    @textual.work(thread=True)
+    def _load_directory_in_background(
+        self, node: textual.widgets.tree.TreeNode[UprootEntry]
+    ) -> None:
+        assert node.data
+        children = node.data.children
+        self.app.call_from_thread(self._populate, node, children)
+
+    def _populate(
+        self,
+        node: textual.widgets.tree.TreeNode[UprootEntry],
+        children: list[UprootEntry],
+    ) -> None:
+        if node.id in self._loaded:
+            return
+        self._loaded.add(node.id)
+        node.remove_children()
+        self._add_page(node, children)
+
+    def _add_page(
+        self,
+        node: textual.widgets.tree.TreeNode[UprootEntry],
+        entries: list[UprootEntry],
+    ) -> None:
+        for child in entries[:PAGE_SIZE]:
+            node.add(child.path, child)
+        rest = entries[PAGE_SIZE:]
+        if rest:
+            more = node.add_leaf(
+                rich.text.Text(f"… {len(rest)} more", style="dim italic")
+            )
+            self._more[more.id] = rest
+
+    def load_more(self, more: textual.widgets.tree.TreeNode[UprootEntry]) -> None:
+        """Replace a "more" node by the next page of its parent's children."""
+        rest = self._more.pop(more.id, None)
+        if rest is None or more.parent is None:
+            return
+        parent = more.parent
+        more.remove()
+        self._add_page(parent, rest)
 
     def on_tree_node_selected(
         self, event: textual.widgets.Tree.NodeSelected[UprootEntry]
     ) -> None:
         event.stop()
         item = event.node.data
-        assert item
-        if not item.is_dir:
+        if item is None:
+            self.load_more(event.node)
+        elif not item.is_dir:
             self.post_message(UprootSelected(self.upfile, item.path))
 
+    def on_tree_node_highlighted(
+        self, event: textual.widgets.Tree.NodeHighlighted[UprootEntry]
+    ) -> None:
+        event.stop()
+        node = event.node
+        if node.data is None:
+            # Reaching the end of a page loads the next one
+            self.load_more(node)
+            return
+        if node.parent is None:
+            return
+        siblings = node.parent.children
+        index = siblings.index(node)
+        after = siblings[index + 1 : index + 1 + PREFETCH_NEIGHBOURS]
+        before = siblings[max(index - PREFETCH_NEIGHBOURS, 0) : index][::-1]
+        # Nearest first, alternating below and above the cursor. The node under
+        # it is left out: selecting it reads it with progress shown, which a
+        # prefetch in flight would only hold up.
+        neighbours = [
+            n.data
+            for pair in itertools.zip_longest(after, before)
+            for n in pair
+            if n is not None and n.data is not None and not n.data.is_dir
+        ]
+        self.post_message(UprootHighlighted(self.upfile, node.data.path, neighbours))
+
     def on_tree_node_expanded(
         self, event: textual.widgets.Tree.NodeExpanded[UprootEntry]
     ) -> None:
         event.stop()
-        item = event.node.data
-        assert item
-        if item.is_dir:
-            self.load_directory(event.node)
+        node = event.node
+        item = node.data
+        if item is None or not item.is_dir or node.id in self._loaded:
+            return
+        if can_list_now(item):
+            self.load_directory(node)
+        elif not node.children:
+            node.add_leaf(rich.text.Text("loading…", style="dim italic"))
+            self._load_directory_in_background(node)
+
+    def action_toggle_mark(self) -> None:
+        """Mark or unmark a leaf for the grid view; open/close anything else."""
+        node = self.cursor_node
+        if node is None or node.data is None:
+            return
+        if node.data.is_dir:
+            self.action_toggle_node()
+            return
+        path = node.data.path
+        if path in self.marked:
+            del self.marked[path]
+        else:
+            self.marked[path] = None
+        node.refresh()
 
     def action_cursor_in(self) -> None:
         node = self.cursor_node
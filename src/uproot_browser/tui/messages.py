@@ -6,8 +6,9 @@ import rich.repr
 import textual.message
 
 if TYPE_CHECKING:
+    from ..tree import UprootEntry
     from .error import Error
-    from .plot import Plotext
+    from .plot import Plotext, PlotGrid
 
 
 @rich.repr.auto
@@ -18,6 +19,40 @@ class UprootSelected(textual.message.Message, bubble=True):
         super().__init__()
 
 
+@rich.repr.auto
+class UprootHighlighted(textual.message.Message, bubble=True):
+    """
+    The cursor moved to ``path``; ``neighbours`` are the plottable entries
+    worth reading ahead, nearest first (not including the highlighted one).
+    """
+
+    def __init__(self, upfile: Any, path: str, neighbours: list[UprootEntry]) -> None:
+        self.upfile = upfile
+        self.path = path
+        self.neighbours = neighbours
+        super().__init__()
+
+
+@rich.repr.auto
+class FileOpened(textual.message.Message, bubble=True):
+    """The file was opened in the background, taking ``seconds``."""
+
+    def __init__(self, upfile: Any, seconds: float) -> None:
+        self.upfile = upfile
+        self.seconds = seconds
+        super().__init__()
+
+
+@rich.repr.auto
+class IndexUpdated(textual.message.Message, bubble=True):
+    """More jump targets were found (``complete`` once all of them are)."""
+
+    def __init__(self, total: int, *, complete: bool) -> None:
+        self.total = total
+        self.complete = complete
+        super().__init__()
+
+
 @rich.repr.auto
 class EmptyMessage(textual.message.Message, bubble=True):
     pass
@@ -35,3 +70,10 @@ class RequestPlot(textual.message.Message, bubble=True):
     def __init__(self, plot: Plotext) -> None:
         self.plot = plot
         super().__init__()
+
+
+@rich.repr.auto
+class RequestGrid(textual.message.Message, bubble=True):
+    def __init__(self, grid: PlotGrid) -> None:
+        self.grid = grid
+        super().__init__()
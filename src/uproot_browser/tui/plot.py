@@ -1,20 +1,30 @@
 from __future__ import annotations
 
+import contextlib
 import dataclasses
+import functools
 import sys
+import threading
 from typing import TYPE_CHECKING, Any
 
-import plotext as plt  # plots in text
+import rich.console
 import rich.text
 
-import uproot_browser.plot
-from uproot_browser.exceptions import EmptyTreeError
+from uproot_browser.exceptions import CancelledError, EmptyTreeError
+from uproot_browser.tree import resolve
 
 from .error import Error
 from .messages import EmptyMessage, ErrorMessage, RequestPlot
 
+# Most plots shown side by side in the grid view (3 x 3)
+MAX_PANES = 9
+
 if TYPE_CHECKING:
-    from collections.abc import Iterable
+    from collections.abc import Callable, Iterable
+
+    import hist
+
+    from uproot_browser.fill import Progress
 
     from .browser import Browser
 
@@ -28,18 +38,124 @@ def apply_selection(tree: Any, selection: Iterable[str]) -> Iterable[Any]:
         yield tree
 
 
-def make_plot(item: Any, theme: str, *size: int, expr: str) -> Any:
-    plt.clf()
-    plt.theme(theme)
-    plt.plotsize(*size)
-    uproot_browser.plot.plot(item, width=(size[0] - 5) * 4, expr=expr)
-    return plt.build()
+# Held while drawing on plotext's global figure (it has no public per-render one)
+_plotext_lock = threading.Lock()
+
+
+@functools.cache
+def _plotext() -> Any:
+    """
+    plotext (imported on the first plot, not at startup), with the browser's
+    background colours.
+    """
+    import plotext as plt  # plots in text
+
+    with contextlib.suppress(AttributeError):
+        light_background = 0xF5, 0xF5, 0xF5
+        # pylint: disable-next=protected-access
+        plt._dict.themes["default"][0] = light_background
+        # pylint: disable-next=protected-access
+        plt._dict.themes["default"][1] = light_background
+
+        dark_background = 0x1E, 0x1E, 0x1E
+        dark_text = 0xFF, 0xA6, 0x2B
+        # pylint: disable-next=protected-access
+        plt._dict.themes["dark"][0] = dark_background
+        # pylint: disable-next=protected-access
+        plt._dict.themes["dark"][1] = dark_background
+        # pylint: disable-next=protected-access
+        plt._dict.themes["dark"][2] = dark_text
+
+    return plt
+
+
+def make_plotext_plot(
+    item: Any,
+    theme: str,
+    *size: int,
+    expr: str,
+    histogram: hist.Hist[Any] | None = None,
+) -> rich.text.Text:
+    """
+    Draw the plot of ``item`` at ``size`` with plotext. plotext has no public
+    way to draw on a figure of one's own: every function acts on a single
+    global figure, which this clears and builds. Renders can't be isolated
+    from each other, so those in other threads wait for their turn; only the
+    rare plots that :func:`make_plot` can't draw itself come here.
+    """
+    import uproot_browser.plot
+
+    plt = _plotext()
+    with _plotext_lock:
+        plt.clf()
+        plt.theme(theme)
+        plt.plotsize(*size)
+        uproot_browser.plot.plot(
+            item, width=(size[0] - 5) * 4, expr=expr, histogram=histogram
+        )
+        canvas = plt.build()
+    return rich.text.Text.from_ansi(canvas)
+
+
+def make_plot(
+    item: Any,
+    theme: str,
+    *size: int,
+    expr: str,
+    histogram: hist.Hist[Any] | None = None,
+) -> rich.console.RenderableType:
+    """
+    Draw the plot of ``item`` at ``size`` (columns, lines). 1-D histograms are
+    drawn straight into segments, 2-D ones as heatmaps; anything else goes
+    through plotext. Plots can be drawn in several threads at once.
+    """
+    import uproot_browser.plot
+
+    width, height = size
+    if histogram is not None:
+        shown = uproot_browser.plot.shown_histogram(
+            item, histogram, width=(width - 5) * 4, height=2 * height, expr=expr
+        )
+        if getattr(shown, "ndim", None) == 2:
+            return uproot_browser.plot.heatmap(
+                item, shown, width=width, height=height, theme=theme
+            )
+        if getattr(shown, "ndim", None) == 1:
+            import uproot_browser.plot_rich
+
+            return uproot_browser.plot_rich.render_histogram(
+                shown.values(),
+                shown.axes[0].edges,
+                width=width,
+                height=height,
+                title=uproot_browser.plot.make_hist_title(item, shown),
+                xlabel=shown.axes[0].name,
+                theme=theme,
+            )
 
+    return make_plotext_plot(item, theme, *size, expr=expr, histogram=histogram)
 
-def make_dump(item: Any, *size: int, expr: str = "") -> str:
+
+def progress_text(progress: Progress) -> str:
+    """One-line summary of a read in progress."""
+    return (
+        f"Reading... {progress.entries:,} / {progress.num_entries:,} entries"
+        f" ({progress.fraction:.0%}), {progress.nbytes / 1e6:,.1f} MB"
+    )
+
+
+def make_dump(
+    item: Any,
+    *size: int,
+    expr: str = "",
+    histogram: hist.Hist[Any] | None = None,
+    cut: str = "",
+) -> str:
     """Standalone Python source rebuilding the plotted histogram as ``h``."""
+    import uproot_browser.plot
+
     width = (size[0] - 5) * 4 if size else 100
-    code = uproot_browser.plot.dump(item, width=width)
+    code = uproot_browser.plot.dump(item, width=width, histogram=histogram, cut=cut)
     if expr:
         code += f"\nh = {expr}"
     return code
@@ -54,15 +170,120 @@ class Plotext:
     app: Browser
     expr: str = ""
     size: tuple[int, int] | None = None
-    previous: rich.text.Text | None = None
+    previous: rich.console.RenderableType | None = None
     old_expr: str = ""
+    sample: float | None = None
+    # id of the widget showing the plot
+    target: str = "plot"
+    # Selection of a branch plotted against this one, on the y axis
+    versus: str = ""
+    # Entries of the TTree to plot (see uproot_browser.cut)
+    cut: str = ""
 
-    def make_plot(self) -> Plotext | None:
+    @property
+    def cache_key(self) -> tuple[str, str, str, float | None, str]:
+        return (
+            self.upfile.file_path,
+            self.selection,
+            self.versus,
+            self.sample,
+            self.cut,
+        )
+
+    @property
+    def disk_selection(self) -> str:
+        """The path of what is plotted, for the disk cache."""
+        return f"{self.selection} vs {self.versus}" if self.versus else self.selection
+
+    def item(self) -> Any:
+        """
+        The selected object, or the :class:`~uproot_browser.plot.BranchPair`
+        of the two branches plotted against each other.
+        """
         *_, item = apply_selection(self.upfile, self.selection.split(":"))
+        if not self.versus:
+            return item
+        import uproot_browser.plot
+
+        *_, other = apply_selection(self.upfile, self.versus.split(":"))
+        return uproot_browser.plot.BranchPair(resolve(item), resolve(other))
+
+    def histogram(
+        self,
+        item: Any,
+        *,
+        cancelled: Callable[[], bool] | None = None,
+        progress: Callable[[Progress], None] | None = None,
+    ) -> hist.Hist[Any]:
+        """
+        The (display-independent) histogram of ``item``, the selected object
+        (a :class:`~uproot_browser.tree.LazyObject` is only read on a cache
+        miss), from the memory or disk caches if possible. A read is abandoned between
+        chunks once ``cancelled`` returns True, and reports partial histograms
+        to ``progress``.
+        """
+        import uproot_browser.plot
+
+        return self.app.histograms.get_or_compute(
+            self.cache_key,
+            lambda: uproot_browser.plot.make_cached_histogram(
+                resolve(item),
+                self.app.disk_cache,
+                file=self.upfile.file,
+                selection=self.disk_selection,
+                cancelled=cancelled,
+                progress=progress,
+                sample=self.sample,
+                cut=self.cut,
+            ),
+        )
+
+    def make_plot(
+        self,
+        *,
+        cancelled: Callable[[], bool] | None = None,
+        update: Callable[[Plotext], None] | None = None,
+    ) -> Plotext | None:
+        """
+        Render the plot. While a long read is in progress, ``update`` is given
+        intermediate plots of the entries read so far, with a status line.
+        """
         assert self.size
+        width, height = self.size
+
+        def show_progress(progress: Progress) -> None:
+            if update is None or (cancelled is not None and cancelled()):
+                return
+            canvas = make_plot(
+                item,
+                self.theme,
+                width,
+                max(height - 1, 1),
+                expr=self.expr,
+                histogram=progress.histogram,
+            )
+            status = rich.text.Text(progress_text(progress), style="dim")
+            update(
+                dataclasses.replace(self, previous=rich.console.Group(status, canvas))
+            )
+
         try:
-            canvas = make_plot(item, self.theme, *self.size, expr=self.expr)
-            return dataclasses.replace(self, previous=rich.text.Text.from_ansi(canvas))
+            item = self.item()
+            # Only the histogram is cached; redrawing it for a new size, theme
+            # or expression doesn't touch the file. It may already be on its
+            # way from a prefetch.
+            if not self.app.prefetcher.wait(self.cache_key, cancelled=cancelled):
+                return None
+            histogram = self.histogram(
+                item, cancelled=cancelled, progress=show_progress
+            )
+            canvas = make_plot(
+                item, self.theme, *self.size, expr=self.expr, histogram=histogram
+            )
+            return dataclasses.replace(self, previous=canvas)
+        except CancelledError:
+            # Superseded by a newer selection; nothing to report
+            return None
         except EmptyTreeError:
             self.app.post_message(EmptyMessage())
             return None
@@ -92,3 +313,125 @@ class Plotext:
             self.old_expr = self.expr
             yield self.previous
             self.app.post_message(RequestPlot(self))
+
+
+@dataclasses.dataclass
+class PlotGrid:
+    """
+    Several objects plotted side by side, in the widgets ``pane-0``,
+    ``pane-1``, ... (at most :data:`MAX_PANES`). The branches of a TTree are
+    read together, in a single pass.
+    """
+
+    upfile: Any
+    selections: tuple[str, ...]
+    theme: str
+    app: Browser
+    sample: float | None = None
+    cut: str = ""
+
+    @property
+    def panes(self) -> list[Plotext]:
+        return [
+            Plotext(
+                self.upfile,
+                selection,
+                self.theme,
+                self.app,
+                sample=self.sample,
+                target=f"pane-{index}",
+                cut=self.cut,
+            )
+            for index, selection in enumerate(self.selections[:MAX_PANES])
+        ]
+
+    def _show_cached(
+        self,
+        panes: list[Plotext],
+        show: Callable[[int, rich.console.RenderableType], None],
+        cancelled: Callable[[], bool] | None = None,
+    ) -> list[int]:
+        """
+        Show the panes whose histograms are cached; the others' indices (none
+        once ``cancelled``).
+        """
+        todo = []
+        for index, plot in enumerate(panes):
+            # The branches next to the cursor may be on their way from a prefetch
+            if not self.app.prefetcher.wait(plot.cache_key, cancelled=cancelled):
+                return []
+            if plot.cache_key in self.app.histograms:
+                show(index, plot)
+            else:
+                todo.append(index)
+        return todo
+
+    def read(
+        self,
+        *,
+        show: Callable[[int, rich.console.RenderableType], None],
+        size: Callable[[int], tuple[int, int]],
+        cancelled: Callable[[], bool] | None = None,
+    ) -> None:
+        """
+        Read the histograms that are not cached yet, giving ``show`` what each
+        pane should display: partial plots (drawn at ``size``) while reading,
+        then the :class:`Plotext` of the pane as soon as its histogram is
+        ready, or a one-line message if it can't be plotted.
+        """
+        import uproot_browser.plot
+
+        panes = self.panes
+        todo = self._show_cached(panes, show, cancelled)
+        if not todo:
+            return
+
+        def show_progress(i: int, progress: Progress) -> None:
+            if cancelled is not None and cancelled():
+                return
+            width, height = size(todo[i])
+            canvas = make_plot(
+                items[i],
+                self.theme,
+                width,
+                max(height - 1, 1),
+                expr="",
+                histogram=progress.histogram,
+            )
+            status = rich.text.Text(progress_text(progress), style="dim")
+            show(todo[i], rich.console.Group(status, canvas))
+
+        def show_done(i: int, result: hist.Hist[Any] | Exception) -> None:
+            plot = panes[todo[i]]
+            if isinstance(result, EmptyTreeError):
+                show(todo[i], rich.text.Text(f"{plot.selection}: empty", style="dim"))
+            elif isinstance(result, Exception):
+                message = f"{plot.selection}: {type(result).__name__}: {result}"
+                show(todo[i], rich.text.Text(message, style="red"))
+            else:
+                self.app.histograms.put(plot.cache_key, result)
+                show(todo[i], plot)
+
+        try:
+            items = [
+                list(apply_selection(self.upfile, panes[i].selection.split(":")))[-1]
+                for i in todo
+            ]
+            uproot_browser.plot.make_histograms(
+                [resolve(item) for item in items],
+                self.app.disk_cache,
+                file=self.upfile.file,
+                selections=[panes[index].selection for index in todo],
+                done=show_done,
+                cancelled=cancelled,
+                progress=show_progress,
+                sample=self.sample,
+                cut=self.cut,
+            )
+        except CancelledError:
+            # Superseded by another grid; nothing to report
+            return
+        except Exception:  # noqa: BLE001
+            exc = sys.exc_info()
+            assert exc[1]
+            self.app.post_message(ErrorMessage(Error(exc)))
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import concurrent.futures
+import contextlib
+import threading
+from typing import TYPE_CHECKING, Any
+
+from ..fill import memory_size
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable, Mapping
+
+DEFAULT_PREFETCH_SIZE = "200 MB"
+
+# Seconds between checks for cancellation while waiting for a job
+WAIT_INTERVAL = 0.05
+
+
+class Prefetcher:
+    """
+    Runs speculative jobs (reading the histograms the user is likely to select
+    next) on a small thread pool. Each call to :meth:`schedule` replaces the
+    previous wish list: jobs that are no longer wanted are cancelled (running
+    ones at their next check), and the estimated bytes read by queued and
+    running jobs are kept under ``max_size``.
+    """
+
+    def __init__(
+        self, *, max_workers: int = 2, max_size: int | str = DEFAULT_PREFETCH_SIZE
+    ) -> None:
+        self.max_size = max_size if isinstance(max_size, int) else memory_size(max_size)
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="uproot-browser-prefetch"
+        )
+        self._jobs: dict[
+            Hashable,
+            tuple[int, concurrent.futures.Future[Any], threading.Event],
+        ] = {}
+        # Reentrant: done callbacks can run immediately, with the lock held
+        self._lock = threading.RLock()
+
+    def schedule(self, jobs: Mapping[Hashable, tuple[int, Callable[..., Any]]]) -> None:
+        """
+        Replace the wanted jobs. ``jobs`` maps a key to the estimated number of
+        bytes the job reads and the function to run, in order of preference.
+        The function is called with a ``cancelled`` keyword argument, a
+        callable that returns True once the job is no longer wanted.
+        """
+        with self._lock:
+            for key, (_, future, cancelled) in list(self._jobs.items()):
+                if key not in jobs:
+                    cancelled.set()
+                    if future.cancel():
+                        self._jobs.pop(key, None)
+
+            in_flight = sum(nbytes for nbytes, *_ in self._jobs.values())
+            for key, (nbytes, func) in jobs.items():
+                if key in self._jobs and not self._jobs[key][2].is_set():
+                    continue
+                if in_flight + nbytes > self.max_size:
+                    continue
+                in_flight += nbytes
+                cancelled = threading.Event()
+                future = self._executor.submit(self._run, func, cancelled)
+                self._jobs[key] = (nbytes, future, cancelled)
+                future.add_done_callback(
+                    lambda f, key=key: self._forget(key, f)  # type: ignore[misc]
+                )
+
+    @staticmethod
+    def _run(func: Callable[..., Any], cancelled: threading.Event) -> None:
+        # Failures are reported when (and if) the user selects the item
+        with contextlib.suppress(Exception):
+            func(cancelled=cancelled.is_set)
+
+    def _forget(self, key: Hashable, future: concurrent.futures.Future[Any]) -> None:
+        with self._lock:
+            if key in self._jobs and self._jobs[key][1] is future:
+                del self._jobs[key]
+
+    def wait(
+        self, key: Hashable, *, cancelled: Callable[[], bool] | None = None
+    ) -> bool:
+        """
+        Called before doing a job for real: a queued copy is cancelled, and a
+        running one is waited for, so its result can be reused. Returns False
+        if ``cancelled`` returned True before the running job was done.
+        """
+        with self._lock:
+            job = self._jobs.get(key)
+        if job is None or job[2].is_set() or job[1].cancel():
+            return True
+        while concurrent.futures.wait([job[1]], timeout=WAIT_INTERVAL).not_done:
+            if cancelled is not None and cancelled():
+                return False
+        return True
+
+    def shutdown(self) -> None:
+        with self._lock:
+            for _, _, cancelled in self._jobs.values():
+                cancelled.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 import importlib.metadata
+from typing import Any
 
 import textual.app
 import textual.containers
 import textual.widgets
+import textual.worker
 
 from .. import __version__
 
@@ -16,12 +18,13 @@ class Tools(textual.containers.Container):
             yield textual.widgets.Select(
                 [(t, t) for t in themes], allow_blank=False, value=self.app.theme
             )
-        with (
-            textual.widgets.Collapsible(title="Plot", collapsed=False),
-            textual.containers.Horizontal(),
-        ):
-            yield textual.widgets.Label("Entry box")
-            yield textual.widgets.Switch()
+        with textual.widgets.Collapsible(title="Plot", collapsed=False):
+            with textual.containers.Horizontal():
+                yield textual.widgets.Label("Entry box")
+                yield textual.widgets.Switch(id="entry-box-switch")
+            with textual.containers.Horizontal():
+                yield textual.widgets.Label("Sampled preview")
+                yield textual.widgets.Switch(id="preview-switch")
 
     def on_mount(self) -> None:
         # Keep the Select in sync with the app theme. init=True syncs the value
@@ -32,20 +35,70 @@ class Tools(textual.containers.Container):
     def _sync_theme(self, theme: str) -> None:
         self.query_one(textual.widgets.Select).value = theme
 
-    @textual.on(textual.widgets.Switch.Changed)
+    @textual.on(textual.widgets.Switch.Changed, "#entry-box-switch")
     def switch_changed(self, event: textual.widgets.Switch.Changed) -> None:
         self.app.query_one("#plot-input-container").set_class(
             event.value, "-show-container"
         )
 
+    @textual.on(textual.widgets.Switch.Changed, "#preview-switch")
+    def preview_changed(self, event: textual.widgets.Switch.Changed) -> None:
+        # pylint: disable-next=attribute-defined-outside-init
+        self.app.preview = event.value  # type: ignore[attr-defined]
+
     @textual.on(textual.widgets.Select.Changed)
     def select_changed(self, event: textual.widgets.Select.Changed) -> None:
         # pylint: disable-next=attribute-defined-outside-init
         self.app.theme = str(event.value)
 
 
+class Storage(textual.widgets.Static):
+    """
+    Storage used by each branch of the tree under the cursor, heaviest first,
+    from the branch headers (nothing is decompressed).
+    """
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__("Move to a TTree or branch to see its storage.", **kwargs)
+        self.shown: str | None = None
+
+    def on_mount(self) -> None:
+        self.watch(self.app, "highlighted", self._highlighted)
+
+    def _highlighted(self, highlighted: tuple[Any, str] | None) -> None:
+        if highlighted is not None:
+            self.show_storage(*highlighted)
+
+    @textual.work(exclusive=True, thread=True, group="storage")
+    def show_storage(self, upfile: Any, path: str) -> None:
+        from ..size import measure, size_table
+        from ..tree import UprootEntry
+
+        # Find the tree from the TKeys, without reading other objects. Those
+        # keep the last tree on show.
+        parts = path.strip("/").split("/")
+        for i in range(1, len(parts) + 1):
+            tree_path = "/".join(parts[:i])
+            classname = upfile.classname_of(tree_path)
+            if classname == "TTree":
+                break
+            if classname != "TDirectory":
+                return
+        else:
+            return
+        if tree_path == self.shown:
+            return
+        tree = upfile[tree_path]
+        size = measure(UprootEntry(f"/{tree_path}", tree), tree.name)
+        if size is not None and not textual.worker.get_current_worker().is_cancelled:
+            self.shown = tree_path
+            self.app.call_from_thread(self.update, size_table(size))
+
+
 class Info(textual.containers.Container):
     def compose(self) -> textual.app.ComposeResult:
+        with textual.widgets.Collapsible(title="Storage", collapsed=False):
+            yield Storage(id="storage")
         with textual.widgets.Collapsible(title="uproot-browser", collapsed=False):
             yield textual.widgets.Static(f"Version: [green]{__version__}[/green]")
         with textual.widgets.Collapsible(title="Packages", collapsed=False):
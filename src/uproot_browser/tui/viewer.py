@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import dataclasses
+import math
 from typing import Any
 
+import rich.text
 import textual.app
 import textual.containers
 import textual.reactive
@@ -10,12 +12,14 @@ import textual.widgets
 
 from .error import Error
 from .logo import LOGO_PANEL
-from .plot import Plotext
+from .messages import RequestGrid
+from .plot import MAX_PANES, Plotext, PlotGrid
 
 
 class PlotButton(textual.widgets.Button):
     def on_button_pressed(self) -> None:
         self.app.query_one("#plot-input", PlotInput).apply_expression()
+        self.app.query_one("#cut-input", CutInput).apply_cut()
 
 
 class PlotInput(textual.widgets.Input):
@@ -35,8 +39,25 @@ class PlotInput(textual.widgets.Input):
             self.set_class(False, "-needs-update")  # noqa: FBT003
 
 
+class CutInput(textual.widgets.Input):
+    def watch_value(self, value: str) -> None:
+        applied = self.app.cut  # type: ignore[attr-defined]
+        self.set_class(value.strip() != applied, "-needs-update")
+
+    def on_input_submitted(self) -> None:
+        self.apply_cut()
+
+    def apply_cut(self) -> None:
+        # assigning cut triggers watch_cut, which replots what is shown
+        # pylint: disable-next=attribute-defined-outside-init
+        self.app.cut = self.value.strip()  # type: ignore[attr-defined]
+        self.set_class(False, "-needs-update")  # noqa: FBT003
+
+
 class ViewWidget(textual.widgets.ContentSwitcher):
-    item: textual.reactive.var[Error | Plotext | None] = textual.reactive.var(None)
+    item: textual.reactive.var[Error | Plotext | PlotGrid | None] = (
+        textual.reactive.var(None)
+    )
 
     def __init__(self, **kargs: Any):
         self.error_widget = textual.widgets.Static("", id="error")
@@ -46,9 +67,18 @@ class ViewWidget(textual.widgets.ContentSwitcher):
             placeholder="h[:]",
             tooltip="The histogram is 'h', you can slice it. Experimental.",
         )
+        self.cut_input = CutInput(
+            id="cut-input",
+            placeholder="nJet > 2 & abs(eta) < 2.4",
+            tooltip=(
+                "Cut on the entries of the TTree: Python syntax over its"
+                " branches, with & | ~ for and, or, not."
+            ),
+        )
         self.plot_window = textual.containers.Container(
             textual.containers.Container(
                 PlotButton("Plot", id="plot-button"),
+                self.cut_input,
                 self.plot_input,
                 id="plot-input-container",
             ),
@@ -56,20 +86,40 @@ class ViewWidget(textual.widgets.ContentSwitcher):
             id="plot-window",
         )
 
+        self.panes = [
+            textual.widgets.Static("", id=f"pane-{index}", classes="pane")
+            for index in range(MAX_PANES)
+        ]
+        self.grid_window = textual.containers.Grid(*self.panes, id="grid-window")
+
         super().__init__(
             textual.widgets.Static(LOGO_PANEL, id="logo"),
             textual.containers.VerticalScroll(self.error_widget, id="error-scroll"),
             self.plot_window,
+            self.grid_window,
             initial="logo",
             **kargs,
         )
 
-    def watch_item(self, value: Plotext | Error | None) -> None:
+    def watch_item(self, value: Plotext | PlotGrid | Error | None) -> None:
         if isinstance(value, Plotext):
             self.plot_widget.update(value)
             self.current = "plot-window"
+        elif isinstance(value, PlotGrid):
+            self.show_grid(len(value.panes))
+            self.post_message(RequestGrid(value))
         elif isinstance(value, Error):
             self.error_widget.update(value)
             self.current = "error-scroll"
         else:
             self.current = "logo"
+
+    def show_grid(self, count: int) -> None:
+        """Lay out ``count`` empty panes: one, 2 x 2, or 3 x 3."""
+        columns = 1 if count == 1 else 2 if count <= 4 else 3
+        self.grid_window.styles.grid_size_columns = columns
+        self.grid_window.styles.grid_size_rows = math.ceil(count / columns)
+        for index, pane in enumerate(self.panes):
+            pane.display = index < count
+            pane.update(rich.text.Text("... reading ...", style="dim"))
+        self.current = "grid-window"
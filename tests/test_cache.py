@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING
+
+import hist
+import numpy as np
+import uproot
+from skhep_testdata import data_path
+
+from uproot_browser.cache import (
+    DiskCache,
+    HistogramCache,
+    histogram_nbytes,
+    load_histogram,
+    save_histogram,
+)
+from uproot_browser.fill import Sampled
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def make(bins: int) -> hist.Hist:
+    return hist.Hist(hist.axis.Regular(bins, 0, 1), storage=hist.storage.Int64())
+
+
+def test_lru_eviction_by_size() -> None:
+    nbytes = histogram_nbytes(make(98))
+    cache = HistogramCache(max_size=2 * nbytes)
+    cache.put("a", make(98))
+    cache.put("b", make(98))
+    assert cache.get("a") is not None  # "b" is now least recently used
+    cache.put("c", make(98))
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+    assert cache.size == 2 * nbytes
+
+
+def test_oversized_not_stored() -> None:
+    cache = HistogramCache(max_size=10)
+    cache.put("a", make(98))
+    assert len(cache) == 0
+    assert cache.size == 0
+
+
+def test_get_or_compute_once() -> None:
+    cache = HistogramCache()
+    calls = []
+
+    def compute() -> hist.Hist:
+        calls.append(1)
+        return make(10)
+
+    first = cache.get_or_compute(("file.root", "T/x"), compute)
+    second = cache.get_or_compute(("file.root", "T/x"), compute)
+    assert first is second
+    assert len(calls) == 1
+
+
+def test_save_load_roundtrip(tmp_path: Path) -> None:
+    histogram = hist.Hist(
+        hist.axis.Regular(10, 0, 1, name="x", underflow=False),
+        hist.axis.Variable([0, 1, 3], name="y"),
+        storage=hist.storage.Weight(),
+    )
+    histogram.fill([0.5, 0.2, 7], [0.5, 2, 2])
+    assert save_histogram(tmp_path / "h.npz", histogram)
+    assert load_histogram(tmp_path / "h.npz") == histogram
+
+
+def test_save_unsupported(tmp_path: Path) -> None:
+    histogram = hist.Hist(hist.axis.StrCategory(["a"]))
+    assert not save_histogram(tmp_path / "h.npz", histogram)
+    assert not list(tmp_path.iterdir())
+
+
+def test_disk_cache_eviction(tmp_path: Path) -> None:
+    cache = DiskCache(tmp_path, max_size=1)
+    cache.put("a", make(10))
+    assert cache.get("a") is None  # larger than the whole cache
+    cache = DiskCache(tmp_path, max_size="1 MB")
+    cache.put("b", make(10))
+    assert cache.get("b") == make(10)
+
+
+def test_disk_cache_evicts_once_estimate_is_over(tmp_path: Path) -> None:
+    save_histogram(tmp_path / "probe.npz", make(10))
+    size = (tmp_path / "probe.npz").stat().st_size
+    (tmp_path / "probe.npz").unlink()
+
+    cache = DiskCache(tmp_path, max_size=size * 5 // 2)
+    for i, key in enumerate("abc"):
+        cache.put(key, make(10))
+        os.utime(tmp_path / f"{key}.npz", ns=(i, i))
+    assert sorted(path.stem for path in tmp_path.glob("*.npz")) == ["b", "c"]
+
+
+def test_disk_cache_key(tmp_path: Path) -> None:
+    with uproot.open(data_path("uproot-Event.root")) as upfile:
+        cache = DiskCache(tmp_path)
+        key = cache.key(upfile.file, "hstat", 100)
+        assert key is not None
+        assert key == cache.key(upfile.file, "hstat", 100)
+        assert key != cache.key(upfile.file, "htime", 100)
+        assert cache.get_or_compute(key, lambda: make(10)) == make(10)
+        assert cache.get(key) == make(10)
+
+
+def test_save_load_keeps_sampled(tmp_path: Path) -> None:
+    h = hist.Hist.new.Reg(10, 0, 1).Double()
+    h.fill(np.linspace(0, 1, 20))
+    h.metadata = Sampled(1, 10, 100, 1000)
+    path = tmp_path / "h.npz"
+    assert save_histogram(path, h)
+    assert load_histogram(path).metadata == Sampled(1, 10, 100, 1000)
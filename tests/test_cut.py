@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import awkward as ak
+import numpy as np
+import pytest
+
+from uproot_browser.cut import Cut, select
+
+
+def test_operators_bind_like_python_words() -> None:
+    cut = Cut.parse("nJet > 2 & abs(eta) < 2.4 | ~flag")
+    assert cut.names == {"eta": "eta", "flag": "flag", "nJet": "nJet"}
+    assert cut.source == "(nJet > 2) & (abs(eta) < 2.4) | ~flag"
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["n > 1 && n < 4", "n > 1 and n < 4", "1 < n < 4", "!(n <= 1) & ~(n >= 4)"],
+)
+def test_spellings_agree(text: str) -> None:
+    n = np.arange(6)
+    assert Cut.parse(text).evaluate({"n": n}).tolist() == [
+        False,
+        False,
+        True,
+        True,
+        False,
+        False,
+    ]
+
+
+def test_logic_on_numbers_is_not_bitwise() -> None:
+    arrays = {"nJet": np.array([2, 0, 1]), "x": np.array([2.0, 2.0, 0.0])}
+    assert Cut.parse("nJet && x > 1").evaluate(arrays).tolist() == [
+        True,
+        False,
+        False,
+    ]
+    assert Cut.parse("!nJet || x").evaluate(arrays).tolist() == [True, True, False]
+    jagged = {"pt": ak.Array([[2.0, 0.0], []]), "nJet": np.array([2, 0])}
+    assert Cut.parse("pt and nJet").evaluate(jagged).tolist() == [[True, False], []]
+
+
+def test_bitwise_on_numbers() -> None:
+    flags = np.array([4, 5, 3, 12, 0])
+    expected = [True, True, False, True, False]
+    for text in ["(flags & 4) != 0", "(flags & 4) && flags < 10 | flags > 10"]:
+        assert Cut.parse(text).evaluate({"flags": flags}).tolist() == expected
+    assert Cut.parse("flags | 2").evaluate({"flags": flags}).tolist() == [
+        6,
+        7,
+        3,
+        14,
+        2,
+    ]
+
+
+def test_operators_in_strings_are_kept() -> None:
+    cut = Cut.parse("name != 'a && !b | c' & `x&y` > 0")
+    assert cut.names == {"_branch_0": "x&y", "name": "name"}
+    assert cut.source == "(name != 'a && !b | c') & (_branch_0 > 0)"
+
+
+def test_quoted_names() -> None:
+    cut = Cut.parse("`fTracks.fPx` > 0 & n != 1")
+    assert cut.names == {"_branch_0": "fTracks.fPx", "n": "n"}
+    mask = cut.evaluate({"_branch_0": np.array([1, -1, 1]), "n": np.array([0, 0, 1])})
+    assert mask.tolist() == [True, False, False]
+
+
+@pytest.mark.parametrize(
+    ("text", "match"),
+    [
+        ("n >", "not a valid expression"),
+        ("n.__class__", "attributes"),
+        ("open(n)", "unknown function"),
+        ("[x for x in n]", "can't use"),
+    ],
+)
+def test_rejected(text: str, match: str) -> None:
+    with pytest.raises(ValueError, match=match):
+        Cut.parse(text)
+
+
+def test_select_broadcasts_like_tree_draw() -> None:
+    n = np.array([1.0, 2.0, 3.0])
+    pt = ak.Array([[10.0, 40.0], [], [50.0]])
+
+    # A per-entry cut keeps whole entries of a jagged branch
+    (kept,) = select(n != 2, pt)
+    assert kept.tolist() == [[10.0, 40.0], [], [50.0]]
+    (kept,) = select(n > 1, pt)
+    assert kept.tolist() == [[], [], [50.0]]
+
+    # A per-value cut repeats a per-entry branch for each value that passes
+    (kept,) = select(pt > 30, n)
+    assert kept.tolist() == [[1.0], [], [3.0]]
+
+    with pytest.raises(ValueError, match="different numbers"):
+        select(np.array([True, False]), n)
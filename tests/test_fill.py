@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import awkward as ak
+import numpy as np
+import pytest
+import uproot
+from skhep_testdata import data_path
+
+import uproot_browser.fill
+from uproot_browser.exceptions import CancelledError, EmptyTreeError
+from uproot_browser.fill import (
+    Progress,
+    RangeEstimator,
+    chunk_boundaries,
+    fill_branch,
+    fill_branches,
+    fill_pair,
+    get_sampled,
+    memory_size,
+    sample_boundaries,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    import hist
+
+
+@pytest.mark.parametrize(
+    ("size", "expected"),
+    [("100", 100), ("1 kB", 1000), ("2MiB", 2 * 1024**2), ("1.5 GB", 1_500_000_000)],
+)
+def test_memory_size(size: str, expected: int) -> None:
+    assert memory_size(size) == expected
+
+
+def test_memory_size_invalid() -> None:
+    with pytest.raises(ValueError, match="memory size"):
+        memory_size("lots")
+
+
+@pytest.mark.parametrize("buffer_size", ["100 MB", 1])
+@pytest.mark.parametrize("branch", ["fNtrack", "fTracks.fPx"])
+def test_chunked_matches_full_read(branch: str, buffer_size: int | str) -> None:
+    tree = uproot.open(data_path("uproot-Event.root"))["T/event"][branch]
+    boundaries = chunk_boundaries(tree, step_size=100)
+    assert boundaries[0][0] == 0
+    assert boundaries[-1][1] == tree.num_entries
+    assert all(stop in tree.entry_offsets for _, stop in boundaries)
+
+    array = tree.array()
+    values = np.asarray(ak.flatten(array) if array.ndim > 1 else array)
+
+    histogram = fill_branch(tree, bins=40, step_size=100, buffer_size=buffer_size)
+    assert histogram.values(flow=True).sum() == len(values)
+
+
+def test_range_estimator_exact_when_small() -> None:
+    estimator = RangeEstimator(size=1000)
+    for chunk in np.array_split(np.arange(500.0), 7):
+        estimator.update(chunk)
+    assert estimator.count == 500
+    assert estimator.quantile(0.5) == np.quantile(np.arange(500.0), 0.5)
+    assert estimator.robust_range() == (0.0, 499.0)
+
+
+def test_range_estimator_ignores_outliers() -> None:
+    rng = np.random.default_rng(0)
+    estimator = RangeEstimator(size=4096)
+    for _ in range(20):
+        chunk = rng.normal(size=10_000)
+        chunk[0] = 1e9
+        estimator.update(chunk)
+    assert estimator.high == 1e9
+    low, high = estimator.robust_range()
+    assert -6 < low < -2
+    assert 2 < high < 6
+
+
+def test_fill_cancelled_between_chunks() -> None:
+    tree = uproot.open(data_path("uproot-Event.root"))["T/event"]["fNtrack"]
+    checks: list[int] = []
+
+    def cancelled() -> bool:
+        checks.append(1)
+        return len(checks) > 2
+
+    with pytest.raises(CancelledError):
+        fill_branch(tree, bins=40, step_size=100, cancelled=cancelled)
+    assert len(checks) == 3
+
+
+def test_fill_reports_progress(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(uproot_browser.fill, "PROGRESS_INTERVAL", 0)
+    tree = uproot.open(data_path("uproot-Event.root"))["T/event"]["fNtrack"]
+    reports: list[Progress] = []
+
+    histogram = fill_branch(tree, bins=40, step_size=100, progress=reports.append)
+
+    assert reports
+    entries = [p.entries for p in reports]
+    assert entries == sorted(entries)
+    assert entries[-1] < tree.num_entries
+    assert all(p.num_entries == tree.num_entries for p in reports)
+    assert reports[-1].histogram.sum(flow=True) == entries[-1]
+    assert histogram.sum(flow=True) == tree.num_entries
+
+
+@pytest.mark.parametrize("fraction", [0.0, 0.1, 0.5, 1.0])
+def test_sample_boundaries_are_spread(fraction: float) -> None:
+    tree = uproot.open(data_path("uproot-Event.root"))["T/event"]["fNtrack"]
+    baskets = len(tree.entry_offsets) - 1
+    boundaries = sample_boundaries(tree, fraction)
+    assert 1 <= len(boundaries) <= baskets
+    assert len(set(boundaries)) == len(boundaries)
+    assert all(
+        start in tree.entry_offsets and stop in tree.entry_offsets
+        for start, stop in boundaries
+    )
+    if fraction == 1.0:
+        assert len(boundaries) == baskets
+
+
+def test_fill_sampled_is_scaled() -> None:
+    tree = uproot.open(data_path("uproot-Event.root"))["T/event"]["fNtrack"]
+    histogram = fill_branch(tree, bins=40, sample=0.1)
+    sampled = get_sampled(histogram)
+    assert sampled is not None
+    assert sampled.num_entries == tree.num_entries
+    assert sampled.entries < tree.num_entries
+    assert histogram.sum(flow=True) == pytest.approx(tree.num_entries)
+
+
+def _many_branches(path: Path) -> Any:
+    rng = np.random.default_rng(7)
+    branches = {
+        "flat": rng.normal(size=5000),
+        "wide": rng.exponential(3, size=5000),
+        "count": rng.poisson(4, size=5000).astype(np.int32),
+        "empty": np.full(5000, np.nan),
+    }
+    with uproot.recreate(path) as upfile:
+        upfile.mktree("T", {name: array.dtype for name, array in branches.items()})
+        for chunk in range(5):
+            upfile["T"].extend(
+                {name: array[chunk::5] for name, array in branches.items()}
+            )
+    return uproot.open(path)["T"]
+
+
+def test_fill_branches_matches_fill_branch(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(uproot_browser.fill, "PROGRESS_INTERVAL", 0)
+    tree = _many_branches(tmp_path / "many.root")
+    branches = [tree[name] for name in ["flat", "wide", "count", "empty"]]
+    arrays = tree.arrays
+    reads: list[int] = []
+
+    def counted_arrays(*args: Any, **kwargs: Any) -> Any:
+        reads.append(kwargs["entry_start"])
+        return arrays(*args, **kwargs)
+
+    monkeypatch.setattr(tree, "arrays", counted_arrays)
+    reports: list[tuple[int, Progress]] = []
+    finished: dict[int, hist.Hist[Any] | None] = {}
+
+    histograms = fill_branches(
+        tree,
+        branches,
+        bins=40,
+        step_size=1000,
+        progress=lambda i, p: reports.append((i, p)),
+        done=finished.__setitem__,
+    )
+
+    # One read per chunk of all the branches, on their common basket boundaries
+    assert reads == [0, 1000, 2000, 3000, 4000]
+    assert histograms[3] is None
+    assert finished == dict(enumerate(histograms))
+    for branch, histogram in zip(branches[:3], histograms[:3], strict=True):
+        single = fill_branch(branch, bins=40, step_size=1000)
+        assert histogram is not None
+        assert histogram.axes == single.axes
+        assert np.array_equal(histogram.view(flow=True), single.view(flow=True))
+    assert {i for i, _ in reports} == {0, 1, 2}
+    assert all(p.entries < p.num_entries == 5000 for _, p in reports)
+
+
+def test_fill_branches_needs_unique_names(tmp_path: Path) -> None:
+    tree = _many_branches(tmp_path / "many.root")
+    with pytest.raises(ValueError, match="unique"):
+        fill_branches(tree, [tree["flat"], tree["flat"]], bins=10)
+
+
+def test_fill_pair_matches_histogram2d(tmp_path: Path) -> None:
+    tree = _many_branches(tmp_path / "many.root")
+    # A small buffer, so most chunks are filled after the range is fixed
+    histogram = fill_pair(
+        tree["flat"], tree["count"], bins=20, step_size=1000, buffer_size=1000
+    )
+
+    xaxis, yaxis = histogram.axes
+    assert (xaxis.label, yaxis.label) == ("flat", "count")
+    x = tree["flat"].array(library="np")
+    y = tree["count"].array(library="np")
+    expected, _, _ = np.histogram2d(x, y, bins=[xaxis.edges, yaxis.edges])
+    assert np.array_equal(histogram.values(), expected)
+    assert histogram.sum(flow=True) == 5000
+
+
+def test_fill_pair_repeats_per_entry_values(tmp_path: Path) -> None:
+    with uproot.recreate(tmp_path / "jagged.root") as upfile:
+        upfile.mktree("T", {"n": np.float64, "pt": "var * float64"})
+        upfile["T"].extend(
+            {
+                "n": np.array([1.0, 2.0, 3.0]),
+                "pt": ak.Array([[10.0, 20.0], [], [30.0, np.nan, 40.0]]),
+            }
+        )
+    tree = uproot.open(tmp_path / "jagged.root")["T"]
+
+    histogram = fill_pair(tree["n"], tree["pt"], bins=3)
+
+    # (1, 10), (1, 20), (3, 30) and (3, 40); the pair with a NaN is left out
+    assert histogram.sum(flow=True) == 4
+    assert histogram.values().sum(axis=1).tolist() == [2, 0, 2]
+
+
+def test_fill_pair_empty(tmp_path: Path) -> None:
+    tree = _many_branches(tmp_path / "many.root")
+    with pytest.raises(EmptyTreeError, match="no finite pairs"):
+        fill_pair(tree["flat"], tree["empty"], bins=10)
+
+
+def test_fill_branch_with_cut(tmp_path: Path) -> None:
+    rng = np.random.default_rng(5)
+    n = rng.integers(0, 4, size=5000)
+    pt = ak.unflatten(rng.exponential(20, size=n.sum()), n)
+    x = rng.normal(size=5000)
+    with uproot.recreate(tmp_path / "cut.root") as upfile:
+        upfile.mktree("T", {"x": np.float64, "n": np.int64, "pt": "var * float64"})
+        upfile["T"].extend({"x": x, "n": n, "pt": pt})
+    tree = uproot.open(tmp_path / "cut.root")["T"]
+
+    histogram = fill_branch(tree["x"], bins=40, step_size=1000, cut="n > 1")
+    assert histogram.sum(flow=True) == (n > 1).sum()
+
+    # Each x is counted once per value of pt that passes
+    histogram = fill_branch(tree["x"], bins=40, step_size=1000, cut="pt > 20")
+    assert histogram.sum(flow=True) == ak.sum(pt > 20)
+
+    histogram = fill_branch(tree["pt"], bins=40, step_size=1000, cut="x < 0")
+    assert histogram.sum(flow=True) == ak.sum(n[x < 0])
+
+    with pytest.raises(ValueError, match="no branch 'eta'"):
+        fill_branch(tree["x"], bins=40, cut="eta < 1")
+    with pytest.raises(EmptyTreeError, match="pass the cut"):
+        fill_branch(tree["x"], bins=40, cut="n > 5")
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import random
+import re
+
+import pytest
+
+from uproot_browser.tui.jump import Candidate, SearchIndex
+
+
+def candidate(name: str) -> Candidate:
+    return Candidate(path=f"//T/{name}", name=name, icon="", is_dir=False)
+
+
+def is_match(query: str, name: str) -> bool:
+    pattern = ".*".join(re.escape(c) for c in query.lower())
+    return re.search(pattern, name.lower()) is not None
+
+
+def make_names(n: int) -> list[str]:
+    rng = random.Random(1)
+    letters = "abcdeEfT_.0é"
+    names = ["".join(rng.choices(letters, k=rng.randint(1, 12))) for _ in range(n)]
+    return list(dict.fromkeys([*names, "a" * 70 + "bc", "Ab" + "c" * 70]))
+
+
+@pytest.mark.parametrize("query", ["a", "ab", "abc", "e_0", "ee", "é", "T.", "zz"])
+def test_search_finds_all_matches(query: str) -> None:
+    names = make_names(2000)
+    index = SearchIndex()
+    index.add([candidate(n) for n in names])
+
+    expected = {n for n in names if is_match(query, n)}
+    best, count = index.search(query, limit=len(names))
+    assert count == len(expected)
+    assert {c.name for c in best} == expected
+
+
+def test_search_extends_previous_query() -> None:
+    names = make_names(2000)
+    index = SearchIndex()
+    index.add([candidate(n) for n in names[:1000]])
+    index.search("a")
+    # Candidates added after a search are found when the query is extended
+    index.add([candidate(n) for n in names[1000:]])
+
+    best, count = index.search("ab", limit=len(names))
+    expected = {n for n in names if is_match("ab", n)}
+    assert count == len(expected)
+    assert {c.name for c in best} == expected
+
+
+def test_search_ranking_and_limit() -> None:
+    index = SearchIndex()
+    index.add([candidate(n) for n in ["xa_b_c", "xabc", "abcdef", "abc", "zzz"]])
+
+    best, count = index.search("ABC", limit=3)
+    assert count == 4
+    # Prefix (shortest first), then substring, then spread-out matches
+    assert [c.name for c in best] == ["abc", "abcdef", "xabc"]
+
+    best, count = index.search("", limit=2)
+    assert count == 5
+    assert [c.name for c in best] == ["xa_b_c", "xabc"]
+
+
+def test_search_empty_index() -> None:
+    assert SearchIndex().search("a") == ([], 0)
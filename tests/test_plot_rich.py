@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import concurrent.futures
+import io
+from typing import TYPE_CHECKING, Any
+
+import hist
+import numpy as np
+import pytest
+import rich.console
+import rich.segment
+import uproot
+from rich.cells import cell_len
+from rich.style import Style
+
+import uproot_browser.plot
+import uproot_browser.tui.plot
+from uproot_browser.plot_rich import (
+    PALETTE,
+    THEMES,
+    column_values,
+    heatmap_lines,
+    histogram_lines,
+    render_histogram,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+
+def test_column_values_keeps_narrow_peaks() -> None:
+    values = np.zeros(1000)
+    values[123] = 5.0
+    heights = column_values(values, np.linspace(0, 1, 1001), 10)
+    assert heights.tolist() == [0, 5, 0, 0, 0, 0, 0, 0, 0, 0]
+
+
+def test_column_values_samples_wide_bins() -> None:
+    heights = column_values([1.0, np.nan, -3.0, 4.0], [0, 1, 2, 3, 4], 8)
+    assert heights.tolist() == [1, 1, 0, 0, 0, 0, 4, 4]
+
+
+@pytest.mark.parametrize("mode", ["braille", "block"])
+@pytest.mark.parametrize(("width", "height"), [(80, 24), (33, 7), (400, 120)])
+def test_lines_fill_the_size(width: int, height: int, mode: str) -> None:
+    values, edges = np.histogram(np.random.default_rng(1).normal(size=1000), 2520)
+    lines = histogram_lines(
+        values,
+        edges,
+        width=width,
+        height=height,
+        title="x -- Entries: 1000",
+        xlabel="x",
+        mode=mode,  # type: ignore[arg-type]
+    )
+    assert len(lines) == height
+    assert all(sum(cell_len(s.text) for s in line) == width for line in lines)
+    assert lines[0][0].style == THEMES["default"].title
+
+
+def test_braille_bars() -> None:
+    lines = histogram_lines([4, 2], [0, 1, 2], width=6, height=4)
+    # Three columns of two dots each: the first bin is full height, the
+    # second half height
+    assert [segment.text for segment in lines[0]] == ["4┤", "⣿⡇ ", " "]
+    assert [segment.text for segment in lines[1]] == ["0┤", "⣿⣿⣿", " "]
+    assert all(type(segment.text) is str for segment in lines[0])
+
+
+def test_block_bars() -> None:
+    lines = histogram_lines([8, 3], [0, 1, 2], width=5, height=3, mode="block")
+    assert lines[0][1].text == "█▃"
+
+
+def test_render_histogram_prints() -> None:
+    console = rich.console.Console(width=40, record=True, color_system=None)
+    console.print(
+        render_histogram([1, 3, 2], [0, 1, 2, 3], width=40, height=8, title="hi")
+    )
+    text = console.export_text()
+    assert text.splitlines()[0].strip() == "hi"
+    assert len(text.splitlines()) == 8
+
+
+def test_tui_plot_uses_segments() -> None:
+    histogram: hist.Hist[Any] = hist.Hist(hist.axis.Regular(10, 0, 1, name="x"))
+    histogram.fill(np.linspace(0, 0.99, 100))
+
+    class Item:
+        name = "x"
+
+    plot = uproot_browser.tui.plot.make_plot(
+        Item(), "dark", 60, 20, expr="h[::2j]", histogram=histogram
+    )
+    assert isinstance(plot, rich.segment.Segments)
+    lines = list(rich.segment.Segment.split_lines(plot.segments))
+    assert "x -- Entries: 100" in lines[0][0].text
+    assert lines[0][0].style == THEMES["dark"].title
+
+
+@pytest.mark.parametrize(("width", "height"), [(80, 24), (33, 7), (400, 120)])
+def test_heatmap_fills_the_size(width: int, height: int) -> None:
+    rng = np.random.default_rng(1)
+    values, xedges, yedges = np.histogram2d(
+        rng.normal(size=1000), rng.normal(size=1000), 360
+    )
+    lines = heatmap_lines(
+        values,
+        xedges,
+        yedges,
+        width=width,
+        height=height,
+        title="y vs x",
+        xlabel="x",
+        ylabel="y",
+    )
+    assert len(lines) == height
+    assert all(sum(cell_len(s.text) for s in line) == width for line in lines)
+
+
+def test_heatmap_colours() -> None:
+    # Indexed by x then y: a full bin at the bottom left, a quarter-full one
+    # at the top right and empty ones elsewhere, in a single line of half blocks
+    lines = heatmap_lines([[8, 0], [0, 2]], [0, 1, 2], [0, 1, 2], width=5, height=4)
+    left, right = lines[0][1:3]
+    assert (left.text, right.text) == ("▀", "▀")
+    assert left.style == Style(color=THEMES["default"].background, bgcolor=PALETTE[-1])
+    assert right.style == Style(color=PALETTE[1], bgcolor=THEMES["default"].background)
+
+
+def test_tui_plot_draws_2d_heatmap() -> None:
+    histogram: hist.Hist[Any] = hist.Hist(
+        hist.axis.Regular(360, 0, 1, label="x"), hist.axis.Regular(360, 0, 1)
+    )
+    histogram.fill(np.linspace(0, 0.99, 100), np.linspace(0, 0.99, 100))
+
+    class Item:
+        name = "y vs x"
+
+    plot = uproot_browser.tui.plot.make_plot(
+        Item(), "dark", 60, 20, expr="", histogram=histogram
+    )
+    assert isinstance(plot, rich.segment.Segments)
+    lines = list(rich.segment.Segment.split_lines(plot.segments))
+    assert len(lines) == 20
+    assert "y vs x -- Entries: 100" in lines[0][0].text
+
+
+def _ansi(renderable: rich.console.RenderableType, width: int) -> str:
+    console = rich.console.Console(
+        width=width, file=io.StringIO(), color_system="truecolor", force_terminal=True
+    )
+    with console.capture() as capture:
+        console.print(renderable)
+    return capture.get()
+
+
+@pytest.mark.parametrize(
+    "make",
+    [uproot_browser.tui.plot.make_plot, uproot_browser.tui.plot.make_plotext_plot],
+)
+def test_concurrent_renders_match_serial(
+    tmp_path: Path, make: Callable[..., rich.console.RenderableType]
+) -> None:
+    rng = np.random.default_rng(42)
+    branches = {f"b{i}": rng.normal(i, 1 + i / 8, size=2000) for i in range(8)}
+    with uproot.recreate(tmp_path / "many.root") as upfile:
+        upfile.mktree("T", {name: array.dtype for name, array in branches.items()})
+        upfile["T"].extend(branches)
+
+    with uproot.open(tmp_path / "many.root") as upfile:
+        items = [upfile["T"][name] for name in branches]
+        histograms = [uproot_browser.plot.make_histogram(item) for item in items]
+
+        def render(job: tuple[int, int, int, str]) -> str:
+            i, width, height, theme = job
+            plot = make(
+                items[i], theme, width, height, expr="", histogram=histograms[i]
+            )
+            return _ansi(plot, width)
+
+        jobs = [
+            (i, *job)
+            for i in range(len(items))
+            for job in [(80, 24, "default"), (101, 30, "dark")]
+        ]
+        serial = [render(job) for job in jobs]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=8) as pool:
+            for _ in range(2):
+                assert list(pool.map(render, jobs)) == serial
+
+    # Every plot is different, so a mix-up between threads would show
+    assert len(set(serial)) == len(jobs)
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING
+
+from uproot_browser.tui.prefetch import Prefetcher
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+def blocking(release: threading.Event) -> Callable[..., None]:
+    def job(*, cancelled: Callable[[], bool]) -> None:
+        while not release.wait(0.01) and not cancelled():
+            pass
+
+    return job
+
+
+def test_prefetch_replaces_queued_jobs() -> None:
+    prefetcher = Prefetcher(max_workers=1)
+    release = threading.Event()
+    done = threading.Event()
+    ran: list[str] = []
+
+    def job(name: str) -> Callable[..., None]:
+        def run(**_: object) -> None:
+            ran.append(name)
+            done.set()
+
+        return run
+
+    prefetcher.schedule({"a": (1, blocking(release)), "b": (1, job("b"))})
+    # "b" is still queued behind "a", so it's dropped when no longer wanted
+    prefetcher.schedule({"a": (1, blocking(release)), "c": (1, job("c"))})
+    release.set()
+    assert done.wait(timeout=10)
+    prefetcher.shutdown()
+
+    assert ran == ["c"]
+
+
+def test_prefetch_cancels_running_jobs() -> None:
+    prefetcher = Prefetcher(max_workers=1)
+    started = threading.Event()
+    stopped = threading.Event()
+
+    def job(*, cancelled: Callable[[], bool]) -> None:
+        started.set()
+        while not cancelled():
+            stopped.wait(0.01)
+        stopped.set()
+
+    prefetcher.schedule({"a": (1, job)})
+    assert started.wait(timeout=10)
+    prefetcher.schedule({})
+    assert stopped.wait(timeout=10)
+    prefetcher.shutdown()
+
+
+def test_prefetch_respects_budget() -> None:
+    prefetcher = Prefetcher(max_workers=1, max_size=10)
+    release = threading.Event()
+
+    prefetcher.schedule(
+        {
+            "small": (4, blocking(release)),
+            "large": (20, blocking(release)),
+            "other": (4, blocking(release)),
+        }
+    )
+    assert set(prefetcher._jobs) == {"small", "other"}  # noqa: SLF001
+    release.set()
+    prefetcher.shutdown()
+
+
+def test_prefetch_wait_ignores_failures() -> None:
+    prefetcher = Prefetcher(max_workers=1)
+    release = threading.Event()
+
+    def bad(**_: object) -> None:
+        raise ZeroDivisionError
+
+    prefetcher.schedule({"slow": (1, blocking(release)), "bad": (1, bad)})
+    release.set()
+    prefetcher.wait("slow")
+    prefetcher.wait("bad")
+    prefetcher.shutdown()
+
+
+def test_prefetch_wait_gives_up_when_cancelled() -> None:
+    prefetcher = Prefetcher(max_workers=1)
+    release = threading.Event()
+    started = threading.Event()
+
+    def job(*, cancelled: Callable[[], bool]) -> None:
+        started.set()
+        blocking(release)(cancelled=cancelled)
+
+    prefetcher.schedule({"slow": (1, job)})
+    assert started.wait(timeout=10)
+    assert not prefetcher.wait("slow", cancelled=lambda: True)
+    release.set()
+    assert prefetcher.wait("slow")
+    prefetcher.shutdown()
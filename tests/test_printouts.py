@@ -1,16 +1,27 @@
 from __future__ import annotations
 
 import functools
+import io
+import json
 import sys
+from typing import TYPE_CHECKING
 
+import awkward as ak
 import hist
+import numpy as np
 import pytest
 import rich.console
 import uproot
 from skhep_testdata import data_path
 
+import uproot_browser.plot
 import uproot_browser.tui.plot
-from uproot_browser.tree import print_tree
+from uproot_browser.inventory import expand_paths, print_inventories, print_inventory
+from uproot_browser.size import measure, size_table
+from uproot_browser.tree import LazyObject, UprootEntry, print_tree
+
+if TYPE_CHECKING:
+    from pathlib import Path
 
 OUT1 = """\
 📁 uproot-Event.root
@@ -96,6 +107,162 @@ def test_tree(capsys: pytest.CaptureFixture[str]) -> None:
     assert out == OUT1
 
 
+def test_directory_children_are_lazy() -> None:
+    with uproot.open(data_path("uproot-Event.root")) as upfile:
+        children = UprootEntry("/", upfile).children
+        (hstat,) = (c for c in children if c.path == "//hstat")
+        assert isinstance(hstat.item, LazyObject)
+        assert hstat.item.classname == "TH1F"
+        assert not hstat.is_dir
+        # Nothing has been deserialized yet
+        assert not hstat.item.is_read
+
+        assert hstat.meta()["label_icon"] == "📊 "
+        assert hstat.item.is_read
+
+
+def test_entry_labels_are_memoized() -> None:
+    with uproot.open(data_path("uproot-Event.root")) as upfile:
+        entry = UprootEntry("//T", upfile["T"])
+        assert entry.meta() is entry.meta()
+        assert entry.label is entry.label
+        assert entry.label.plain == "🌴 T (1000)"
+        assert not hasattr(entry, "__dict__")
+
+
+@pytest.mark.xfail(
+    sys.platform.startswith("win"),
+    reason="Unicode is different on Windows, for some reason?",
+)
+def test_tree_max_depth(capsys: pytest.CaptureFixture[str]) -> None:
+    filename = data_path("uproot-Event.root")
+    console = rich.console.Console(width=120)
+
+    print_tree(filename, console=console, max_depth=1)
+    out, _ = capsys.readouterr()
+    top = [line for line in OUT1.splitlines() if not line.startswith(("┃", " "))]
+    assert out.splitlines() == top
+
+
+@pytest.mark.xfail(
+    sys.platform.startswith("win"),
+    reason="Unicode is different on Windows, for some reason?",
+)
+def test_tree_filter_and_max_children(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    filename = tmp_path / "small.root"
+    with uproot.recreate(filename) as upfile:
+        branches = {"a1": np.arange(3), "a2": np.arange(3), "b1": np.arange(3)}
+        upfile.mktree("T", {name: array.dtype for name, array in branches.items()})
+        upfile["T"].extend(branches)
+        upfile["h"] = np.histogram([1.0, 2.0])
+    console = rich.console.Console(width=120)
+
+    print_tree(filename, console=console, pattern="a*", max_children=1)
+    out, _ = capsys.readouterr()
+    assert out == (
+        "📁 small.root\n┗━━ 🌴 T (3)\n    ┣━━ 🍁 a1 int64_t\n    ┗━━ … 1 more\n"
+    )
+
+
+def test_tree_json_inventory(tmp_path: Path) -> None:
+    filename = tmp_path / "small.root"
+    with uproot.recreate(filename) as upfile:
+        branches = {"a1": np.arange(3), "b1": np.arange(3.0)}
+        upfile.mktree("T", {name: array.dtype for name, array in branches.items()})
+        upfile["T"].extend(branches)
+        upfile["h"] = np.histogram([1.0, 2.0])
+
+    out = io.StringIO()
+    print_inventory(str(filename), output_format="jsonl", file=out)
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [record["path"] for record in records] == ["T", "T/a1", "T/b1", "h"]
+    assert {record["file"] for record in records} == {str(filename)}
+    tree, a1, _, histogram = records
+    assert tree["classname"] == "TTree"
+    assert tree["num_entries"] == 3
+    assert tree["is_dir"]
+    assert a1["typename"] == "int64_t"
+    assert a1["num_baskets"] == 1
+    assert a1["uncompressed_bytes"] > 0
+    assert histogram["classname"] == "TH1D"
+    assert histogram["num_entries"] is None
+    assert histogram["compressed_bytes"] > 0
+
+    out = io.StringIO()
+    print_inventory(str(filename), output_format="json", file=out, max_depth=1)
+    assert [record["path"] for record in json.loads(out.getvalue())] == ["T", "h"]
+
+    out = io.StringIO()
+    print_inventory(str(filename), output_format="json", file=out, pattern="b*")
+    assert [record["path"] for record in json.loads(out.getvalue())] == ["T", "T/b1"]
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_index_many_files(tmp_path: Path, jobs: int) -> None:
+    for name in ("a.root", "sub/b.root"):
+        (tmp_path / name).parent.mkdir(exist_ok=True)
+        with uproot.recreate(tmp_path / name) as upfile:
+            upfile["h"] = np.histogram([1.0, 2.0])
+    (tmp_path / "sub" / "bad.root").write_text("not a ROOT file")
+    (tmp_path / "notes.txt").write_text("skipped")
+
+    paths = list(expand_paths([str(tmp_path), str(tmp_path / "*.root")]))
+    assert paths == [
+        str(tmp_path / "a.root"),
+        str(tmp_path / "sub" / "b.root"),
+        str(tmp_path / "sub" / "bad.root"),
+    ]
+
+    out = io.StringIO()
+    failures = print_inventories(paths, output_format="jsonl", file=out, jobs=jobs)
+    records = {
+        record["file"]: record
+        for record in map(json.loads, out.getvalue().splitlines())
+    }
+    assert failures == 1
+    assert records.keys() == set(paths)
+    assert all(record["seconds"] >= 0 for record in records.values())
+    assert [obj["path"] for obj in records[paths[0]]["objects"]] == ["h"]
+    assert records[paths[1]]["objects"][0]["classname"] == "TH1D"
+    assert "objects" not in records[paths[2]]
+    assert records[paths[2]]["error"]
+
+
+def test_size_report(tmp_path: Path) -> None:
+    filename = tmp_path / "small.root"
+    with uproot.recreate(filename) as upfile:
+        upfile.mkdir("d")
+        branches = {"big": np.arange(10_000.0), "small": np.zeros(10_000)}
+        upfile["d"].mktree("T", {name: array.dtype for name, array in branches.items()})
+        upfile["d/T"].extend(branches)
+        upfile["h"] = np.histogram([1.0, 2.0])
+
+    with uproot.open(filename) as upfile:
+        size = measure(UprootEntry("/", upfile), "small.root")
+        assert size is not None
+        tree = upfile["d/T"]
+        big, small = tree["big"], tree["small"]
+
+    assert [child.name for child in size.children] == ["d", "h"]
+    (tree_size,) = size.children[0].children
+    assert tree_size.name == "T"
+    assert [branch.name for branch in tree_size.children] == ["big", "small"]
+    assert tree_size.compressed_bytes == big.compressed_bytes + small.compressed_bytes
+    assert tree_size.num_baskets == big.num_baskets + small.num_baskets
+    assert tree_size.children[1].ratio == pytest.approx(
+        small.uncompressed_bytes / small.compressed_bytes
+    )
+    assert size.compressed_bytes > tree_size.compressed_bytes
+
+    console = rich.console.Console(width=120, record=True)
+    console.print(size_table(size, top=1))
+    lines = console.export_text().splitlines()
+    names = [line.split()[0] for line in lines[3:] if line.strip()]
+    assert names == ["small.root", "d", "T", "big", "…", "…"]
+
+
 OUT2 = """\
 📁 ntpl001_staff_rntuple_v1-0-0-0.root
 ┗━━ 🌳 Staff (3354)
@@ -152,3 +319,140 @@ def test_dump_is_runnable(filename: str, selection: str, expr: str) -> None:
     exec(code, namespace)
 
     assert isinstance(namespace["h"], hist.Hist)
+
+
+def test_dump_matches_plotted_bins(tmp_path: Path) -> None:
+    """The maximum sits on the upper edge, and must stay in the last bin."""
+    rng = np.random.default_rng(5)
+    with uproot.recreate(tmp_path / "edge.root") as upfile:
+        upfile["T"] = {"x": rng.normal(size=1000)}
+
+    with uproot.open(tmp_path / "edge.root") as upfile:
+        item = upfile["T"]["x"]
+        histogram = uproot_browser.plot.make_histogram(item)
+        plotted = uproot_browser.plot.rebin(histogram, 400)
+        assert plotted.axes[0].edges[-1] == item.array(library="np").max()
+
+        code = uproot_browser.tui.plot.make_dump(item, 105, 30, histogram=histogram)
+        namespace: dict[str, object] = {"item": item}
+        exec(code, namespace)
+        rebuilt = namespace["h"]
+        assert isinstance(rebuilt, hist.Hist)
+        np.testing.assert_array_equal(
+            rebuilt.values(flow=True), plotted.values(flow=True)
+        )
+
+
+@pytest.mark.parametrize(("width", "bins"), [(100, 90), (380, 360), (3000, 2520)])
+def test_rebin_to_width(width: int, bins: int) -> None:
+    fine = hist.Hist(
+        hist.axis.Regular(uproot_browser.plot.FINE_BINS, 0, 1),
+        storage=hist.storage.Int64(),
+    )
+    fine.fill([0.0, 0.5, 0.999])
+    histogram = uproot_browser.plot.rebin(fine, width)
+    assert len(histogram.axes[0]) == bins
+    assert histogram.axes[0].edges[-1] == 1
+    assert histogram.sum(flow=True) == 3
+
+
+def test_rebin_2d() -> None:
+    fine = hist.Hist(
+        hist.axis.Regular(uproot_browser.plot.FINE_BINS_2D, 0, 1),
+        hist.axis.Regular(uproot_browser.plot.FINE_BINS_2D, 0, 1),
+        storage=hist.storage.Int64(),
+    )
+    fine.fill([0.0, 0.5], [0.5, 0.999])
+    histogram = uproot_browser.plot.rebin(fine, 100, 40)
+    assert histogram.axes.size == (90, 40)
+    assert histogram.sum(flow=True) == 2
+
+
+def test_2d_plots_and_dumps(tmp_path: Path) -> None:
+    rng = np.random.default_rng(3)
+    x, y, z = rng.normal(size=(3, 1000))
+    with uproot.recreate(tmp_path / "2d.root") as upfile:
+        upfile["h2"] = np.histogram2d(x, y, bins=10)
+        h3 = hist.Hist.new.Reg(5, -3, 3).Reg(6, -3, 3).Reg(7, -3, 3).Double()
+        upfile["h3"] = h3.fill(x, y, z)
+        upfile.mktree("T", {"x": np.float64, "y": np.float64})
+        upfile["T"].extend({"x": x, "y": y})
+
+    with uproot.open(tmp_path / "2d.root") as upfile:
+        pair = uproot_browser.plot.BranchPair(upfile["T"]["x"], upfile["T"]["y"])
+        items = [upfile["h2"], upfile["h3"], pair]
+        for item, shape in zip(items, [(10, 10), (5, 6), (360, 360)], strict=True):
+            histogram = uproot_browser.plot.make_histogram(item)
+            assert histogram.axes.size == shape
+
+            plot = uproot_browser.tui.plot.make_plot(
+                item, "default", 60, 20, expr="", histogram=histogram
+            )
+            console = rich.console.Console(width=60, record=True, color_system=None)
+            console.print(plot)
+            assert len(console.export_text().splitlines()) == 20
+
+            code = uproot_browser.tui.plot.make_dump(item, 60, 20, histogram=histogram)
+            namespace: dict[str, object] = {
+                "item": (pair.x, pair.y) if item is pair else item
+            }
+            exec(code, namespace)
+            rebuilt = namespace["h"]
+            assert isinstance(rebuilt, hist.Hist)
+            assert rebuilt.axes.size == shape
+            if item is pair:
+                np.testing.assert_array_equal(
+                    rebuilt.values(flow=True), histogram.values(flow=True)
+                )
+
+
+def test_dump_with_cut(tmp_path: Path) -> None:
+    rng = np.random.default_rng(4)
+    n = rng.integers(0, 4, size=1000)
+    with uproot.recreate(tmp_path / "cut.root") as upfile:
+        upfile.mktree("T", {"x": np.float64, "n": np.int64, "pt": "var * float64"})
+        upfile["T"].extend(
+            {
+                "x": rng.normal(size=1000),
+                "n": n,
+                "pt": ak.unflatten(rng.exponential(20, size=n.sum()), n),
+            }
+        )
+
+    with uproot.open(tmp_path / "cut.root") as upfile:
+        tree = upfile["T"]
+        for item in [tree["x"], tree["pt"]]:
+            for cut in ["n > 1 & sqrt(x**2) < 1", "pt > 20"]:
+                histogram = uproot_browser.plot.make_histogram(item, cut=cut)
+                code = uproot_browser.tui.plot.make_dump(
+                    item, 105, 30, histogram=histogram, cut=cut
+                )
+                namespace: dict[str, object] = {"item": item}
+                exec(code, namespace)
+                rebuilt = namespace["h"]
+                assert isinstance(rebuilt, hist.Hist)
+                assert rebuilt.sum(flow=True) == histogram.sum(flow=True)
+
+
+def test_dump_without_histogram_does_not_read(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    rng = np.random.default_rng(6)
+    with uproot.recreate(tmp_path / "nohist.root") as upfile:
+        upfile.mktree("T", {"x": np.float64, "y": np.float64})
+        upfile["T"].extend({"x": rng.normal(size=1000), "y": rng.normal(size=1000)})
+
+    def make_histogram(*_args: object, **_kwargs: object) -> None:
+        pytest.fail("dumping read the data")
+
+    monkeypatch.setattr(uproot_browser.plot, "make_histogram", make_histogram)
+    with uproot.open(tmp_path / "nohist.root") as upfile:
+        tree = upfile["T"]
+        pair = uproot_browser.plot.BranchPair(tree["x"], tree["y"])
+        for item, bound in [(tree["x"], tree["x"]), (pair, (pair.x, pair.y))]:
+            code = uproot_browser.tui.plot.make_dump(item, 105, 30, cut="x > 0")
+            namespace: dict[str, object] = {"item": bound}
+            exec(code, namespace)
+            rebuilt = namespace["h"]
+            assert isinstance(rebuilt, hist.Hist)
+            assert rebuilt.sum(flow=True) == (tree["x"].array(library="np") > 0).sum()
@@ -0,0 +1,73 @@
+"""
+Startup budgets: each subcommand only imports what it needs.
+"""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pytest
+import uproot
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+# Seconds, summed over every import (``python -X importtime``); generous, as
+# the module checks below are what catches a regression reliably.
+VERSION_BUDGET = 0.3
+TREE_BUDGET = 2.0
+BROWSE_BUDGET = 2.0
+
+
+def import_times(*args: str) -> dict[str, float]:
+    """
+    Import time in seconds (excluding submodules) of every module imported by
+    running ``python -X importtime`` with ``args``.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "cumulative" not in line:
+            own, _, name = line.removeprefix("import time:").split("|")
+            times[name.strip()] = int(own) / 1e6
+    return times
+
+
+@pytest.fixture
+def small_file(tmp_path: Path) -> Path:
+    path = tmp_path / "small.root"
+    with uproot.recreate(path) as upfile:
+        upfile["h"] = np.histogram([1.0, 2.0, 2.0])
+    return path
+
+
+def test_version() -> None:
+    times = import_times("-m", "uproot_browser", "--version")
+    for heavy in ("uproot", "numpy", "rich", "textual"):
+        assert heavy not in times
+    assert sum(times.values()) < VERSION_BUDGET
+
+
+def test_tree(small_file: Path) -> None:
+    times = import_times("-m", "uproot_browser", "tree", str(small_file), "--no-cache")
+    assert "uproot" in times
+    for heavy in ("hist", "plotext", "textual"):
+        assert heavy not in times
+    assert sum(times.values()) < TREE_BUDGET
+
+
+def test_browse_first_frame() -> None:
+    # Everything needed before the first frame; the file is opened (and
+    # uproot imported) in the background
+    times = import_times("-c", "import uproot_browser.tui.browser")
+    for heavy in ("uproot", "awkward", "hist", "plotext"):
+        assert heavy not in times
+    assert sum(times.values()) < BROWSE_BUDGET
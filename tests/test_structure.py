@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import os
+import shutil
+import sys
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pytest
+import rich.console
+import uproot
+from skhep_testdata import data_path
+
+from uproot_browser.structure import (
+    IndexedObject,
+    load_records,
+    open_structure,
+    print_indexed_tree,
+    save_records,
+    structure_path,
+    walk_records,
+)
+from uproot_browser.tree import print_tree
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_save_load_roundtrip(tmp_path: Path) -> None:
+    with uproot.open(data_path("uproot-Event.root")) as upfile:
+        records = list(walk_records(upfile))
+        path = structure_path(tmp_path, upfile)
+        assert path is not None
+        save_records(path, upfile.file, records)
+        assert load_records(path, upfile.file) == records
+
+
+def test_index_ignored_when_file_changes(tmp_path: Path) -> None:
+    filename = tmp_path / "Event.root"
+    shutil.copy(data_path("uproot-Event.root"), filename)
+    with uproot.open(filename) as upfile:
+        path = structure_path(tmp_path, upfile)
+        assert path is not None
+        save_records(path, upfile.file, walk_records(upfile))
+        assert load_records(path, upfile.file) is not None
+
+        stat = filename.stat()
+        os.utime(filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+        assert load_records(path, upfile.file) is None
+
+
+def test_structure_reads_nothing(tmp_path: Path) -> None:
+    with uproot.open(data_path("uproot-Event.root")) as upfile:
+        open_structure(upfile, tmp_path)
+        structure = open_structure(upfile, tmp_path)
+        (tree,) = (c for c in structure.entry().children if c.path == "//T")
+        assert isinstance(tree.item, IndexedObject)
+        assert tree.label.plain == "🌴 T (1000)"
+        assert tree.is_dir
+        assert len(tree.children) == len(upfile["T"].branches)
+        assert not tree.item._read  # noqa: SLF001
+
+
+@pytest.mark.xfail(
+    sys.platform.startswith("win"),
+    reason="Unicode is different on Windows, for some reason?",
+)
+def test_tree_from_index(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    filename = data_path("uproot-Event.root")
+    console = rich.console.Console(width=120)
+
+    print_tree(filename, console=console)
+    expected, _ = capsys.readouterr()
+    print_indexed_tree(filename, tmp_path, console=console)
+    assert list((tmp_path / "structure").iterdir())
+    assert capsys.readouterr().out == expected
+    print_indexed_tree(filename, tmp_path, console=console)
+    assert capsys.readouterr().out == expected
+
+
+def test_index_only_saved_for_whole_tree(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    filename = tmp_path / "small.root"
+    with uproot.recreate(filename) as upfile:
+        upfile["d/h"] = np.histogram([1.0, 2.0, 2.0])
+        upfile["T"] = {"x": np.arange(10.0), "y": np.arange(10)}
+    console = rich.console.Console(width=120)
+    cache_dir = tmp_path / "cache"
+
+    print_indexed_tree(str(filename), cache_dir, console=console, max_depth=1)
+    print_indexed_tree(str(filename), cache_dir, console=console, pattern="x")
+    assert not (cache_dir / "structure").exists()
+    capsys.readouterr()
+
+    print_tree(str(filename), console=console)
+    expected, _ = capsys.readouterr()
+    print_indexed_tree(str(filename), cache_dir, console=console)
+    assert capsys.readouterr().out == expected
+    assert len(list((cache_dir / "structure").iterdir())) == 1
+    print_indexed_tree(str(filename), cache_dir, console=console)
+    assert capsys.readouterr().out == expected
+
+
+@pytest.mark.parametrize("whole_first", [False, True])
+def test_index_ignores_object_spec(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str], *, whole_first: bool
+) -> None:
+    filename = tmp_path / "small.root"
+    with uproot.recreate(filename) as upfile:
+        upfile["d/h"] = np.histogram([1.0, 2.0, 2.0])
+        upfile.mktree("T", {"x": np.float64})
+        upfile["T"].extend({"x": np.arange(10.0)})
+    console = rich.console.Console(width=120)
+    cache_dir = tmp_path / "cache"
+    specs = [str(filename), f"{filename}:T"]
+    expected = {}
+    for spec in specs:
+        print_tree(spec, console=console)
+        expected[spec], _ = capsys.readouterr()
+    assert expected[str(filename)] != expected[f"{filename}:T"]
+
+    for spec in specs if whole_first else specs[::-1]:
+        print_indexed_tree(spec, cache_dir, console=console)
+        assert capsys.readouterr().out == expected[spec]
+    for spec in specs:
+        print_indexed_tree(spec, cache_dir, console=console)
+        assert capsys.readouterr().out == expected[spec]
@@ -1,13 +1,28 @@
+import dataclasses
+import threading
 from collections.abc import Callable
+from pathlib import Path
+from typing import Any
 
+import numpy as np
+import pytest
+import rich.console
+import rich.table
 import skhep_testdata
 import textual.pilot
 import textual.widgets
+import uproot
 
+import uproot_browser.plot
+import uproot_browser.tui.left_panel
+import uproot_browser.tui.prefetch
 from uproot_browser.tui.browser import Browser
-from uproot_browser.tui.jump import JumpScreen
+from uproot_browser.tui.error import Error
+from uproot_browser.tui.jump import DEBOUNCE, MAX_RESULTS, JumpScreen
 from uproot_browser.tui.left_panel import UprootTree
-from uproot_browser.tui.plot import Plotext
+from uproot_browser.tui.plot import Plotext, PlotGrid
+from uproot_browser.tui.tools import Storage
+from uproot_browser.tui.viewer import CutInput
 
 LEAF_PATH = "//T/event/fFlag"
 
@@ -29,6 +44,12 @@ async def wait_until(
         await pilot.pause()
 
 
+async def wait_opened(pilot: textual.pilot.Pilot[None]) -> None:
+    """Wait for the file to be opened (in the background) and listed."""
+    await pilot.app.workers.wait_for_complete()
+    await pilot.pause()
+
+
 async def test_browse_logo() -> None:
     async with Browser(
         skhep_testdata.data_path("uproot-Event.root")
@@ -40,6 +61,7 @@ async def test_browse_plot() -> None:
     async with Browser(
         skhep_testdata.data_path("uproot-Event.root")
     ).run_test() as pilot:
+        await wait_opened(pilot)
         await pilot.press("down", "down", "down", "enter")
         await pilot.pause()
         assert isinstance(pilot.app.view_widget.item, Plotext)
@@ -49,6 +71,7 @@ async def test_browse_empty() -> None:
     async with Browser(
         skhep_testdata.data_path("uproot-empty.root")
     ).run_test() as pilot:
+        await wait_opened(pilot)
         await pilot.press("down", "space", "down", "enter")
         await pilot.pause()  # process RequestPlot → spawn the render worker
         await pilot.app.workers.wait_for_complete()  # block on the thread
@@ -60,6 +83,7 @@ async def test_browse_empty_vim() -> None:
     async with Browser(
         skhep_testdata.data_path("uproot-empty.root")
     ).run_test() as pilot:
+        await wait_opened(pilot)
         await pilot.press("j", "l", "j", "enter")
         await pilot.pause()  # process RequestPlot → spawn the render worker
         await pilot.app.workers.wait_for_complete()  # block on the thread
@@ -71,6 +95,7 @@ async def test_theme_switch_updates_plot() -> None:
     async with Browser(
         skhep_testdata.data_path("uproot-Event.root")
     ).run_test() as pilot:
+        await wait_opened(pilot)
         await pilot.press("down", "down", "down", "enter")
         await pilot.pause()
         item_before = pilot.app.view_widget.item
@@ -86,6 +111,26 @@ async def test_theme_switch_updates_plot() -> None:
         assert item_after.theme == "default"
 
 
+async def test_preview_switch_updates_plot() -> None:
+    async with Browser(
+        skhep_testdata.data_path("uproot-Event.root")
+    ).run_test() as pilot:
+        await wait_opened(pilot)
+        await pilot.press("down", "down", "down", "enter")
+        await pilot.pause()
+        item_before = pilot.app.view_widget.item
+        assert isinstance(item_before, Plotext)
+        assert item_before.sample is None
+
+        pilot.app.query_one("#preview-switch", textual.widgets.Switch).value = True
+        await pilot.pause()
+        item_after = pilot.app.view_widget.item
+        assert isinstance(item_after, Plotext)
+        assert item_after is not item_before
+        assert item_after.sample is not None
+        assert item_after.cache_key != item_before.cache_key
+
+
 async def test_theme_select_tracks_theme() -> None:
     async with Browser(
         skhep_testdata.data_path("uproot-Event.root")
@@ -111,6 +156,24 @@ async def test_theme_select_tracks_theme() -> None:
         assert select.value == "nord"
 
 
+async def test_info_shows_tree_storage() -> None:
+    async with Browser(
+        skhep_testdata.data_path("uproot-Event.root")
+    ).run_test() as pilot:
+        await wait_opened(pilot)
+        # The cursor on the tree (or a branch in it) shows its storage
+        await pilot.press("down", "down")
+        pilot.app.query_one(
+            "#left-view", textual.widgets.TabbedContent
+        ).active = "tab-3"
+        await wait_until(pilot, lambda: bool(pilot.app.query(Storage)))
+        storage = pilot.app.query_one(Storage)
+        await wait_until(pilot, lambda: storage.shown == "T")
+        table = storage.content
+        assert isinstance(table, rich.table.Table)
+        assert table.row_count > 1
+
+
 async def test_jump_opens_and_lists_all() -> None:
     async with Browser(
         skhep_testdata.data_path("uproot-Event.root")
@@ -118,21 +181,31 @@ async def test_jump_opens_and_lists_all() -> None:
         # Grab the tree before opening the modal: older Textual scopes
         # app.query_one to the active screen, so #tree-view is unreachable
         # once the JumpScreen is on top.
-        expected = len(pilot.app.query_one("#tree-view", UprootTree).all_entries())
+        tree = pilot.app.query_one("#tree-view", UprootTree)
         await pilot.press("/")
         assert isinstance(pilot.app.screen, JumpScreen)
         results = pilot.app.screen.query_one(
             "#jump-results", textual.widgets.OptionList
         )
-        assert results.option_count == expected
+        # The index is built in the background and streamed in
+        await wait_until(pilot, lambda: tree.index_complete)
+        await pilot.pause()
+        total = len(tree.index)
+        assert results.option_count == min(total, MAX_RESULTS)
+        assert LEAF_PATH in {c.path for c in tree.index.candidates}
+        status = pilot.app.screen.query_one("#jump-status", textual.widgets.Static)
+        assert str(status.render()) == f"{total:,}/{total:,}"
 
 
 async def test_jump_filters_and_plots() -> None:
     async with Browser(
         skhep_testdata.data_path("uproot-Event.root")
     ).run_test() as pilot:
+        tree = pilot.app.query_one("#tree-view", UprootTree)
+        await wait_until(pilot, lambda: tree.index_complete)
         await pilot.press("/")
         await pilot.press(*"fflag")  # fuzzy-matches only fFlag
+        await pilot.pause(DEBOUNCE)
         await pilot.pause()
         results = pilot.app.screen.query_one(
             "#jump-results", textual.widgets.OptionList
@@ -152,6 +225,7 @@ async def test_jump_expands_ancestors() -> None:
         skhep_testdata.data_path("uproot-Event.root")
     ).run_test() as pilot:
         tree = pilot.app.query_one("#tree-view", UprootTree)
+        await wait_opened(pilot)
         tree.select_path(LEAF_PATH)
         await wait_until(
             pilot,
@@ -167,6 +241,24 @@ async def test_jump_expands_ancestors() -> None:
         assert node.data.path == LEAF_PATH
 
 
+async def test_tree_pages_children(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(uproot_browser.tui.left_panel, "PAGE_SIZE", 2)
+    async with Browser(
+        skhep_testdata.data_path("uproot-Event.root")
+    ).run_test() as pilot:
+        tree = pilot.app.query_one("#tree-view", UprootTree)
+        await wait_opened(pilot)
+        *page, more = tree.root.children
+        assert len(page) == 2
+        assert more.data is None
+
+        # Selecting a path past the loaded page pages it in
+        tree.select_path("//hstat")
+        paths = [c.data.path for c in tree.root.children if c.data is not None]
+        assert paths[-1] == "//hstat"
+        assert all(c.data is not None for c in tree.root.children)
+
+
 async def test_jump_cancel() -> None:
     async with Browser(
         skhep_testdata.data_path("uproot-Event.root")
@@ -187,3 +279,172 @@ async def test_help_focus() -> None:
         focus_chain = [widget.id for widget in pilot.app.screen.focus_chain]
         assert len(focus_chain) == 3
         assert focus_chain[-1] == "help-done"
+
+
+async def test_open_in_background(monkeypatch: pytest.MonkeyPatch) -> None:
+    opened = threading.Event()
+
+    def slow_open(*_args: Any, **_kwargs: Any) -> Any:
+        opened.wait()
+        msg = "unreadable"
+        raise OSError(msg)
+
+    monkeypatch.setattr(uproot, "open", slow_open)
+    async with Browser("slow.root").run_test() as pilot:
+        # The first frame doesn't wait for the file
+        tree = pilot.app.query_one("#tree-view", UprootTree)
+        assert tree.upfile is None
+        assert [str(c.label) for c in tree.root.children] == ["opening…"]
+
+        opened.set()
+        await wait_opened(pilot)
+        assert "failed to open" in str(tree.root.label)
+        assert isinstance(pilot.app.view_widget.item, Error)
+
+
+async def test_prefetch_skips_highlighted(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    scheduled: list[list[str]] = []
+
+    def schedule(_: Any, jobs: dict[Any, Any]) -> None:
+        scheduled.append([key[1] for key in jobs])
+
+    monkeypatch.setattr(uproot_browser.tui.prefetch.Prefetcher, "schedule", schedule)
+    with uproot.recreate(tmp_path / "near.root") as upfile:
+        upfile.mktree("T", dict.fromkeys("abcd", np.float64))
+        upfile["T"].extend({name: np.arange(10.0) for name in "abcd"})
+
+    async with Browser(str(tmp_path / "near.root")).run_test(size=(160, 50)) as pilot:
+        await wait_opened(pilot)
+        await pilot.press("down", "space", "down", "down")
+        await wait_until(pilot, lambda: bool(scheduled) and "//T/a" in scheduled[-1])
+        # b itself is read when selected, with its progress shown
+        assert scheduled[-1] == ["//T/c", "//T/a", "//T/d"]
+
+
+async def test_grid_reads_marked_branches_together(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(uproot_browser.tui.left_panel, "PREFETCH_NEIGHBOURS", 0)
+    passes: list[list[str]] = []
+    fill_branches = uproot_browser.plot.fill_branches
+
+    def spy(tree: Any, branches: list[Any], **kwargs: Any) -> Any:
+        passes.append([branch.name for branch in branches])
+        return fill_branches(tree, branches, **kwargs)
+
+    monkeypatch.setattr(uproot_browser.plot, "fill_branches", spy)
+    rng = np.random.default_rng(3)
+    with uproot.recreate(tmp_path / "grid.root") as upfile:
+        upfile.mktree("T", dict.fromkeys("abc", np.float64))
+        upfile["T"].extend({name: rng.normal(size=1000) for name in "abc"})
+
+    async with Browser(str(tmp_path / "grid.root")).run_test(size=(160, 50)) as pilot:
+        await wait_opened(pilot)
+        # Open T, mark a and c, then show the grid
+        await pilot.press("down", "space", "down", "space", "down", "down", "space")
+        tree = pilot.app.query_one("#tree-view", UprootTree)
+        assert list(tree.marked) == ["//T/a", "//T/c"]
+        await pilot.press("g")
+
+        view = pilot.app.view_widget
+        assert isinstance(view.item, PlotGrid)
+        assert [pane.display for pane in view.panes] == [True, True] + [False] * 7
+        await wait_until(
+            pilot,
+            lambda: all(isinstance(pane.content, Plotext) for pane in view.panes[:2]),
+        )
+        assert [pane.content.selection for pane in view.panes[:2]] == [
+            "//T/a",
+            "//T/c",
+        ]
+        assert passes == [["a", "c"]]
+
+
+async def test_versus_plots_marked_branches_against_each_other(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(uproot_browser.tui.left_panel, "PREFETCH_NEIGHBOURS", 0)
+    rng = np.random.default_rng(3)
+    with uproot.recreate(tmp_path / "pair.root") as upfile:
+        upfile.mktree("T", dict.fromkeys("ab", np.float64))
+        upfile["T"].extend({name: rng.normal(size=1000) for name in "ab"})
+
+    async with Browser(str(tmp_path / "pair.root")).run_test(size=(160, 50)) as pilot:
+        await wait_opened(pilot)
+        # Open T, mark b then a, and plot a (y) against b (x)
+        await pilot.press("down", "space", "down", "down", "space", "up", "space")
+        await pilot.press("v")
+
+        item = pilot.app.view_widget.item
+        assert isinstance(item, Plotext)
+        assert (item.selection, item.versus) == ("//T/b", "//T/a")
+        await wait_until(pilot, lambda: item.cache_key in pilot.app.histograms)
+        histogram = pilot.app.histograms.get(item.cache_key)
+        assert [axis.label for axis in histogram.axes] == ["b", "a"]
+        assert histogram.sum(flow=True) == 1000
+
+
+async def test_cut_applies_to_plots(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(uproot_browser.tui.left_panel, "PREFETCH_NEIGHBOURS", 0)
+    rng = np.random.default_rng(3)
+    a, b = rng.normal(size=(2, 1000))
+    with uproot.recreate(tmp_path / "cut.root") as upfile:
+        upfile.mktree("T", dict.fromkeys("ab", np.float64))
+        upfile["T"].extend({"a": a, "b": b})
+
+    async with Browser(str(tmp_path / "cut.root")).run_test(size=(160, 50)) as pilot:
+        await wait_opened(pilot)
+        await pilot.press("down", "space", "down", "enter")
+
+        cut_input = pilot.app.query_one("#cut-input", CutInput)
+        cut_input.value = "b > 0"
+        assert cut_input.has_class("-needs-update")
+        cut_input.focus()
+        await pilot.press("enter")
+        assert not cut_input.has_class("-needs-update")
+
+        item = pilot.app.view_widget.item
+        assert isinstance(item, Plotext)
+        assert (item.selection, item.cut) == ("//T/a", "b > 0")
+        await wait_until(pilot, lambda: item.cache_key in pilot.app.histograms)
+        histogram = pilot.app.histograms.get(item.cache_key)
+        assert histogram.sum(flow=True) == (b > 0).sum()
+
+        # The cut is kept for the next branch plotted
+        pilot.app.query_one(UprootTree).focus()
+        await pilot.press("down", "enter")
+        item = pilot.app.view_widget.item
+        assert isinstance(item, Plotext)
+        assert (item.selection, item.cut) == ("//T/b", "b > 0")
+
+
+async def test_dump_reports_bad_cut(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(uproot_browser.tui.left_panel, "PREFETCH_NEIGHBOURS", 0)
+    with uproot.recreate(tmp_path / "dump.root") as upfile:
+        upfile.mktree("T", {"a": np.float64})
+        upfile["T"].extend({"a": np.arange(10.0)})
+
+    async with Browser(str(tmp_path / "dump.root")).run_test(size=(160, 50)) as pilot:
+        await wait_opened(pilot)
+        await pilot.press("down", "space", "down", "enter")
+        item = pilot.app.view_widget.item
+        assert isinstance(item, Plotext)
+        pilot.app.view_widget.item = dataclasses.replace(item, cut="a >")
+
+        exits: list[Any] = []
+
+        def record_exit(*, message: Any) -> None:
+            exits.append(message)
+
+        monkeypatch.setattr(pilot.app, "exit", record_exit)
+        pilot.app.action_quit_with_dump()
+        (message,) = exits
+        console = rich.console.Console(width=160, record=True, color_system=None)
+        console.print(message)
+        assert "# Can't dump this item:" in console.export_text()